@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+# g1bench.py
+import sys, time
+import g1utils
+from   g1utils import Memory, AddressError, g1gfx
+
+
+def fresh(rom: Memory) -> Memory:
+	"""Return a copy of `rom` with nothing cached."""
+	return Memory(rom, version=rom.version)
+
+def timeit(func, *args, repeat:int=5) -> tuple[float, any]:
+	"""Return the best time out of `repeat` calls to `func`, along with its last result."""
+	best = None
+	for _ in range(repeat):
+		start  = time.perf_counter()
+		result = func(*args)
+		t      = time.perf_counter() - start
+		if best is None or t < best: best = t
+	return best, result
+
+def report(name: str, t: float, baseline:float=None):
+	if baseline is None:
+		print(f"{name:<24} {t*1000:10.2f} ms")
+	else:
+		print(f"{name:<24} {t*1000:10.2f} ms  ({baseline/t:.1f}x)")
+
+
+#== Glitch IDs =============================================================================================
+
+def _find_all_individually(rom):
+	dex_nums = rom.find_all_glitchmon_dex_nums()
+	return g1utils.Info(
+		dex_nums        = dex_nums,
+		unused_dex_nums = rom.find_all_unused_glitch_dex_nums(dex_nums),
+		moves           = rom.find_all_learnable_glitch_moves(dex_nums),
+		types           = rom.find_all_used_glitch_types(dex_nums),
+		exp_groups      = rom.find_all_used_glitch_exp_groups(dex_nums),
+		palette_ids     = rom.find_all_used_glitchmon_palette_ids(dex_nums),
+		tilesets        = rom.find_all_used_glitch_tilesets()
+	)
+
+def bench_glitch_survey(rom: Memory):
+	t1, expected = timeit(lambda: _find_all_individually(fresh(rom)))
+	t2, survey   = timeit(lambda: g1utils.GlitchSurvey(fresh(rom)))
+	report("find_all_*", t1)
+	report("GlitchSurvey", t2, t1)
+	for key, ids in expected.__dict__.items():
+		if getattr(survey, key) != ids:
+			print(f"MISMATCH: {key}", file=sys.stderr)
+
+
+#== Learnability ===========================================================================================
+
+def bench_learnability(rom: Memory):
+	def build():
+		fresh_rom = fresh(rom)
+		fresh_rom.get_learnability_matrix()
+		return fresh_rom
+	t, rom = timeit(build)
+	report("learnability matrix", t)
+	t, _ = timeit(lambda: [rom.can_mon_learn_move(mon, move) for mon in range(256) for move in range(256)], repeat=1)
+	report("can_mon_learn_move x65536", t)
+
+
+#== Tile codec =============================================================================================
+
+def _scalar_gfx_bitmap(gfx, width):
+	# The per-byte bit interleave the renderers used before the NumPy tile codec, kept as a reference.
+	goff, glen   = 0, len(gfx)
+	pwidth, plen = width * 2, width * 16
+	buf = bytearray(plen)
+	while goff < glen:
+		px, poff = 0, 0
+		while px < pwidth:
+			while poff < plen:
+				b1, b2 = gfx[goff] ^ 0xFF, gfx[goff + 1] ^ 0xFF
+				b1=(b1|b1<<4) & 0x0F0F; b1=(b1|b1<<2) & 0x3333; b1=(b1|b1<<1) & 0x5555
+				b2=(b2|b2<<4) & 0x0F0F; b2=(b2|b2<<2) & 0x3333; b2=(b2|b2<<1) & 0x5555
+				bits = b1 | (b2 << 1)
+				buf[poff], buf[poff+1] = bits >> 8, bits & 0xFF
+				goff += 2
+				poff += pwidth
+			px  += 2
+			poff = px
+
+		y = 0
+		while y < plen:
+			yield bytes(buf[y:y+pwidth])
+			y += pwidth
+
+def report_mpix(name: str, t: float, pixels: int, baseline:float=None):
+	mpix = pixels / 1e6
+	report(f"{name} ({mpix/t:.1f} Mpx/s)", t, baseline)
+
+def bench_tile_codec(rom: Memory):
+	gfx = bytes(rom.get_tileset_gfx(0, glitch=True)) * 16 # 4096 tiles
+	t1, expected = timeit(lambda: list(_scalar_gfx_bitmap(gfx, 16)))
+	t2, rows     = timeit(lambda: list(g1gfx._gfx_bitmap(gfx, 16)))
+	pixels = len(gfx) * 4
+	report_mpix("scalar tiles", t1, pixels)
+	report_mpix("tile codec", t2, pixels, t1)
+	if rows != expected:
+		print("MISMATCH: tile codec", file=sys.stderr)
+
+	t, blocks = timeit(lambda: [list(rows) for rows in rom.get_tileset_block_bitmaps(0, glitch=True)])
+	report_mpix("tileset blocks", t, len(blocks) * 32*32)
+
+	width, height, rows, _ = rom.get_map_bitmap(0)
+	t, _ = timeit(lambda: list(rom.get_map_bitmap(0)[2]))
+	report_mpix("map 0", t, width * height)
+
+	def frontsprites():
+		pixels = 0
+		for n in range(1, 191):
+			try: width, height, rows, _ = rom.get_mon_frontsprite_bitmap(n)
+			except AddressError: continue
+			for _ in rows: pass
+			pixels += width * height
+		return pixels
+	t, pixels = timeit(frontsprites, repeat=1)
+	report_mpix("mon frontsprites", t, pixels)
+
+
+#== Sprite decompression ===================================================================================
+
+# The original generator-based sprite decompressor, kept as a reference to check decompress_gfx against.
+
+def _ref_bitstream(data):
+	for b in data:
+		yield (b >> 7) & 1
+		yield (b >> 6) & 1
+		yield (b >> 5) & 1
+		yield (b >> 4) & 1
+		yield (b >> 3) & 1
+		yield (b >> 2) & 1
+		yield (b >> 1) & 1
+		yield  b       & 1
+
+def _ref_decompress_gfx(data, twidth, theight, bitflip, truesize=False):
+	data = iter(data)
+	dims = next(data)
+	width, height = (dims >> 4) or 256, (dims & 0xF) or 256
+
+	bits = _ref_bitstream(data)
+
+	bufsize = max(width*height, twidth*theight) * 8
+	if truesize:
+		buf1, buf2 = bytearray(bufsize), bytearray(bufsize)
+		off1, off2 = 0, 0
+	else:
+		buf = buf1 = buf2 = bytearray(392*2 + max(392, bufsize))
+		off1, off2        = 392, 392*2
+
+	if next(bits) == 1:
+		sbuf1, soff1 = buf2, off2
+		sbuf2, soff2 = buf1, off1
+	else:
+		sbuf1, soff1 = buf1, off1
+		sbuf2, soff2 = buf2, off2
+	
+	_ref_decompress_bitplane(bits, sbuf1, soff1, width, height)
+
+	mode = next(bits)
+	if mode == 1: mode += next(bits)
+
+	_ref_decompress_bitplane(bits, sbuf2, soff2, width, height)
+
+	if mode != 1:
+		_ref_delta_decode_bitplane(sbuf2, soff2, width, height)
+	_ref_delta_decode_bitplane(sbuf1, soff1, width, height)
+
+	if mode != 0: # xor buffer 2 with buffer 1
+		for i in range(bufsize):
+			sbuf2[soff2+i] ^= sbuf1[soff1+i]
+
+	if not truesize:
+		# buffer A hasn't been used yet so we don't need to clear it
+		g1gfx._center_bitplane(buf, 392,   0,   twidth, theight)
+		buf[392:392*2] = (0 for _ in range(392)) # clear buffer B
+		g1gfx._center_bitplane(buf, 392*2, 392, twidth, theight)		
+
+		return 56, 56, g1gfx._sprite_bitmap(buf, buf, 392, 7, 7, bitflip)
+
+	else:
+		return width*8, height*8, g1gfx._sprite_bitmap(buf1, buf2, 0, width, height, bitflip)
+
+def _ref_parse_rle_packet(bits):
+	n = 1
+	while next(bits) != 0:
+		n += 1
+	l = 1 << n; v = 0
+	while n > 0:
+		n -= 1; v = (v << 1) | next(bits)
+	return l + v - 1
+	
+def _ref_decompress_bitplane(bits, buf, off, width, height):
+	width *= 4; height *= 8
+	px, by = 0, 0
+	tx, sx = off, 6
+
+	if next(bits) == 0:
+		by += _ref_parse_rle_packet(bits)
+
+	while True:
+		# data packet
+		while True:
+			if by >= height:
+				px, by = px + (by // height), by % height
+				if px >= width: return
+				tx = (px >> 2)*height + off
+				sx = (~px & 3) * 2
+			p = (next(bits) << 1) | next(bits)
+			if p == 0: break
+			buf[tx + by] |= p << sx
+			by += 1
+
+		by += _ref_parse_rle_packet(bits)
+
+def _ref_delta_decode_bitplane(buf, off, width, height):
+	height *= 8
+	y, xend = 0, off + width*height
+	while y < height:
+		x, c = off + y, 0
+		while x < xend:
+			b = buf[x]
+			b = b^(b>>1)^(b>>2)^(b>>3)^(b>>4)^(b>>5)^(b>>6)^(b>>7) ^ c
+			c = ((~(b & 1) + 1) & 0xFF) 
+			buf[x] = b
+			x += height
+		y += 1
+
+def _sprite_ptrs(rom):
+	for n in range(256):
+		try: yield ("front", n), rom.get_mon_frontsprite_ptr_dims(n)
+		except AddressError: pass
+		try: yield ("back", n), (*rom.get_mon_backsprite_ptr(n), 4, 4)
+		except AddressError: pass
+		try: yield ("trainer", n), (*rom.get_trainer_sprite_ptr(n), 7, 7)
+		except AddressError: pass
+
+def _decompress_all(rom, ptrs, decompress, truesize):
+	results = []
+	for _, (bank, addr, width, height) in ptrs:
+		try:
+			w, h, rows = decompress(rom, bank, addr, width, height, truesize)
+			results.append((w, h, [bytes(row) for row in rows]))
+		except AddressError as e:
+			results.append(e.addr)
+	return results
+
+def bench_decompress(rom: Memory):
+	ptrs = list(_sprite_ptrs(rom))
+	def reference(rom, bank, addr, width, height, truesize):
+		return _ref_decompress_gfx(rom.stream(bank, addr), width, height, 0xFF, truesize)
+	def current(rom, bank, addr, width, height, truesize):
+		return rom.get_compressed_bitmap(bank, addr, width, height, None, truesize)[:3]
+	for truesize in (False, True):
+		t1, expected = timeit(lambda: _decompress_all(rom, ptrs, reference, truesize), repeat=1)
+		t2, results  = timeit(lambda: _decompress_all(fresh(rom), ptrs, current, truesize), repeat=3)
+		t3, _        = timeit(lambda: _decompress_all(rom, ptrs, current, truesize), repeat=3)
+		mode = "truesize" if truesize else "56x56"
+		report(f"reference ({mode})", t1)
+		report(f"decompress_gfx ({mode})", t2, t1)
+		report(f"cached ({mode})", t3, t1)
+		for (kind, n), a, b in zip(ptrs, expected, results):
+			if a != b:
+				print(f"MISMATCH: {kind} sprite {n} ({mode})", file=sys.stderr)
+
+
+#== PNG encoding ===========================================================================================
+
+def bench_png(rom: Memory, map:str="0"):
+	import io, zlib, pngfmt
+	width, height, rows, palette = rom.get_map_bitmap(int(map, 0))
+	rows = list(rows)
+	pixels = width * height
+	for name, level, strategy in (("level 9", 9, zlib.Z_DEFAULT_STRATEGY), ("level 6", 6, zlib.Z_DEFAULT_STRATEGY),
+	                              ("level 1 (preview)", pngfmt.PREVIEW_LEVEL, zlib.Z_DEFAULT_STRATEGY),
+	                              ("level 9 rle", 9, zlib.Z_RLE)):
+		out = io.BytesIO()
+		def write():
+			out.seek(0); out.truncate()
+			pngfmt.write_png(out, width, height, rows, bitdepth=2, greyscale=True, level=level, strategy=strategy)
+		t, _ = timeit(write)
+		report_mpix(f"{name}, {len(out.getvalue())//1024} KiB", t, pixels)
+
+
+# ==========================================================================================================
+if __name__ == "__main__":
+
+	_verbs = {
+		"glitch-survey": bench_glitch_survey,
+		"learnability":  bench_learnability,
+		"tile-codec":    bench_tile_codec,
+		"decompress":    bench_decompress,
+		"png":           bench_png,
+	}
+
+	def error(msg):
+		print(msg, file=sys.stderr)
+		exit(1)
+
+	if len(sys.argv) < 3:
+		error("Usage: g1bench.py <rom_path> <verb> [args...]")
+
+	try: rom = g1utils.open_rom(sys.argv[1])
+	except IOError as e:
+		error(f"Couldn't open ROM file: {sys.argv[1]}: {e}")
+
+	verb = _verbs.get(sys.argv[2])
+	if verb is None:
+		error(f"Unknown verb: {sys.argv[2]}")
+	verb(rom, *sys.argv[3:])
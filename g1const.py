@@ -639,6 +639,9 @@ def trainer_encounter_name(n: int, modern:bool=False) -> str:
 		name = mon_name(n)
 		if name: return "mon_" + name
 
+# The chance (out of 256) of each wild encounter slot being picked for an encounter.
+wild_encounter_slot_chances = bytes((51, 51, 39, 25, 25, 25, 13, 13, 11, 3))
+
 
 _type_names = (
 	"NORMAL",
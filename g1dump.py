@@ -3,8 +3,8 @@
 from typing import Sequence
 
 import sys, os
-import g1utils, g1const
-from   g1utils import Memory, Info
+import g1utils, g1const, pngfmt
+from   g1utils import Memory, Info, AddressError
 from   datafmt import Writer
 
 hex     = lambda x: f"0x{x:X}"
@@ -187,20 +187,22 @@ def dump_move_info(writer: Writer, rom: Memory, n: int):
 
 def dump_moves(writer: Writer, rom: Memory, ids: Sequence[int]):
 	crepr = lambda n: "type: " + type_repr(rom, n)
+	moves = rom.get_move_table()
+	types, powers, accuracies = moves.type.tolist(), moves.power.tolist(), moves.accuracy.tolist()
+	pps, animations, effects  = moves.pp.tolist(), moves.animation.tolist(), moves.effect.tolist()
 	keys, rows, coms = [], [], []
 	for n in ids:
-		info = rom.get_move_info(n)
-		effect = info.effect
+		effect = effects[n]
 		power, accuracy = g1const.move_effect_uses_power_accuracy(effect)
-		type, comment   = writer.enum_repr(info.type, g1const.type_name, hexbyte, crepr)
+		type, comment   = writer.enum_repr(types[n], g1const.type_name, hexbyte, crepr)
 		keys.append(hexbyte(n) if n <= 195 else g1const.machine_item_name(n))
 		rows.append((
 			type,
-			str(info.power    if power    else 0),
-			str(info.accuracy if accuracy else 0),
-			str(info.pp),
-			writer.enum_repr(info.animation, g1const.animation_name,   hexbyte)[0],
-			writer.enum_repr(effect,         g1const.move_effect_name, hexbyte)[0]
+			str(powers[n]     if power    else 0),
+			str(accuracies[n] if accuracy else 0),
+			str(pps[n]),
+			writer.enum_repr(animations[n], g1const.animation_name,   hexbyte)[0],
+			writer.enum_repr(effect,        g1const.move_effect_name, hexbyte)[0]
 		))
 		coms.append(comment)
 	writer.tuple_prop_rows(keys, rows, comments=coms)
@@ -209,8 +211,9 @@ def dump_moves(writer: Writer, rom: Memory, ids: Sequence[int]):
 #== Items ==================================================================================================
 
 def dump_items(writer: Writer, rom: Memory, ids):
+	prices = rom.get_item_table().price.tolist()
 	keys = (hexbyte(n) for n in ids)
-	rows = ((str(rom.get_item_price(n)), f'"{rom.get_item_name(n)}"') for n in ids)
+	rows = ((str(prices[n]), f'"{rom.get_item_name(n)}"') for n in ids)
 	writer.tuple_prop_rows(keys, rows)
 
 
@@ -471,7 +474,7 @@ def dump_all_glitch_types(rom: Memory, syntax:str=DEFAULT_SYNTAX):
 
 def dump_all_used_glitchmon_palettes(rom: Memory, syntax:str=DEFAULT_SYNTAX):
 	with Writer(syntax, dict="glitchPalettes") as writer:
-		dump_palettes(writer, rom, rom.find_all_used_glitchmon_palette_ids())
+		dump_palettes(writer, rom, rom.get_glitch_survey().palette_ids)
 
 def dump_all_glitch_exp_groups(rom: Memory, syntax:str=DEFAULT_SYNTAX):
 	with Writer(syntax, dict="glitchExpGroups") as writer:
@@ -479,7 +482,7 @@ def dump_all_glitch_exp_groups(rom: Memory, syntax:str=DEFAULT_SYNTAX):
 
 def dump_all_used_glitch_exp_groups(rom: Memory, syntax:str=DEFAULT_SYNTAX):
 	with Writer(syntax, dict="glitchExpGroups") as writer:
-		dump_exp_groups(writer, rom, rom.find_all_used_exp_groups())
+		dump_exp_groups(writer, rom, rom.get_glitch_survey().exp_groups)
 
 def dump_all_glitchmon_cries(rom: Memory, syntax:str=DEFAULT_SYNTAX):
 	with Writer(syntax, dict="glitchmonCries") as writer:
@@ -496,18 +499,12 @@ def dump_all_glitch_items(rom: Memory, syntax=DEFAULT_SYNTAX):
 
 #== Image verbs ============================================================================================
 
+# zlib compression level for every PNG written (the --preview option sets it to pngfmt.PREVIEW_LEVEL.)
+png_level = pngfmt.DEFAULT_LEVEL
+
 def write_2bpp_png(path, width, height, rows, palette):
-	import png
-	writer = png.Writer(
-		width       = width,
-		height      = height,
-		palette     = palette,
-		greyscale   = (palette is None),
-		bitdepth    = 2,
-		compression = 9
-	)
-	with open(path, "wb") as outfile:
-		writer.write_packed(outfile, rows)
+	pngfmt.write_png(path, width, height, rows, bitdepth=2, greyscale=(palette is None), palette=palette,
+	                 level=png_level)
 
 def export_tileset_gfx(rom: Memory, path: str, n: int):
 	write_2bpp_png(path, 128, 48, rom.get_tileset_gfx_bitmap(n), None)
@@ -522,11 +519,27 @@ def export_map(rom: Memory, path: str, n: int, color:str=None):
 	write_2bpp_png(path, *rom.get_map_bitmap(n, color=color))
 
 def export_displaced_map(rom: Memory, path: str, map: int, blockaddr: int, x: int, y: int, color:str=None):
-	write_2bpp_png(path, *rom.get_glitch_map_bitmap(map, blockaddr, x, y, color=color))
+	write_2bpp_png(path, *rom.get_displaced_map_bitmap(map, blockaddr, x, y, color=color))
 
 def export_glitch_city(rom: Memory, path: str, map: int, warp: int, color:str=None):
 	write_2bpp_png(path, *rom.get_glitch_city_bitmap(map, warp, color=color))
 
+def export_glitch_city_region(rom: Memory, path: str, map: int, warp: int, x: int, y: int, width: int, height: int,
+                              color:str=None, scale:int=1, unbound:bool=False):
+	info = rom.get_glitch_city_info(map, warp, unbound)
+	write_2bpp_png(path, *rom.get_map_region_bitmap(map, info, x, y, width, height, color, scale))
+
+def export_glitch_city_tiles(rom: Memory, basepath: str, map: int, warp: int, color:str=None, unbound:bool=False):
+	"""Export a glitch city as a pyramid of map tiles for slippy-map viewers, to `basepath/<zoom>/<x>/<y>.png`."""
+	from g1utils.g1gfx import encode_2bpp_rows, MAP_TILE_SIZE
+	info    = rom.get_glitch_city_info(map, warp, unbound)
+	palette = rom.get_map_palette(color, map) if color else None
+	for zoom, tx, ty, pixels in rom.get_map_tiles(map, info):
+		path = os.path.join(basepath, str(zoom), str(tx))
+		os.makedirs(path, exist_ok=True)
+		rows = (row.tobytes() for row in encode_2bpp_rows(pixels, 0 if palette else 3))
+		write_2bpp_png(os.path.join(path, f"{ty}.png"), MAP_TILE_SIZE, MAP_TILE_SIZE, rows, palette)
+
 def export_map_actors(rom: Memory, path: str, n: int, color:str=None):
 	write_2bpp_png(path, *rom.get_map_actors_bitmap(n, color=color))
 
@@ -544,6 +557,195 @@ def export_trainer_sprite(rom: Memory, path: str, n: int, color:str=None):
 	write_2bpp_png(path, *rom.get_trainer_sprite_bitmap(n, color=color))
 
 
+#== Batch sprite export ====================================================================================
+
+def family_sprite_bank(rom: Memory, n: int) -> int:
+	"""
+	Return the sprite bank family sprites of dex number `n` are drawn with. The game finds it by searching
+	the dex number table for the first mon ID (starting from 1) with dex number `n`.
+	Returns `None` if no mon ID has dex number `n`.
+	"""
+	for mon in (*range(1, 256), 0):
+		if rom.get_mon_dex_num(mon) == n:
+			return rom.get_mon_sprite_bank(mon)
+
+def _family_sprite(get_bitmap):
+	def get(rom, n, color):
+		bank = family_sprite_bank(rom, n)
+		if bank is None: raise LookupError(f"no mon has dex number {n}")
+		return get_bitmap(rom, n, bank, color=color)
+	return get
+
+_batch_sprite_kinds = {
+	"front":        lambda rom, n, color: rom.get_mon_frontsprite_bitmap(n, color=color),
+	"back":         lambda rom, n, color: rom.get_mon_backsprite_bitmap(n, color=color),
+	"trainer":      lambda rom, n, color: rom.get_trainer_sprite_bitmap(n, color=color),
+	"family-front": _family_sprite(Memory.get_dex_mon_frontsprite_bitmap),
+	"family-back":  _family_sprite(Memory.get_dex_mon_backsprite_bitmap),
+}
+
+def parse_ids(s: str) -> list[int]:
+	"""Parse a comma-separated list of IDs and inclusive ID ranges, e.g. `"1,5,190-255"`."""
+	ids = []
+	for part in s.split(","):
+		first, _, last = part.partition("-")
+		ids.extend(range(int(first, 0), int(last or first, 0) + 1))
+	return ids
+
+_batch_roms = None
+
+def _init_sprite_batch_worker(images: dict[str, bytes]):
+	global _batch_roms
+	_batch_roms = {version: Memory(rom=data, version=version) for version, data in images.items()}
+
+def _export_sprite_batch_job(version, kind, color, path, ids) -> tuple[int, list[str]]:
+	rom, count, errors = _batch_roms[version], 0, []
+	get_bitmap = _batch_sprite_kinds[kind]
+	os.makedirs(path, exist_ok=True)
+	for n in ids:
+		try:
+			write_2bpp_png(os.path.join(path, f"{n:03}.png"), *get_bitmap(rom, n, color))
+			count += 1
+		except (AddressError, LookupError) as e:
+			errors.append(f"{version} {kind} {n}: {e}")
+	return count, errors
+
+def export_sprite_batch(rom: Memory, basepath: str, kinds:str="front,back,trainer", ids:str="0-255",
+                        colors:str="none", roms:str=None, processes:int=None):
+	"""
+	Export every sprite of each of `kinds` (see `_batch_sprite_kinds`) for each of `ids` with each of `colors`
+	("none" for greyscale), to `basepath/<version>/<kind>/<color>/<id>.png`.
+	`roms` is an optional comma-separated list of more ROM files to export from.
+
+	Each (version, kind, color) is split into chunks of IDs across a pool of `processes` worker processes
+	(default: one per CPU), which each open every ROM image once. If `processes` is 1, it runs in this process.
+	"""
+	import time
+	from concurrent.futures import ProcessPoolExecutor
+	images = {rom.version: rom.rom_image()}
+	for path in (roms.split(",") if roms else ()):
+		other = g1utils.open_rom(path)
+		images[other.version] = other.rom_image()
+
+	ids, jobs = parse_ids(ids), []
+	chunk = max(1, len(ids) // 8)
+	for version in images:
+		for kind in kinds.split(","):
+			if kind not in _batch_sprite_kinds:
+				raise ValueError(f"Unknown sprite kind: {kind}")
+			for color in colors.split(","):
+				path = os.path.join(basepath, version, kind, color)
+				for i in range(0, len(ids), chunk):
+					jobs.append((version, kind, None if color == "none" else color, path, ids[i:i+chunk]))
+
+	start = time.perf_counter()
+	if processes == 1:
+		_init_sprite_batch_worker(images)
+		results = [_export_sprite_batch_job(*job) for job in jobs]
+	else:
+		with ProcessPoolExecutor(processes, initializer=_init_sprite_batch_worker, initargs=(images,)) as pool:
+			results = list(pool.map(_export_sprite_batch_job, *zip(*jobs)))
+	t = time.perf_counter() - start
+
+	count = 0
+	for n, errors in results:
+		count += n
+		for error in errors:
+			print(f"Skipped {error}", file=sys.stderr)
+	print(f"Exported {count} sprites in {t:.2f} s ({count / t:.1f} sprites/s)", file=sys.stderr)
+
+
+#== Sprite atlases =========================================================================================
+
+def _family_sprite_ptr(rom: Memory, n: int, back: bool):
+	bank = family_sprite_bank(rom, n)
+	if bank is None: raise LookupError(f"no mon has dex number {n}")
+	if back: ptr = bank, rom.get_dex_mon_backsprite_addr(n), 4, 4
+	else:    ptr = bank, *rom.get_dex_mon_frontsprite_addr_dims(n)
+	return ptr, rom.get_dex_mon_palette_id(n)
+
+# (bank, addr, width, height) and palette ID of each kind of sprite
+_atlas_sprite_ptrs = {
+	"front":        lambda rom, n: (rom.get_mon_frontsprite_ptr_dims(n), rom.get_mon_palette_id(n)),
+	"back":         lambda rom, n: ((*rom.get_mon_backsprite_ptr(n), 4, 4), rom.get_mon_palette_id(n)),
+	"trainer":      lambda rom, n: ((*rom.get_trainer_sprite_ptr(n), 7, 7), 0x10),
+	"family-front": lambda rom, n: _family_sprite_ptr(rom, n, False),
+	"family-back":  lambda rom, n: _family_sprite_ptr(rom, n, True),
+}
+
+_grey_palette = ((0xFF,0xFF,0xFF), (0xAA,0xAA,0xAA), (0x55,0x55,0x55), (0x00,0x00,0x00))
+
+def _rgb_repr(color) -> str:
+	r, g, b = color
+	return f'"#{r:02X}{g:02X}{b:02X}"'
+
+def export_sprite_atlas(rom: Memory, basepath: str, kinds:str="front", ids:str="0-255", colors:str="sgb",
+                        columns:int=16, rows:int=16):
+	"""
+	Pack every sprite of each of `kinds` (see `_atlas_sprite_ptrs`) for each of `ids` into indexed PNG sheets
+	of `columns` by `rows` 56x56 cells (`basepath_0.png`, `basepath_1.png`, ...). The pixel values are color
+	indices, shown with a greyscale palette.
+
+	`basepath.json` lists each sprite's sheet, position, size, compressed data location, palette ID, and its
+	RGB palette for each of `colors`, so sprites can be colored from the sheet.
+	"""
+	import numpy as np
+	from g1utils.g1gfx import draw_sprite, encode_2bpp_rows
+
+	sprites = []
+	for kind in kinds.split(","):
+		get_ptr = _atlas_sprite_ptrs[kind]
+		for n in parse_ids(ids):
+			try:
+				ptr, palette_id = get_ptr(rom, n)
+				sprites.append((kind, n, rom.get_decompressed_sprite(*ptr), palette_id))
+			except (AddressError, LookupError) as e:
+				print(f"Skipped {kind} {n}: {e}", file=sys.stderr)
+
+	writer = Writer("json")
+	writer.begin_top_level_object()
+	writer.prop("cellWidth",  56)
+	writer.prop("cellHeight", 56)
+	per_sheet, sheets = columns * rows, []
+	for i in range(0, len(sprites), per_sheet):
+		batch  = sprites[i:i+per_sheet]
+		height = -(-len(batch) // columns) * 56
+		sheet  = np.zeros((height, columns*56), np.uint8)
+		for j, (_, _, sprite, _) in enumerate(batch):
+			x, y = (j % columns)*56, (j // columns)*56
+			draw_sprite(sheet[y:y+56, x:x+56], sprite)
+		path = f"{basepath}_{len(sheets)}.png"
+		write_2bpp_png(path, columns*56, height, (row.tobytes() for row in encode_2bpp_rows(sheet)), _grey_palette)
+		sheets.append(os.path.basename(path))
+
+	with writer.begin_list_prop("sheets"):
+		for name in sheets:
+			writer.item(f'"{name}"')
+
+	with writer.begin_list_prop("sprites"):
+		for i, (kind, n, sprite, palette_id) in enumerate(sprites):
+			j = i % per_sheet
+			with writer.begin_object_item():
+				writer.string_prop("kind", kind)
+				writer.prop("id",     n)
+				writer.prop("sheet",  i // per_sheet)
+				writer.prop("x",      (j % columns)*56)
+				writer.prop("y",      (j // columns)*56)
+				writer.prop("width",  56)
+				writer.prop("height", 56)
+				writer.prop("bank",   sprite.bank)
+				writer.prop("addr",   sprite.addr)
+				writer.prop("end",    sprite.end)
+				writer.prop("paletteId", "null" if palette_id is None else palette_id)
+				with writer.begin_object_prop("palettes"):
+					for color in colors.split(","):
+						try: palette = rom.get_palette(color, palette_id)
+						except (AddressError, KeyError): palette = None # KeyError: no such palettes in this version
+						if palette is None: writer.prop(color, "null")
+						else:               writer.tuple_prop(color, [_rgb_repr(c) for c in palette])
+	writer.write(f"{basepath}.json")
+
+
 # ==========================================================================================================
 if __name__ == "__main__":
 
@@ -567,6 +769,8 @@ if __name__ == "__main__":
 		"map":                           export_map,
 		"displaced-map":                 export_displaced_map,
 		"glitchcity":                    export_glitch_city,
+		"glitchcity-region":             export_glitch_city_region,
+		"glitchcity-tiles":              export_glitch_city_tiles,
 		"mon-sprite":                    export_mon_frontsprite,
 		"mon-frontsprite":               export_mon_frontsprite,
 		"mon-backsprite":                export_mon_backsprite,
@@ -574,6 +778,8 @@ if __name__ == "__main__":
 		"mon-family-frontsprite":        export_dex_mon_frontsprite,
 		"mon-family-backsprite":         export_dex_mon_backsprite,
 		"trainer-sprite":                export_trainer_sprite,
+		"sprite-batch":                  export_sprite_batch,
+		"sprite-atlas":                  export_sprite_atlas,
 
 		"tileset-gfx":                   export_tileset_gfx,
 		"tileset-blocks":                export_tileset_blocks
@@ -584,7 +790,7 @@ if __name__ == "__main__":
 		exit(1)
 
 	def print_usage():
-		usage = "Usage: g1dump.py <rom_path> <verb> [args...]"
+		usage = "Usage: g1dump.py [--preview] <rom_path> <verb> [args...] [--options...]"
 		error(usage)
 
 	def typed_args(func, args):
@@ -595,6 +801,21 @@ if __name__ == "__main__":
 			if argtype is int: arg = int(arg, 0)
 			yield arg
 
+	def option_args(func, args):
+		# Boolean parameters of a verb (e.g. unbound) are turned on with --options (e.g. --unbound.)
+		options = {}
+		for arg in args:
+			name = arg[2:].replace("-", "_")
+			if func.__annotations__.get(name) is not bool:
+				error(f"Unknown option for {sys.argv[2]}: {arg}")
+			options[name] = True
+		return options
+
+	if len(sys.argv) > 1 and sys.argv[1] == "--preview":
+		# Fast low-compression PNGs for interactive use
+		png_level = pngfmt.PREVIEW_LEVEL
+		del sys.argv[1]
+
 	if len(sys.argv) < 3:
 		print_usage()
 
@@ -605,4 +826,6 @@ if __name__ == "__main__":
 	verb = _verbs.get(sys.argv[2])
 	if verb is None:
 		error(f"Unknown verb: {sys.argv[2]}")	
-	verb(rom, *typed_args(verb, sys.argv[3:]))
+	args    = [arg for arg in sys.argv[3:] if not arg.startswith("--")]
+	options = [arg for arg in sys.argv[3:] if arg.startswith("--")]
+	verb(rom, *typed_args(verb, args), **option_args(verb, options))
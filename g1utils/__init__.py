@@ -6,6 +6,7 @@ from .g1ram    import *
 from .g1text   import *
 from .g1gfx    import *
 from .g1script import *
+from .g1graph  import *
 
 Info.__module__   = __name__
 Memory.__module__ = __name__
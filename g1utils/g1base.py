@@ -142,6 +142,7 @@ class Memory(gbutils.Memory):
 				g1locations.ram_locations[version]
 			)
 		self._locations = locations
+		self._cache     = {}
 
 	def _name(self):
 		return self.version
@@ -211,6 +212,16 @@ class Memory(gbutils.Memory):
 		bank, addr = self.location_ptr(location)
 		return bank, addr + n*itemsize
 
+	def cached(self, key, build, *args):
+		"""
+		Return the result of `build(self, *args)`, building it only on first use.
+		Whole-table indices are cached this way so they're only ever built once per memory image.
+		"""
+		cache = self._cache
+		if key not in cache:
+			cache[key] = build(self, *args)
+		return cache[key]
+
 
 	from .g1rom import (
 		get_mon_name, get_mon_name_bytes,
@@ -223,27 +234,39 @@ class Memory(gbutils.Memory):
 		get_mon_evolutions, get_mon_evolutions_ptr,
 		get_mon_learnset, get_mon_learnset_ptr,
 		get_mon_dex_entry, get_mon_dex_entry_ptr,
+		get_all_dex_entries,
 		get_move_name,
-		get_move_info,
+		get_move_info, get_move_table,
 		get_move_effect_ptr,
 		get_type_name, get_type_name_ptr,
+		get_type_name_table,
 		get_exp_group_coefficients,
 		get_exp_group_formula,
+		get_exp_table, find_exp_table_drops,
 		get_item_name,
 		get_item_price,
+		get_item_table,
 		get_item_effect_ptr,
 		get_trainer_class_name,
 		get_trainer_encounter_name,
 		get_trainer_class_prize_money,
 		get_trainer_class_ai_info,
-		get_trainer_team,
+		get_trainer_team, get_trainer_team_ptr,
+		get_trainer_team_index,
+		get_all_trainer_teams,
 		get_tileset_num_blocks,
 		get_tileset_header_ptr,
 		get_tileset_block_ptr,
 		get_tileset_block_data,
+		get_tileset_metatiles,
+		get_metatile_index,
 		get_tileset_tile_info,
+		get_tileset_tile_attributes,
+		get_tileset_block_attributes,
+		get_map_attributes,
 		get_town_map_landmark, get_town_map_landmark_data,
-		get_map_soundbank_and_music,
+		get_town_map_landmark_table, get_all_town_map_landmarks,
+		get_map_soundbank_and_music, get_map_music_table,
 		get_map_info,
 		get_map_header_ptr,
 		get_map_drawable_info,
@@ -253,34 +276,49 @@ class Memory(gbutils.Memory):
 		get_map_objects,
 		get_map_sprite_ids,
 		get_map_warpdest,
-		get_dungeon_warpdest,
-		get_fly_warpdest,
+		get_dungeon_warpdest, get_dungeon_warp_index, get_all_dungeon_warpdests,
+		get_fly_warpdest, get_fly_warp_index, get_all_fly_warpdests,
 		get_displaced_map_info,
 		get_glitch_city_info,
+		find_all_glitch_cities,
 		get_map_wild_encounters, get_map_wild_encounter_ptr,
+		get_wild_encounter_index, find_wild_encounters,
 		find_all_glitchmon_dex_nums,
 		find_all_unused_glitch_dex_nums,
 		find_all_learnable_glitch_moves,
 		find_all_used_glitch_types,
 		find_all_used_glitch_exp_groups,
 		find_all_used_glitchmon_palette_ids,
-		find_all_move_learners,
+		find_all_used_glitch_tilesets,
+		get_glitch_survey,
 		can_mon_learn_move, can_dex_mon_learn_move,
+		get_learnability_matrix, get_dex_learnability_matrix,
 		find_all_move_learners
 	)
 	from .g1gfx import (
 		get_palette, get_raw_palette,
+		get_palette_table, apply_palette,
 		get_mon_palette, get_mon_palette_id,
 		get_dex_mon_palette, get_dex_mon_palette_id,
 		get_map_palette,
 		get_sprite_info,
-		get_map_spriteset,
+		get_map_spriteset, get_map_spriteset_at,
+		get_split_spriteset_grid,
+		get_spriteset_vram,
 		get_tileset_gfx, get_tileset_gfx_ptr,
 		get_tileset_gfx_bitmap,
 		get_tileset_block_bitmaps,
+		get_tileset_block_pixels,
 		get_map_bitmap,
 		get_displaced_map_bitmap,
+		is_glitch_map_data,
+		get_map_render_modes,
 		get_glitch_city_bitmap,
+		get_map_region_pixels, get_map_region_bitmap,
+		get_map_tile_pixels, get_map_tiles,
+		get_map_pixels, get_displaced_map_pixels, get_glitch_city_pixels,
+		get_mon_frontsprite_pixels, get_mon_backsprite_pixels,
+		get_trainer_sprite_pixels,
 		get_mon_sprite_bank,
 		get_mon_frontsprite_ptr_dims, get_dex_mon_frontsprite_addr_dims,
 		get_mon_backsprite_ptr, get_dex_mon_backsprite_addr,
@@ -288,7 +326,11 @@ class Memory(gbutils.Memory):
 		get_mon_frontsprite_bitmap, get_mon_backsprite_bitmap,
 		get_trainer_sprite_bitmap,
 		get_trainer_sprite_ptr,
-		get_compressed_bitmap
+		get_compressed_bitmap,
+		get_decompressed_sprite
+	)
+	from .g1graph import (
+		get_map_graph
 	)
 	from .g1text import (
 		get_packed_name,
@@ -1,6 +1,9 @@
 # g1gfx.py
 from __future__ import annotations
 
+from collections import OrderedDict
+from hashlib     import blake2b
+
 from .g1base import *
 from .g1rom  import *
 
@@ -33,6 +36,27 @@ def get_raw_palette(rom: Memory, type: str, n: int) -> Palette:
 			pal.append(bytes((rgb & 31, (rgb >> 5) & 31, (rgb >> 10) & 31)))
 		return tuple(pal)
 
+def _build_palette_table(rom: Memory, type: str):
+	import numpy as np
+	bank, addr = rom.location(type+"_palettes")
+	data  = rom.read_bytes(bank, addr, 256*8, allow_partial=True)
+	words = np.frombuffer(data, "<u2", len(data) // 8 * 4).reshape(-1, 4)
+	if type == "sgb":
+		# SGB doesn't actually use the first color apparently?
+		words = words.copy()
+		words[:, 0] = rom.read16(bank, addr + 8*0x1F)
+	rgb   = np.stack((words & 31, (words >> 5) & 31, (words >> 10) & 31), axis=-1).astype(np.uint8)
+	table = (rgb << 3) | (rgb >> 2)
+	table.flags.writeable = False
+	return table
+
+def get_palette_table(rom: Memory, type: str):
+	"""
+	Return every readable palette ID's 8-bit RGB colors (see `get_palette`) as a read-only `uint8` NumPy array
+	of shape `(N, 4, 3)`, where `N` is the number of palette IDs (up to 256) that can be read.
+	"""
+	return rom.cached(("palette_table", type), _build_palette_table, type)
+
 def get_palette(rom: Memory, type: str, n: int) -> Palette:
 	"""
 	Return palette `n` converted to an 8-bit RGB color.
@@ -40,22 +64,10 @@ def get_palette(rom: Memory, type: str, n: int) -> Palette:
 	into the new lowest 3 bits.
 	"""
 	if n is not None:
-		bank, addr = rom.location(type+"_palettes")
-		data = rom.read_bytes(bank, addr + 8*n, 8)
-		if type == "sgb":
-			# SGB doesn't actually use the first color apparently?
-			color = rom.read16(bank, addr + 8*0x1F, 8)
-			data[0], data[1] = color & 0xFF, color >> 8
-		pal = []
-		for i in range(0,8,2):
-			rgb = unpack16(data,i)
-			r, g, b = rgb & 31, (rgb >> 5) & 31, (rgb >> 10) & 31
-			pal.append(bytes((
-				(r << 3) | (r >> 2),
-				(g << 3) | (g >> 2),
-				(b << 3) | (b >> 2)
-			)))
-		return tuple(pal)
+		table = get_palette_table(rom, type)
+		if n >= len(table):
+			raise AddressError(rom.location(type+"_palettes")[1] + 8*n)
+		return tuple(bytes(color) for color in table[n])
 
 def get_dex_mon_palette(rom: Memory, type: str, n: int) -> Palette:
 	return rom.get_palette(type, rom.get_dex_mon_palette_id(n))
@@ -66,34 +78,68 @@ def get_map_palette(rom: Memory, type: str, n: int) -> Palette:
 	# Indoor map palettes (except caves/cemeteries) are determined from the palette of
 	# the outdoor map they were entered from, which would be a huge pain to determine
 	# from ROM data. Thus, I just use a predefined lookup table in g1const.
-	return rom.get_palette(g1const.map_palette_id(n, rom.is_yellow), type)
+	return rom.get_palette(type, g1const.map_palette_id(n, rom.is_yellow))
+
+
+#== Tile codec =============================================================================================
+
+_pixel_lut = None
+
+def _get_pixel_lut():
+	# Bit j of byte b (MSB first) for every possible bitplane byte, as a (256, 8) array.
+	global _pixel_lut
+	if _pixel_lut is None:
+		import numpy as np
+		_pixel_lut = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1)
+	return _pixel_lut
+
+def planes_to_pixels(lo, hi):
+	"""
+	Combine arrays of low and high bitplane bytes into an array of 2-bit color indices,
+	with one more axis of size 8 (the pixels of each byte, left to right.)
+	"""
+	lut = _get_pixel_lut()
+	return lut[lo] | (lut[hi] << 1)
+
+def decode_2bpp_tiles(gfx: bytes):
+	"""
+	Decode GB 2bpp tile data into a `uint8` NumPy array of color indices of shape `(ntiles, 8, 8)`.
+	A trailing partial tile is padded with zeros.
+	"""
+	import numpy as np
+	data = np.zeros(-(-len(gfx) // 16) * 16, np.uint8)
+	data[:len(gfx)] = np.frombuffer(gfx, np.uint8)
+	data = data.reshape(-1, 8, 2)
+	return planes_to_pixels(data[..., 0], data[..., 1])
+
+def encode_2bpp_rows(pixels, flip:int=0):
+	"""
+	Pack a `(height, width)` array of 2-bit color indices into packed 2bpp PNG rows
+	(4 pixels per byte, leftmost pixel in the high bits), XORing each index with `flip`.
+	`width` must be a multiple of 4.
+	"""
+	import numpy as np
+	pixels = pixels.reshape(pixels.shape[0], pixels.shape[1] // 4, 4)
+	if flip: pixels = pixels ^ np.uint8(flip & 3)
+	return (pixels[..., 0] << 6) | (pixels[..., 1] << 4) | (pixels[..., 2] << 2) | pixels[..., 3]
+
+def tiles_to_pixels(tiles, width: int):
+	"""Arrange an `(ntiles, 8, 8)` array into a `(ntiles // width * 8, width * 8)` image, row by row."""
+	return tiles.reshape(-1, width, 8, 8).transpose(0, 2, 1, 3).reshape(-1, width * 8)
+
+def _packed_rows(packed):
+	for row in packed:
+		yield row.tobytes()
 
 
 #== Tilemaps ===============================================================================================
 
 def _gfx_bitmap(gfx, width):
-	goff, glen   = 0, len(gfx)
-	pwidth, plen = width * 2, width * 16
-	buf = bytearray(plen)
-	while goff < glen:
-		px, poff = 0, 0
-		while px < pwidth:
-			while poff < plen:
-				b1, b2 = gfx[goff] ^ 0xFF, gfx[goff + 1] ^ 0xFF
-				# interleave the bitplanes (aaaaaaaa bbbbbbbb -> abababab abababab)
-				b1=(b1|b1<<4) & 0x0F0F; b1=(b1|b1<<2) & 0x3333; b1=(b1|b1<<1) & 0x5555
-				b2=(b2|b2<<4) & 0x0F0F; b2=(b2|b2<<2) & 0x3333; b2=(b2|b2<<1) & 0x5555
-				bits = b1 | (b2 << 1)
-				buf[poff], buf[poff+1] = bits >> 8, bits & 0xFF
-				goff += 2
-				poff += pwidth
-			px  += 2
-			poff = px
-
-		y = 0
-		while y < plen:
-			yield buf[y:y+pwidth]
-			y += pwidth
+	import numpy as np
+	tiles = decode_2bpp_tiles(gfx)
+	if len(tiles) % width:
+		tiles = np.concatenate((tiles, np.zeros((width - len(tiles) % width, 8, 8), np.uint8)))
+	return _packed_rows(encode_2bpp_rows(tiles_to_pixels(tiles, width), 3))
 
 
 #== Overworld sprites ======================================================================================
@@ -116,19 +162,104 @@ def _get_split_spriteset_side(rom: Memory, n, x, y):
 			if y < div: return 0x0A
 			else:       return 0x01
 
-def get_map_spriteset(rom: Memory, n: int, info: Info, allow_partial:bool=False) -> bytes:
-	sprites = bytearray((1,)) # sprite ID 1 (player's sprite) is always loaded
+def _build_split_spriteset_grid(rom: Memory, n: int):
+	grid = bytearray(256*256)
+	if n != 0xF8:
+		t, div, s1, s2 = rom.table_read_bytes("split_spritesets", 4, (n - 0xF1) & 0xFF)
+		if t == 1: # split along x
+			grid[:] = (bytes((s1,)) * div + bytes((s2,)) * (256 - div)) * 256
+		else:      # split along y
+			grid[:] = bytes((s1,)) * (div*256) + bytes((s2,)) * ((256 - div)*256)
+	else:
+		for y in range(256):
+			grid[y*256:(y+1)*256] = bytes(_get_split_spriteset_side(rom, n, x, y) for x in range(256))
+	return bytes(grid)
+
+def get_split_spriteset_grid(rom: Memory, n: int) -> bytes:
+	"""
+	Return the spriteset ID used at each coordinate of a map using split spriteset `n` (F1-FF),
+	as a 256x256 grid indexed by `y*256 + x`.
+	"""
+	return rom.cached(("split_spriteset_grid", n), _build_split_spriteset_grid, n)
+
+def _build_spriteset_table(rom: Memory):
+	bank, addr = rom.location("spritesets")
+	data = rom.read_bytes(bank, addr, 256*11, allow_partial=True)
+	return Info(
+		map_spritesets = rom.read_bytes(*rom.location("map_spritesets"), 0x25),
+		# spriteset n is entry (n - 1) & 0xFF
+		spritesets     = [bytes(data[i:i+11]) for i in (((n - 1) & 0xFF) * 11 for n in range(256))],
+		loaded         = {} # map ID or ("outdoor", spriteset ID) -> sprite IDs
+	)
+
+def _get_indoor_map_sprite_ids(rom: Memory, n: int, allow_partial: bool) -> bytes:
+	graph = rom.get_map_graph()
+	if not graph.complete[n]:
+		return bytes(rom.get_map_sprite_ids(n, allow_partial=allow_partial))
+	sprites = bytearray()
+	actors, size = graph.actors, graph.ACTOR_SIZE
+	for i in range(graph.actor_start[n], graph.actor_start[n+1]):
+		sprite = actors[i*size + 3]
+		if sprite not in sprites:
+			sprites.append(sprite)
+			if len(sprites) >= 9: break
+	return bytes(sprites)
+
+def get_map_spriteset_at(rom: Memory, n: int, x: int, y: int, allow_partial:bool=False) -> bytes:
+	"""
+	Return the sprite IDs loaded in map `n` when the player is at (`x`, `y`).
+	Spritesets are precomputed per memory image, so this is a constant-time lookup.
+	"""
+	table  = rom.cached("spriteset_table", _build_spriteset_table)
+	loaded = table.loaded
 	if n < 0x25:
 		# outdoor maps use predefined spritesets
-		n = rom.table_read8("map_spritesets", n)
+		n = table.map_spritesets[n]
 		if n > 0xF0:
-			n = _get_split_spriteset_side(rom, n, info.player_x, info.player_y)
-		sprites.extend(rom.table_read_bytes("spritesets", 11, (n - 1) & 0xFF))
+			n = get_split_spriteset_grid(rom, n)[min(y, 255)*256 + min(x, 255)]
+		sprites = loaded.get(("outdoor", n))
+		if sprites is None:
+			# sprite ID 1 (player's sprite) is always loaded
+			sprites = b"\x01" + table.spritesets[n]
+			if len(sprites) == 12:
+				loaded["outdoor", n] = sprites
+			elif not allow_partial:
+				raise AddressError(rom.location("spritesets")[1] + ((n - 1) & 0xFF)*11 + len(sprites) - 1)
 	else:
 		# for indoor maps, the map's sprite IDs are used directly
-		sprites.extend(rom.get_map_sprite_ids(n, allow_partial=allow_partial))
+		sprites = loaded.get(n)
+		if sprites is None:
+			sprites = b"\x01" + _get_indoor_map_sprite_ids(rom, n, allow_partial)
+			if rom.get_map_graph().complete[n]: loaded[n] = sprites
 	return sprites
 
+def get_map_spriteset(rom: Memory, n: int, info: Info, allow_partial:bool=False) -> bytes:
+	return get_map_spriteset_at(rom, n, info.player_x, info.player_y, allow_partial)
+
+def _build_spriteset_vram(rom: Memory, spriteset: bytes):
+	vram = bytearray(0x1000)
+	_vram_load_font(rom, vram)
+
+	# Walking frames of overworld sprites occupy the area of VRAM usable by both backgrounds and objects.
+	# (This is why many glitch map blocks have pieces of overworld sprites in them.)
+	nowalk  = 0x47 if rom.is_yellow else 0x3D # sprite IDs starting here have no walking frames
+	vramoff = 0x800
+	for n in spriteset:
+		if n >= nowalk: continue # skip any sprites without walking frames
+		bank, addr, length = rom.get_sprite_info(n)
+		addr += 0xC0 # start of walking frames
+		rom.copy_bytes(bank, addr, vram, vramoff, length, allow_partial=True)
+		vramoff += 0xC0
+	return bytes(vram[0x600:])
+
+def get_spriteset_vram(rom: Memory, spriteset: bytes) -> bytes:
+	"""
+	Return VRAM $8600-$8FFF (the tiles shared with the font and overworld sprites) as laid out
+	on the overworld with the given sprite IDs loaded. Cached per spriteset.
+	"""
+	spriteset = bytes(spriteset)
+	return rom.cached(("spriteset_vram", spriteset), _build_spriteset_vram, spriteset)
+
 
 #== Tilesets ===============================================================================================
 
@@ -162,54 +293,54 @@ def _vram_load_font(rom: Memory, vram):
 
 def _load_map_vram_glitch_tiles(rom: Memory, vram, spriteset):
 	# Emulate how graphics are laid out in VRAM when on the overworld.
-
-	_vram_load_font(rom, vram)
-	
 	if spriteset is None: spriteset = (1,) # Player sprite is always loaded
-	
-	# Walking frames of overworld sprites occupy the area of VRAM usable by both backgrounds and objects.
-	# (This is why many glitch map blocks have pieces of overworld sprites in them.)
-	nowalk  = 0x47 if rom.is_yellow else 0x3D # sprite IDs starting here have no walking frames
-	vramoff = 0x800
-	for n in spriteset:
-		if n >= nowalk: continue # skip any sprites without walking frames
-		bank, addr, length = rom.get_sprite_info(n)
-		addr += 0xC0 # start of walking frames
-		rom.copy_bytes(bank, addr, vram, vramoff, length, allow_partial=True)
-		vramoff += 0xC0
+	vram[0x600:0x1000] = get_spriteset_vram(rom, spriteset)
 
 def get_tileset_block_bitmaps(rom: Memory, n: int, glitch:bool=False) -> Generator[ImageGenerator]:
 	"""Return an iterator that yields a bitmap iterator for each block in tileset `n`."""
-	gfx  = rom.get_tileset_gfx(n)
-	data = rom.stream(*get_tileset_block_ptr(rom, n))
-	buf  = bytearray(256) # 32*32px @ 2bpp
-	for _ in range(rom.get_tileset_num_blocks(n, glitch)):
-		yield _block_bitmap(data.next_bytes(16), gfx, buf)
-
-def _block_bitmap(tiles, gfx, buf):
-	ty, ti = 0, 0
-	while ty < 256:
-		tx = 0
-		while tx < 8:
-			goff = tiles[ti] * 16
-			poff = ty + tx
-			pend = poff + 64
-			while poff < pend:
-				b1, b2 = gfx[goff] ^ 0xFF, gfx[goff+1] ^ 0xFF
-				# interleave the bitplanes (aaaaaaaa bbbbbbbb -> abababab abababab)
-				b1=(b1|b1<<4) & 0x0F0F; b1=(b1|b1<<2) & 0x3333; b1=(b1|b1<<1) & 0x5555
-				b2=(b2|b2<<4) & 0x0F0F; b2=(b2|b2<<2) & 0x3333; b2=(b2|b2<<1) & 0x5555
-				bits = b1 | (b2 << 1)
-				buf[poff], buf[poff+1] = bits >> 8, bits & 0xFF
-				goff += 2
-				poff += 8
-			ti += 1
-			tx += 2
-		ty += 64
-	y = 0
-	while y < 256:
-		yield buf[y:y+8]
-		y += 8
+	for pixels in get_tileset_block_pixels(rom, n, glitch):
+		yield _packed_rows(encode_2bpp_rows(pixels, 3))
+
+# Max number of rendered tilesets kept by get_tileset_block_pixels (256 blocks are 256 KiB.)
+BLOCK_CACHE_SIZE = 64
+
+def _render_tileset_blocks(blocktiles, gfx):
+	import numpy as np
+	tiles = np.zeros((256, 8, 8), np.uint8) # tiles past the end of the gfx are left blank
+	gfx   = decode_2bpp_tiles(gfx)[:256]
+	tiles[:len(gfx)] = gfx
+	blocktiles = np.frombuffer(blocktiles, np.uint8, len(blocktiles) & ~15).reshape(-1, 16)
+	# (nblocks, 4, 4, 8, 8) -> (nblocks, 4, 8, 4, 8): blocks, tile rows, pixel rows, tile columns, pixels
+	pixels = tiles[blocktiles].reshape(-1, 4, 4, 8, 8).transpose(0, 1, 3, 2, 4).reshape(-1, 32, 32)
+	pixels.flags.writeable = False
+	return pixels
+
+def get_tileset_block_pixels(rom: Memory, n: int, glitch:bool=False, spriteset:bytes=None):
+	"""
+	Return the color indices of every block in tileset `n` as a read-only `uint8` NumPy array
+	of shape `(nblocks, 32, 32)`. In glitch mode, all 256 block IDs are drawn (blocks that can't be read
+	are drawn as tile 0) using the VRAM contents with `spriteset` loaded (see `get_tileset_gfx`.)
+
+	Renders are kept in a bounded LRU cache keyed by the tileset and a hash of its effective VRAM image
+	and block data, so glitch maps that share a tileset and spriteset are only drawn once.
+	"""
+	gfx        = rom.get_tileset_gfx(n, glitch, spriteset)
+	blocktiles = get_tileset_block_data(rom, n, glitch)
+	if glitch:
+		blocktiles.extend(bytes(0x1000 - len(blocktiles)))
+	h = blake2b(gfx, digest_size=16)
+	h.update(blocktiles)
+	key = (n, h.digest())
+
+	cache  = rom.cached("tileset_block_pixels", lambda rom: OrderedDict())
+	pixels = cache.get(key)
+	if pixels is None:
+		pixels = cache[key] = _render_tileset_blocks(blocktiles, gfx)
+		if len(cache) > BLOCK_CACHE_SIZE:
+			cache.popitem(last=False)
+	else:
+		cache.move_to_end(key)
+	return pixels
 
 
 #== Maps ===================================================================================================
@@ -234,7 +365,8 @@ def get_map_bitmap(rom: Memory, n: int, color:str=None) -> ImageGenerator:
 def get_displaced_map_bitmap(mem: Memory, map: int, block_addr: int, 
                              x: int, y: int, color:str=None) -> ImageGenerator:
 	"""Draw a bitmap of the map data at `block_addr`."""
-	return _map_bitmap(mem, map, mem.get_displaced_map_info(map, block_addr, x, y), color, True)
+	info = mem.get_displaced_map_info(mem.get_map_drawable_info(map), block_addr, x, y)
+	return _map_bitmap(mem, map, info, color, True)
 
 def get_glitch_city_bitmap(rom: Memory, map: int, warp: int, color:str=None) -> ImageGenerator:
 	"""Draw a bitmap of the glitch city obtained by entering `map` from `warp`."""
@@ -244,68 +376,259 @@ def get_cur_map_bitmap(mem: Memory) -> ImageGenerator:
 	"""Draw a bitmap of the current map in memory."""
 	return _map_bitmap(mem, )
 
-def _map_bitmap(mem, n, info, palette, glitch=False):
-	if palette: palette = mem.get_map_palette(type, n)
+def _map_block_grid(mem: Memory, info: Info):
+	# Returns the block IDs of the map data described by `info` as a (rows, width) array, read in one go.
+	# Rows past the end of readable memory are cut off, so `rows` may be less than `info.height`.
+	import numpy as np
+	width, height, step = info.width, info.height, info.block_step
+	if width == 0 or height == 0:
+		return np.zeros((height, width), np.uint8)
+	span = mem.read_bytes(info.bank, info.block_addr & 0xFFFF, (height - 1)*step + width, allow_partial=True)
+	span = np.frombuffer(span, np.uint8)
+	rows = min(height, (len(span) - width) // step + 1) if len(span) >= width else 0
+	return span[np.arange(rows)[:, None] * step + np.arange(width)]
+
+def _read_map_blocks(mem: Memory, info: Info) -> bytes:
+	# Returns the block IDs of each readable row of the map data described by `info`, back to back.
+	return _map_block_grid(mem, info).tobytes()
+
+def _uses_glitch_blocks(mem: Memory, blocks: bytes, blocktiles: bytes, gfxlen: int) -> bool:
+	import numpy as np
+	used = np.unique(np.frombuffer(blocks, np.uint8))
+	if len(used) == 0: return False
+	nblocks = len(blocktiles) // 16
+	if used[-1] >= nblocks: return True
+	tiles = np.frombuffer(blocktiles, np.uint8, nblocks*16).reshape(nblocks, 16)[used]
+	return (int(tiles.max()) + 1) * 16 > gfxlen
+
+def is_glitch_map_data(mem: Memory, info: Info) -> bool:
+	"""
+	True if drawing the map data described by `info` (see `get_map_drawable_info`) uses blocks past
+	the end of its tileset's blocks, or tiles past the end of its tileset's graphics.
+	"""
+	tileset = info.tileset
+	return _uses_glitch_blocks(
+		mem, _read_map_blocks(mem, info), get_tileset_block_data(mem, tileset), len(mem.get_tileset_gfx(tileset))
+	)
+
+MAP_RENDER_NORMAL     = 0
+MAP_RENDER_GLITCH     = 1
+MAP_RENDER_UNREADABLE = 2
+
+def _build_map_render_modes(rom: Memory):
+	modes, tilesets = bytearray(256), {}
+	for n in range(256):
+		try:
+			info = rom.get_map_drawable_info(n)
+			tileset = tilesets.get(info.tileset)
+			if tileset is None:
+				tileset = tilesets[info.tileset] = (
+					get_tileset_block_data(rom, info.tileset), len(rom.get_tileset_gfx(info.tileset))
+				)
+			modes[n] = MAP_RENDER_GLITCH if _uses_glitch_blocks(rom, _read_map_blocks(rom, info), *tileset) \
+			      else MAP_RENDER_NORMAL
+		except AddressError:
+			modes[n] = MAP_RENDER_UNREADABLE
+	return bytes(modes)
+
+def get_map_render_modes(rom: Memory) -> bytes:
+	"""
+	Return the `MAP_RENDER_*` mode each map ID is drawn with by `get_map_bitmap`:
+	whether it uses glitch blocks or tiles (see `is_glitch_map_data`), or its header can't be read.
+	"""
+	return rom.cached("map_render_modes", _build_map_render_modes)
+
+def _map_bitmap(mem, n, info, color, glitch=False):
+	palette = mem.get_map_palette(color, n) if color else None
+	if not glitch:
+		glitch = is_glitch_map_data(mem, info)
 	rows = _map_bitmap_rows(mem, n, info, not palette, glitch)
 	return info.width*32, info.height*32, rows, palette
 
-def _map_bitmap_rows(mem: Memory, bank, addr, width, height, step, bitflip, gfx, blocktiles, glitch):
-	spriteset = mem.get_map_spriteset(id, info, allow_partial=True) if glitch else None
-	bitflip   = 0xFF if bitflip else 0
-	pwidth    = width * 8              # image width in bytes (2bpp)
-	buf       = bytearray(pwidth * 32) # one block row, each block is 32px tall
-	blockrow  = mem.read_bytes(bank, addr, width)
-	by, bx    = 0, 0
-	while True:
-		try:
-			while by < height:
-				while bx < width:
-				
-					tx, toff = 0, blockrow[bx] * 16
-					while tx < 8:
-						ty, poff = 0, bx*8 + tx
-						while ty < 4:
-							py, goff = 0, blocktiles[toff] * 16
-							while py < 8:
-								b1, b2 = gfx[goff] ^ bitflip, gfx[goff+1] ^ bitflip
-								# interleave the bitplanes (aaaaaaaa bbbbbbbb -> abababab abababab)
-								b1=(b1|b1<<4) & 0x0F0F; b1=(b1|b1<<2) & 0x3333; b1=(b1|b1<<1) & 0x5555
-								b2=(b2|b2<<4) & 0x0F0F; b2=(b2|b2<<2) & 0x3333; b2=(b2|b2<<1) & 0x5555
-								bits = b1 | (b2 << 1)
-								buf[poff], buf[poff+1] = bits >> 8, bits & 0xFF
-								py   += 1
-								goff += 2
-								poff += pwidth
-							ty   += 1
-							toff += 4
-						tx   += 2
-						toff -= 15
-					bx += 1
-			
-				y, yend = 0, len(buf)
-				while y < yend:
-					yield buf[y:y+pwidth]
-					y += pwidth
-			
-				by += 1
-				bx  = 0
-				addr += step
-				blockrow   = mem.read_bytes(bank, addr, width)
-			
-			break
-		except IndexError:
-			# lazily switch to glitch map mode if we hit a glitch block/tile
-			if glitch: raise
-			glitch = True
-			
-			blocktiles = get_tileset_block_data(mem, info.tileset, glitch=True)
-			
-			# XXX is there a more efficient way to expand the gfx array size?
-			gfx.extend(bytearray(0x1000 - len(gfx)))
-			spriteset = mem.get_map_spriteset(id, info, allow_partial=True)
-			_load_map_vram_glitch_tiles(mem, gfx, spriteset)
-
-			continue
+def _map_block_pixels(mem: Memory, n, info, glitch):
+	# Returns the rendered blocks used to draw the map data described by `info`.
+	spriteset = None
+	if glitch:
+		# Decide the glitch map mode up front (see is_glitch_map_data) so nothing is ever drawn twice.
+		spriteset = mem.get_map_spriteset_at(n, info.player_x or 0, info.player_y or 0, allow_partial=True)
+	return get_tileset_block_pixels(mem, info.tileset, glitch, spriteset)
+
+def _render_block_grid(grid, blocks):
+	# Gathers a (rows, width) grid of block IDs into a (rows*32, width*32) image of color indices:
+	# (rows, width, 32, 32) -> (rows, 32, width, 32): block rows, pixel rows, blocks, pixels.
+	rows, width = grid.shape
+	return blocks[grid].transpose(0, 2, 1, 3).reshape(rows*32, width*32)
+
+def _map_pixels(mem: Memory, n, info, glitch):
+	# Returns the (rows*32, width*32) color indices of every readable block row of the map data.
+	grid = _map_block_grid(mem, info)
+	return _render_block_grid(grid, _map_block_pixels(mem, n, info, glitch))
+
+def _map_bitmap_rows(mem: Memory, n, info, bitflip, glitch):
+	pixels = _map_pixels(mem, n, info, glitch)
+	yield from _packed_rows(encode_2bpp_rows(pixels, 3 if bitflip else 0))
+	_check_map_pixels(info, pixels)
+
+
+#== Map regions / tiles ====================================================================================
+
+def _map_region_pixels(mem: Memory, n, info, ys, xs, glitch):
+	# Gathers the pixels at rows `ys` and columns `xs` (ascending NumPy arrays of map pixel coordinates.)
+	# Only the block rows and columns those pixels fall in are read; pixels outside the map or in blocks
+	# that can't be read are left as color 0.
+	import numpy as np
+	out = np.zeros((len(ys), len(xs)), np.uint8)
+	yin = (ys >= 0) & (ys < info.height*32)
+	xin = (xs >= 0) & (xs < info.width*32)
+	ys, xs = ys[yin], xs[xin]
+	if len(ys) == 0 or len(xs) == 0: return out
+
+	brows, bcols = ys // 32, xs // 32
+	rows, c0, c1 = np.unique(brows), int(bcols[0]), int(bcols[-1]) + 1
+	grid  = np.zeros((len(rows), c1 - c0), np.uint8)
+	valid = np.zeros((len(rows), c1 - c0), bool)
+	for i, row in enumerate(rows):
+		# Block addresses are 16-bit, so rows far enough down an unbound map wrap around to $0000.
+		addr = (info.block_addr + int(row)*info.block_step + c0) & 0xFFFF
+		data = mem.read_bytes(info.bank, addr, c1 - c0, allow_partial=True)
+		grid[i, :len(data)]  = np.frombuffer(data, np.uint8)
+		valid[i, :len(data)] = True
+		# A partial read stops at the first unmapped address, but blocks after the gap may still be readable.
+		for j in range(len(data) + 1, c1 - c0):
+			block = mem.read8(info.bank, (addr + j) & 0xFFFF, default=None)
+			if block is not None: grid[i, j], valid[i, j] = block, True
+
+	rowidx, colidx = np.searchsorted(rows, brows)[:, None], (bcols - c0)[None, :]
+	pixels = _map_block_pixels(mem, n, info, glitch)[grid[rowidx, colidx], (ys % 32)[:, None], (xs % 32)[None, :]]
+	pixels[~valid[rowidx, colidx]] = 0
+	out[np.ix_(yin, xin)] = pixels
+	return out
+
+def get_map_region_pixels(mem: Memory, n: int, info: Info, x: int, y: int, width: int, height: int,
+                          scale:int=1, glitch:bool=True):
+	"""
+	Return the color indices of the `width` by `height` pixel rectangle at `(x, y)` of the map data described
+	by `info` (see `get_map_drawable_info`, `get_displaced_map_info`), as a `uint8` NumPy array.
+	Only the blocks inside the rectangle are read and drawn, and nothing outside it is ever rendered.
+
+	If `scale` is more than 1, only every `scale`th pixel in each direction is drawn, giving a
+	`ceil(height / scale)` by `ceil(width / scale)` image.
+	Pixels outside the map or in blocks that can't be read are color 0.
+
+	The map is drawn in glitch mode (see `get_displaced_map_bitmap`) unless `glitch` is false, which is only
+	safe for map data that `is_glitch_map_data` says doesn't use glitch blocks or tiles.
+	"""
+	import numpy as np
+	ys = np.arange(y, y + height, scale)
+	xs = np.arange(x, x + width,  scale)
+	return _map_region_pixels(mem, n, info, ys, xs, glitch)
+
+def get_map_region_bitmap(mem: Memory, n: int, info: Info, x: int, y: int, width: int, height: int,
+                          color:str=None, scale:int=1, glitch:bool=True) -> ImageGenerator:
+	"""Draw a bitmap of a rectangle of the map data described by `info` (see `get_map_region_pixels`.)"""
+	import numpy as np
+	palette = mem.get_map_palette(color, n) if color else None
+	pixels  = get_map_region_pixels(mem, n, info, x, y, width, height, scale, glitch)
+	height, width = pixels.shape
+	if width % 4:
+		pixels = np.pad(pixels, ((0, 0), (0, -width % 4)))
+	return width, height, _packed_rows(encode_2bpp_rows(pixels, 0 if palette else 3)), palette
+
+MAP_TILE_SIZE = 256
+
+def get_map_max_zoom(info: Info) -> int:
+	"""
+	Return the zoom level map tiles of the map data described by `info` are drawn at full size at.
+	At zoom level 0 the whole map fits in one tile, and each level up doubles the size of the map.
+	"""
+	size, zoom = max(info.width, info.height) * 32, 0
+	while (MAP_TILE_SIZE << zoom) < size: zoom += 1
+	return zoom
+
+def get_map_tile_pixels(mem: Memory, n: int, info: Info, zoom: int, tx: int, ty: int, glitch:bool=True):
+	"""
+	Return the color indices of the `MAP_TILE_SIZE` square map tile `(tx, ty)` at zoom level `zoom`
+	(see `get_map_max_zoom`) of the map data described by `info`, for slippy-map style viewers.
+	Tiles below full size are downscaled by drawing every `2**(max_zoom - zoom)`th pixel.
+	"""
+	scale = 1 << (get_map_max_zoom(info) - zoom)
+	size  = MAP_TILE_SIZE * scale
+	return get_map_region_pixels(mem, n, info, tx*size, ty*size, size, size, scale, glitch)
+
+def get_map_tiles(mem: Memory, n: int, info: Info, zooms=None, glitch:bool=True) -> Generator[tuple]:
+	"""
+	Return an iterator that yields `(zoom, tx, ty, pixels)` for each map tile covering the map data described
+	by `info` at each of `zooms` (default: every zoom level), one tile at a time (see `get_map_tile_pixels`.)
+	"""
+	max_zoom = get_map_max_zoom(info)
+	for zoom in (range(max_zoom + 1) if zooms is None else zooms):
+		size = MAP_TILE_SIZE << (max_zoom - zoom)
+		for ty in range(-(-info.height*32 // size)):
+			for tx in range(-(-info.width*32 // size)):
+				yield zoom, tx, ty, get_map_tile_pixels(mem, n, info, zoom, tx, ty, glitch)
+
+
+#== Pixel arrays ===========================================================================================
+
+_grey_rgb = ((0xFF,0xFF,0xFF), (0xAA,0xAA,0xAA), (0x55,0x55,0x55), (0x00,0x00,0x00))
+
+def apply_palette(rom: Memory, pixels, type: str, n: int):
+	"""
+	Color a `uint8` NumPy array of 2-bit color indices with palette `n` of `type` (see `get_palette_table`),
+	giving an array of 8-bit RGB colors with one more axis of size 3.
+	If `type` is `None`, `pixels` is returned as-is. If `n` is `None`, the colors are greys.
+	"""
+	import numpy as np
+	if type is None: return pixels
+	palette = np.array(_grey_rgb, np.uint8) if n is None else get_palette_table(rom, type)[n]
+	return palette.take(pixels, axis=0)
+
+def _check_map_pixels(info, pixels):
+	if len(pixels) < info.height*32: # stopped at the first block row that can't be read
+		raise AddressError(info.block_addr + len(pixels)//32 * info.block_step)
+
+def _map_pixels_colored(mem, n, info, color, glitch):
+	pixels = _map_pixels(mem, n, info, glitch)
+	_check_map_pixels(info, pixels)
+	return apply_palette(mem, pixels, color, g1const.map_palette_id(n, mem.is_yellow))
+
+def get_map_pixels(rom: Memory, n: int, color:str=None):
+	"""
+	Draw map `n` as a `uint8` NumPy array of 2-bit color indices of shape `(height, width)`, or of
+	8-bit RGB colors of shape `(height, width, 3)` if `color` is given (see `get_palette`.)
+	"""
+	info = rom.get_map_drawable_info(n)
+	return _map_pixels_colored(rom, n, info, color, is_glitch_map_data(rom, info))
+
+def get_displaced_map_pixels(mem: Memory, map: int, block_addr: int, x: int, y: int, color:str=None):
+	"""Draw the map data at `block_addr` as an array (see `get_map_pixels`.)"""
+	info = mem.get_displaced_map_info(mem.get_map_drawable_info(map), block_addr, x, y)
+	return _map_pixels_colored(mem, map, info, color, True)
+
+def get_glitch_city_pixels(rom: Memory, map: int, warp: int, color:str=None):
+	"""Draw the glitch city obtained by entering `map` from `warp` as an array (see `get_map_pixels`.)"""
+	return _map_pixels_colored(rom, map, rom.get_glitch_city_info(map, warp), color, True)
+
+def _sprite_pixels(rom, ptr, palette_id, color, truesize):
+	import numpy as np
+	sprite = rom.get_decompressed_sprite(*ptr, truesize)
+	pixels = np.empty((sprite.height*8, sprite.width*8), np.uint8)
+	draw_sprite(pixels, sprite)
+	return apply_palette(rom, pixels, color, palette_id)
+
+def get_mon_frontsprite_pixels(rom: Memory, n: int, color:str=None, truesize:bool=False):
+	"""Draw the front sprite of mon `n` as an array (see `get_map_pixels`.)"""
+	palette_id = rom.get_mon_palette_id(n) if color else None
+	return _sprite_pixels(rom, rom.get_mon_frontsprite_ptr_dims(n), palette_id, color, truesize)
+
+def get_mon_backsprite_pixels(rom: Memory, n: int, color:str=None, truesize:bool=False):
+	"""Draw the back sprite of mon `n` as an array (see `get_map_pixels`.)"""
+	palette_id = rom.get_mon_palette_id(n) if color else None
+	return _sprite_pixels(rom, (*rom.get_mon_backsprite_ptr(n), 4, 4), palette_id, color, truesize)
+
+def get_trainer_sprite_pixels(rom: Memory, n: int, color:str=None, truesize:bool=False):
+	"""Draw the sprite of trainer class `n` as an array (see `get_map_pixels`.)"""
+	return _sprite_pixels(rom, (*rom.get_trainer_sprite_ptr(n), 7, 7), 0x10, color, truesize)
 
 
 #== Mon / Trainer sprites ==================================================================================
@@ -382,25 +705,71 @@ def get_compressed_bitmap(rom: Memory, bank: int, addr: int, width: int, height:
                           palette: Palette, truesize:bool=False) -> ImageGenerator:
 	"""Return a bitmap row iterator for a compressed sprite."""
 	bitflip = 0 if palette else 0xFF
-	return *decompress_gfx(rom.stream(bank, addr), width, height, bitflip, truesize), palette
-
-def _bitstream(data):
-	for b in data:
-		yield (b >> 7) & 1
-		yield (b >> 6) & 1
-		yield (b >> 5) & 1
-		yield (b >> 4) & 1
-		yield (b >> 3) & 1
-		yield (b >> 2) & 1
-		yield (b >> 1) & 1
-		yield  b       & 1
-
-def decompress_gfx(data: Sequence[int], twidth: int, theight: int, bitflip: int, truesize:bool=False):
-	data = iter(data)
-	dims = next(data)
+	sprite  = rom.get_decompressed_sprite(bank, addr, width, height, truesize)
+	rows    = _sprite_bitmap(*sprite.planes, 0, sprite.width, sprite.height, bitflip)
+	return sprite.width*8, sprite.height*8, rows, palette
+
+def _build_decompressed_sprite(rom: Memory, bank, addr, width, height, truesize):
+	# The compressed size isn't known up front, so fetch everything readable from `addr` onward.
+	data = rom.read_bytes(bank, addr, 0x10000 - addr, allow_partial=True)
+	try:
+		twidth, theight, lo, hi, size = _decompress_planes(data, width, height, truesize)
+	except IndexError:
+		raise AddressError(addr + len(data))
+	return Info(
+		bank   = bank,
+		addr   = addr,
+		end    = addr + size,
+		width  = twidth,
+		height = theight,
+		planes = (lo, hi)
+	)
+
+def get_decompressed_sprite(rom: Memory, bank: int, addr: int, width: int, height: int,
+                            truesize:bool=False) -> Info:
+	"""
+	Decompress the sprite at `addr`, drawn in a `width` by `height` tile box (see `get_compressed_bitmap`.)
+	Results are cached, so glitch sprites sharing the same compressed data are only decompressed once.
+
+	#### Returns an `Info` with:
+	- bank, addr: The location of the compressed data.
+	- end:        The address after the last byte of compressed data read.
+	- width, height:
+		The size of the decompressed sprite, in tiles.
+	- planes:
+		The low and high bitplanes, stored column-major (each column of tiles is `height*8` bytes.)
+	"""
+	return rom.cached(("decompressed_sprite", bank, addr, width, height, truesize),
+	                  _build_decompressed_sprite, bank, addr, width, height, truesize)
+
+def draw_sprite(out, sprite: Info):
+	"""
+	Draw a sprite from `get_decompressed_sprite` straight into `out`, a `(height*8, width*8)` `uint8`
+	NumPy array (or a view into a larger one, such as a sprite sheet) of 2-bit color indices.
+	"""
+	import numpy as np
+	width, height = sprite.width, sprite.height
+	lo = np.frombuffer(sprite.planes[0], np.uint8).reshape(width, height*8).T
+	hi = np.frombuffer(sprite.planes[1], np.uint8).reshape(width, height*8).T
+	out[...] = planes_to_pixels(lo, hi).reshape(height*8, width*8)
+
+def decompress_gfx(data: bytes, twidth: int, theight: int, bitflip: int, truesize:bool=False):
+	"""
+	Decompress a sprite from the bytes-like buffer `data`, returning its width and height in pixels,
+	a packed 2bpp row iterator, and the number of bytes of `data` the compressed sprite takes up.
+	Raises `IndexError` if the compressed data runs past the end of `data`.
+	"""
+	width, height, lo, hi, size = _decompress_planes(data, twidth, theight, truesize)
+	return width*8, height*8, _sprite_bitmap(lo, hi, 0, width, height, bitflip), size
+
+def _decompress_planes(data, twidth, theight, truesize):
+	# Returns the sprite's width and height in tiles, its two bitplanes, and the number of bytes read.
+	dims = data[0]
 	width, height = (dims >> 4) or 256, (dims & 0xF) or 256
 
-	bits = _bitstream(data)
+	# Bits are read MSB first through an accumulator: the low `cnt` bits of `acc` are the next bits
+	# to read, and `i` is the next byte of `data` to load into it.
+	i, acc, cnt = 1, 0, 0
 
 	bufsize = max(width*height, twidth*theight) * 8
 	if truesize:
@@ -410,83 +779,130 @@ def decompress_gfx(data: Sequence[int], twidth: int, theight: int, bitflip: int,
 		buf = buf1 = buf2 = bytearray(392*2 + max(392, bufsize))
 		off1, off2        = 392, 392*2
 
-	if next(bits) == 1:
+	i, acc, cnt, bit = _next_bit(data, i, acc, cnt)
+	if bit == 1:
 		sbuf1, soff1 = buf2, off2
 		sbuf2, soff2 = buf1, off1
 	else:
 		sbuf1, soff1 = buf1, off1
 		sbuf2, soff2 = buf2, off2
 	
-	_decompress_bitplane(bits, sbuf1, soff1, width, height)
+	i, acc, cnt = _decompress_bitplane(data, i, acc, cnt, sbuf1, soff1, width, height)
 
-	mode = next(bits)
-	if mode == 1: mode += next(bits)
+	i, acc, cnt, mode = _next_bit(data, i, acc, cnt)
+	if mode == 1:
+		i, acc, cnt, bit = _next_bit(data, i, acc, cnt)
+		mode += bit
 
-	_decompress_bitplane(bits, sbuf2, soff2, width, height)
+	i, acc, cnt = _decompress_bitplane(data, i, acc, cnt, sbuf2, soff2, width, height)
 
 	if mode != 1:
 		_delta_decode_bitplane(sbuf2, soff2, width, height)
 	_delta_decode_bitplane(sbuf1, soff1, width, height)
 
 	if mode != 0: # xor buffer 2 with buffer 1
-		for i in range(bufsize):
-			sbuf2[soff2+i] ^= sbuf1[soff1+i]
+		_xor_bitplane(sbuf2, soff2, sbuf1, soff1, bufsize)
 
 	if not truesize:
 		# buffer A hasn't been used yet so we don't need to clear it
 		_center_bitplane(buf, 392,   0,   twidth, theight)
-		buf[392:392*2] = (0 for _ in range(392)) # clear buffer B
+		buf[392:392*2] = bytes(392) # clear buffer B
 		_center_bitplane(buf, 392*2, 392, twidth, theight)		
 
-		return 56, 56, _sprite_bitmap(buf, buf, 392, 7, 7, bitflip)
+		return 7, 7, bytes(buf[:392]), bytes(buf[392:392*2]), i
 
 	else:
-		return width*8, height*8, _sprite_bitmap(buf1, buf2, 0, width, height)
-
-def _parse_rle_packet(bits):
-	n = 1
-	while next(bits) != 0:
-		n += 1
-	l = 1 << n; v = 0
-	while n > 0:
-		n -= 1; v = (v << 1) | next(bits)
-	return l + v - 1
-	
-def _decompress_bitplane(bits, buf, off, width, height):
+		size = width*height*8
+		return width, height, bytes(buf1[:size]), bytes(buf2[:size]), i
+
+def _next_bit(data, i, acc, cnt):
+	if cnt == 0:
+		acc, cnt = data[i], 8
+		i += 1
+	cnt -= 1
+	return i, acc, cnt, (acc >> cnt) & 1
+
+def _decompress_bitplane(data, i, acc, cnt, buf, off, width, height):
 	width *= 4; height *= 8
 	px, by = 0, 0
 	tx, sx = off, 6
 
-	if next(bits) == 0:
-		by += _parse_rle_packet(bits)
+	i, acc, cnt, bit = _next_bit(data, i, acc, cnt)
+	rle = bit == 0
 
 	while True:
+		if rle:
+			# RLE packet: count the 1 bits up to the next 0 bit a byte at a time,
+			# then read that many bits plus one.
+			acc &= (1 << cnt) - 1
+			n = 1
+			while True:
+				if cnt == 0:
+					acc, cnt = data[i], 8
+					i += 1
+				zeros = acc ^ ((1 << cnt) - 1)
+				if zeros:
+					ones = cnt - zeros.bit_length()
+					n   += ones
+					cnt -= ones + 1
+					break
+				n  += cnt
+				cnt = 0
+			acc &= (1 << cnt) - 1
+			while cnt < n:
+				acc  = (acc << 8) | data[i]
+				i   += 1
+				cnt += 8
+			cnt -= n
+			by  += (1 << n) + ((acc >> cnt) & ((1 << n) - 1)) - 1
+		rle = True
+
 		# data packet
 		while True:
 			if by >= height:
 				px, by = px + (by // height), by % height
-				if px >= width: return
+				if px >= width: return i, acc, cnt
 				tx = (px >> 2)*height + off
 				sx = (~px & 3) * 2
-			p = (next(bits) << 1) | next(bits)
+			if cnt < 2: # only the low bit is still unread
+				acc  = ((acc & 1) << 8) | data[i]
+				i   += 1
+				cnt += 8
+			cnt -= 2
+			p = (acc >> cnt) & 3
 			if p == 0: break
 			buf[tx + by] |= p << sx
 			by += 1
 
-		by += _parse_rle_packet(bits)
+_delta_lut = None
 
 def _delta_decode_bitplane(buf, off, width, height):
+	# Each byte becomes the running xor of its bits (MSB first), continuing from the last bit of the
+	# byte to its left. Columns are `height*8` bytes apart, so every row is decoded at once per column.
+	global _delta_lut
+	import numpy as np
+	if _delta_lut is None:
+		b = np.arange(256, dtype=np.uint8)
+		_delta_lut = b^(b>>1)^(b>>2)^(b>>3)^(b>>4)^(b>>5)^(b>>6)^(b>>7)
 	height *= 8
-	y, xend = 0, off + width*height
-	while y < height:
-		x, c = off + y, 0
-		while x < xend:
-			b = buf[x]
-			b = b^(b>>1)^(b>>2)^(b>>3)^(b>>4)^(b>>5)^(b>>6)^(b>>7) ^ c
-			c = ((~(b & 1) + 1) & 0xFF) 
-			buf[x] = b
-			x += height
-		y += 1
+	cols = np.frombuffer(buf, np.uint8, width*height, off).reshape(width, height)
+	out  = np.empty_like(cols)
+	c    = np.zeros(height, np.uint8)
+	for x in range(width):
+		out[x] = _delta_lut[cols[x]] ^ c
+		c = (out[x] & 1) * np.uint8(0xFF)
+	buf[off:off + width*height] = out.tobytes()
+
+def _xor_bitplane(dst, dstoff, src, srcoff, size):
+	# Equivalent to `dst[dstoff+i] ^= src[srcoff+i]` for each i in order. When the source overlaps
+	# the destination from behind, later bytes read already-xored ones, so go in chunks of the overlap.
+	step = size
+	if dst is src and srcoff < dstoff < srcoff + size:
+		step = dstoff - srcoff
+	for i in range(0, size, step):
+		n = min(step, size - i)
+		x = int.from_bytes(dst[dstoff+i:dstoff+i+n], "big") ^ int.from_bytes(src[srcoff+i:srcoff+i+n], "big")
+		dst[dstoff+i:dstoff+i+n] = x.to_bytes(n, "big")
 
 def _center_bitplane(buf, srcoff, dstoff, width, height):
 	dstoff += ((7*((8 - width) >> 1) + (7 - height)) * 8) & 0xFF
@@ -508,19 +924,9 @@ def _sprite_bitplane_bitmap(buf, off, twidth, theight):
 		yield rowbuf
 
 def _sprite_bitmap(buf1, buf2, off2, twidth, theight, bitflip):
-	bwidth, bheight = twidth*2, theight*8
-	rowbuf = bytearray(bwidth)
-	y = 0
-	while y < bheight:
-		bx, px = y, 0
-		while px < bwidth:
-			b1, b2 = buf1[bx] ^ bitflip, buf2[off2+bx] ^ bitflip
-			# interleave the bitplanes (aaaaaaaa bbbbbbbb -> abababab abababab)
-			b1=(b1|b1<<4) & 0x0F0F; b1=(b1|b1<<2) & 0x3333; b1=(b1|b1<<1) & 0x5555
-			b2=(b2|b2<<4) & 0x0F0F; b2=(b2|b2<<2) & 0x3333; b2=(b2|b2<<1) & 0x5555
-			bits = b1 | (b2 << 1)
-			rowbuf[px], rowbuf[px+1] = bits >> 8, bits & 0xFF
-			px += 2
-			bx += bheight
-		y += 1
-		yield rowbuf
\ No newline at end of file
+	import numpy as np
+	# Sprite buffers are column-major: each column of tiles is `theight*8` bytes, top to bottom.
+	size = twidth * theight * 8
+	lo = np.frombuffer(buf1, np.uint8, size).reshape(twidth, -1).T
+	hi = np.frombuffer(buf2, np.uint8, size, off2).reshape(twidth, -1).T
+	return _packed_rows(encode_2bpp_rows(planes_to_pixels(lo, hi).reshape(theight*8, twidth*8), bitflip))
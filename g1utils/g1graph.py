@@ -0,0 +1,209 @@
+# g1graph.py
+from __future__ import annotations
+
+from array       import array
+from collections import deque
+
+from .g1base import *
+
+
+# Warps to map FF from maps that aren't "outside" maps return to the last outside map the player warped from.
+LAST_MAP = 0xFF
+
+# Warping from a map using either of these tilesets counts as warping from an outside map.
+_outside_tilesets = (0x00, 0x17) # overworld, indigo_plateau
+
+_directions = ("north", "south", "west", "east")
+
+def _table(typecode, n):
+	return array(typecode, bytes(array(typecode).itemsize * n))
+
+
+class MapGraph:
+	"""
+	The warps, connections, signs, and actors of every map ID, parsed in a single pass over each map.
+
+	Objects are stored as packed byte rows, in map ID order:
+	  - `warps`:       `(map, x, y, dest_warp, dest_map)`
+	  - `connections`: `(map, direction, dest_map)`
+	  - `signs`:       `(map, x, y, script_id)`
+	  - `actors`:      `(map, x, y, sprite, movement, facing, script_id, extra1, extra2)`
+
+	The rows for map `n` are the rows `start[n]` through `start[n+1]` of each list, where `start` is
+	the matching `*_start` table (e.g. `warp_start`).
+	"""
+	WARP_SIZE       = 5
+	CONNECTION_SIZE = 3
+	SIGN_SIZE       = 4
+	ACTOR_SIZE      = 9
+
+	def __init__(self, rom: Memory, maps=range(256)):
+		self.maps = bytes(maps)
+
+		self.bank           = bytearray(256)
+		self.header_addr    = _table("H", 256)
+		self.tileset        = bytearray(256)
+		self.width          = bytearray(256)
+		self.height         = bytearray(256)
+		self.block_addr     = _table("H", 256)
+		self.objects_addr   = _table("H", 256)
+		self.warpdests_addr = _table("H", 256)
+		self.border         = bytearray(256)
+		self.complete       = bytearray(256) # nonzero if every part of the map was readable
+
+		self.warps       = bytearray()
+		self.connections = bytearray()
+		self.signs       = bytearray()
+		self.actors      = bytearray()
+
+		self.warp_start       = _table("I", 257)
+		self.connection_start = _table("I", 257)
+		self.sign_start       = _table("I", 257)
+		self.actor_start      = _table("I", 257)
+
+		for n in range(256):
+			self.warp_start[n]       = len(self.warps)       // self.WARP_SIZE
+			self.connection_start[n] = len(self.connections) // self.CONNECTION_SIZE
+			self.sign_start[n]       = len(self.signs)       // self.SIGN_SIZE
+			self.actor_start[n]      = len(self.actors)      // self.ACTOR_SIZE
+			if n in self.maps:
+				try:
+					self._read_map(rom, n)
+					self.complete[n] = 1
+				except AddressError:
+					pass
+		self.warp_start[256]       = len(self.warps)       // self.WARP_SIZE
+		self.connection_start[256] = len(self.connections) // self.CONNECTION_SIZE
+		self.sign_start[256]       = len(self.signs)       // self.SIGN_SIZE
+		self.actor_start[256]      = len(self.actors)      // self.ACTOR_SIZE
+
+	def _read_map(self, rom, n):
+		bank, addr = rom.get_map_header_ptr(n)
+		self.bank[n], self.header_addr[n] = bank, addr
+
+		s = rom.stream(bank, addr)
+		data = s.next_bytes(10)
+		self.tileset[n]    = data[0]
+		self.height[n]     = data[1]
+		self.width[n]      = data[2]
+		self.block_addr[n] = unpack16(data, 3)
+
+		cflags = data[9]
+		for i in range(4):
+			if cflags & (8 >> i):
+				self.connections.extend((n, i, s.next_bytes(11)[0]))
+
+		addr = s.next16()
+		self.objects_addr[n] = addr
+		s.seek(bank, addr)
+
+		self.border[n] = s.next8()
+		for _ in range(s.next8()):
+			y, x, warpdest, map = s.next_bytes(4)
+			self.warps.extend((n, x, y, warpdest, map))
+
+		for _ in range(s.next8()):
+			y, x, script = s.next_bytes(3)
+			self.signs.extend((n, x, y, script))
+
+		for _ in range(s.next8()):
+			sprite, y, x, movement, facing, script = s.next_bytes(6)
+			# Encounter flag is checked before item flag
+			if   script & 0x40 != 0: extra = s.next_bytes(2)
+			elif script & 0x80 != 0: extra = (s.next8(), 0)
+			else:                    extra = (0, 0)
+			self.actors.extend((n, (x - 4) & 0xFF, (y - 4) & 0xFF, sprite, movement, facing, script, *extra))
+
+		self.warpdests_addr[n] = s.addr
+
+
+	def _rows(self, data, size, start, n):
+		i, end = start[n] * size, start[n+1] * size
+		return [tuple(data[j+1:j+size]) for j in range(i, end, size)]
+
+	def get_warps(self, n: int) -> list[tuple[int,int,int,int]]:
+		"""Return the `(x, y, dest_warp, dest_map)` of each of map `n`'s warps."""
+		return self._rows(self.warps, self.WARP_SIZE, self.warp_start, n)
+
+	def get_connections(self, n: int) -> dict[str, int]:
+		"""Return the map connected to each side of map `n`."""
+		return {_directions[d]: map for d, map in self._rows(self.connections, self.CONNECTION_SIZE, self.connection_start, n)}
+
+	def get_signs(self, n: int) -> list[tuple[int,int,int]]:
+		"""Return the `(x, y, script_id)` of each of map `n`'s signs."""
+		return self._rows(self.signs, self.SIGN_SIZE, self.sign_start, n)
+
+	def get_actors(self, n: int) -> list[tuple[int,int,int,int,int,int,int,int]]:
+		"""Return the `(x, y, sprite, movement, facing, script_id, extra1, extra2)` of each of map `n`'s actors."""
+		return self._rows(self.actors, self.ACTOR_SIZE, self.actor_start, n)
+
+	def get_warpdests_ptr(self, n: int) -> ptr:
+		"""Return a pointer to map `n`'s warp destination list, or `None` if it couldn't be found."""
+		if self.complete[n]:
+			return self.bank[n], self.warpdests_addr[n]
+
+	def is_outside(self, n: int) -> bool:
+		"""True if map `n` is an "outside" map (warping from it sets the last map.)"""
+		return self.tileset[n] in _outside_tilesets
+
+
+	def _edges(self, n, last):
+		warps, size = self.warps, self.WARP_SIZE
+		outside     = self.is_outside(n)
+		nextlast    = n if outside else last
+		for i in range(self.warp_start[n], self.warp_start[n+1]):
+			dest = warps[i*size + 4]
+			if dest == LAST_MAP and not outside:
+				if last is None: continue # can't tell where this warp goes
+				dest = last
+			yield dest, nextlast, ("warp", i - self.warp_start[n])
+
+		connections, size = self.connections, self.CONNECTION_SIZE
+		for i in range(self.connection_start[n], self.connection_start[n+1]):
+			yield connections[i*size + 2], last, ("connection", _directions[connections[i*size + 1]])
+
+	def _search(self, start, last_map, goal=None):
+		state = (start, last_map)
+		prev  = {state: None}
+		queue = deque((state,))
+		while queue:
+			state = queue.popleft()
+			if state[0] == goal: break
+			for dest, last, via in self._edges(*state):
+				nextstate = (dest, last)
+				if nextstate not in prev:
+					prev[nextstate] = (state, via)
+					queue.append(nextstate)
+		else:
+			state = None
+		return prev, state
+
+	def get_shortest_path(self, start: int, goal: int, last_map:int=None) -> list[tuple[int, tuple]]:
+		"""
+		Return the shortest route from map `start` to map `goal` as a list of `(map, via)` steps,
+		where `map` is the map the step leaves from and `via` is either `("warp", index)`
+		or `("connection", direction)`.
+		Returns `None` if `goal` can't be reached.
+
+		Warps that return to the last outside map are followed using `last_map` as the last map the
+		player warped from, and are ignored until the path passes through an outside map if it's `None`.
+		"""
+		if start == goal: return []
+		prev, state = self._search(start, last_map, goal)
+		if state is None: return None
+		path = []
+		while prev[state] is not None:
+			state, via = prev[state]
+			path.append((state[0], via))
+		path.reverse()
+		return path
+
+	def get_reachable_maps(self, start: int, last_map:int=None) -> bytearray:
+		"""Return a list of all map IDs reachable from map `start` (including itself.)"""
+		prev, _ = self._search(start, last_map)
+		return bytearray(sorted({map for map, _ in prev}))
+
+
+def get_map_graph(rom: Memory) -> MapGraph:
+	"""Return the `MapGraph` of every map ID (including dummy and glitch maps.)"""
+	return rom.cached("map_graph", MapGraph)
@@ -15,6 +15,7 @@ _rom_locations_JRv0 = {
 	"dungeon_warpdests": ( 0x01, 0x636A ),
 	"dungeon_warps":     ( 0x01, 0x6351 ),
 	"exp_formulas":      ( 0x16, 0x5068 ),
+	"fly_warps":         ( 0x01, 0x63B2 ),
 	"font":              ( 0x04, 0x4B19 ),
 	"font2":             ( 0x04, 0x52F1 ),
 	"gfx_mon182":        ( 0x0D, 0x64C7 ),
@@ -81,6 +82,7 @@ _rom_locations_JGv0 = {
 	"dungeon_warpdests": ( 0x01, 0x636B ),
 	"dungeon_warps":     ( 0x01, 0x6352 ),
 	"exp_formulas":      ( 0x16, 0x5068 ),
+	"fly_warps":         ( 0x01, 0x63B3 ),
 	"font":              ( 0x04, 0x4B19 ),
 	"font2":             ( 0x04, 0x52F1 ),
 	"gfx_mon182":        ( 0x0D, 0x64C7 ),
@@ -147,6 +149,7 @@ _rom_locations_JRv1 = {
 	"dungeon_warpdests": ( 0x01, 0x630F ),
 	"dungeon_warps":     ( 0x01, 0x62F6 ),
 	"exp_formulas":      ( 0x16, 0x5068 ),
+	"fly_warps":         ( 0x01, 0x6357 ),
 	"font":              ( 0x04, 0x4B19 ),
 	"font2":             ( 0x04, 0x52F1 ),
 	"gfx_mon182":        ( 0x0D, 0x64C7 ),
@@ -213,6 +216,7 @@ _rom_locations_JGv1 = {
 	"dungeon_warpdests": ( 0x01, 0x6310 ),
 	"dungeon_warps":     ( 0x01, 0x62F7 ),
 	"exp_formulas":      ( 0x16, 0x5068 ),
+	"fly_warps":         ( 0x01, 0x6358 ),
 	"font":              ( 0x04, 0x4B19 ),
 	"font2":             ( 0x04, 0x52F1 ),
 	"gfx_mon182":        ( 0x0D, 0x64C7 ),
@@ -279,6 +283,7 @@ _rom_locations_JB = {
 	"dungeon_warpdests": ( 0x01, 0x647D ),
 	"dungeon_warps":     ( 0x01, 0x6464 ),
 	"exp_formulas":      ( 0x16, 0x50B8 ),
+	"fly_warps":         ( 0x01, 0x64C5 ),
 	"font":              ( 0x04, 0x5E99 ),
 	"font2":             ( 0x04, 0x6681 ),
 	"gfx_mon182":        ( 0x0B, 0x79E8 ),
@@ -345,6 +350,7 @@ _rom_locations_ERB = {
 	"dungeon_warpdests": ( 0x01, 0x63D8 ),
 	"dungeon_warps":     ( 0x01, 0x63BF ),
 	"exp_formulas":      ( 0x16, 0x501D ),
+	"fly_warps":         ( 0x01, 0x6420 ),
 	"font":              ( 0x04, 0x5A80 ),
 	"font2":             ( 0x04, 0x6288 ),
 	"gfx_mon182":        ( 0x0B, 0x79E8 ),
@@ -411,6 +417,7 @@ _rom_locations_FRB = {
 	"dungeon_warpdests": ( 0x01, 0x6473 ),
 	"dungeon_warps":     ( 0x01, 0x645A ),
 	"exp_formulas":      ( 0x16, 0x501D ),
+	"fly_warps":         ( 0x01, 0x64BB ),
 	"font":              ( 0x04, 0x5A80 ),
 	"font2":             ( 0x04, 0x6298 ),
 	"gfx_mon182":        ( 0x0B, 0x79E8 ),
@@ -477,6 +484,7 @@ _rom_locations_IR = {
 	"dungeon_warpdests": ( 0x01, 0x6437 ),
 	"dungeon_warps":     ( 0x01, 0x641E ),
 	"exp_formulas":      ( 0x16, 0x501D ),
+	"fly_warps":         ( 0x01, 0x647F ),
 	"font":              ( 0x04, 0x5A80 ),
 	"font2":             ( 0x04, 0x6298 ),
 	"gfx_mon182":        ( 0x0B, 0x79E8 ),
@@ -543,6 +551,7 @@ _rom_locations_IB = {
 	"dungeon_warpdests": ( 0x01, 0x6436 ),
 	"dungeon_warps":     ( 0x01, 0x641D ),
 	"exp_formulas":      ( 0x16, 0x501D ),
+	"fly_warps":         ( 0x01, 0x647E ),
 	"font":              ( 0x04, 0x5A80 ),
 	"font2":             ( 0x04, 0x6298 ),
 	"gfx_mon182":        ( 0x0B, 0x79E8 ),
@@ -609,6 +618,7 @@ _rom_locations_GRB = {
 	"dungeon_warpdests": ( 0x01, 0x63FF ),
 	"dungeon_warps":     ( 0x01, 0x63E6 ),
 	"exp_formulas":      ( 0x16, 0x501D ),
+	"fly_warps":         ( 0x01, 0x6447 ),
 	"font":              ( 0x04, 0x5A80 ),
 	"font2":             ( 0x04, 0x6298 ),
 	"gfx_mon182":        ( 0x0B, 0x79E8 ),
@@ -675,6 +685,7 @@ _rom_locations_SRB = {
 	"dungeon_warpdests": ( 0x01, 0x6437 ),
 	"dungeon_warps":     ( 0x01, 0x641E ),
 	"exp_formulas":      ( 0x16, 0x501D ),
+	"fly_warps":         ( 0x01, 0x647F ),
 	"font":              ( 0x04, 0x5A80 ),
 	"font2":             ( 0x04, 0x6298 ),
 	"gfx_mon182":        ( 0x0B, 0x79E8 ),
@@ -740,6 +751,7 @@ _rom_locations_JYv0 = {
 	"dungeon_warpdests": ( 0x01, 0x61F0 ),
 	"dungeon_warps":     ( 0x01, 0x61D7 ),
 	"exp_formulas":      ( 0x16, 0x4E73 ),
+	"fly_warps":         ( 0x01, 0x6238 ),
 	"font":              ( 0x04, 0x4A19 ),
 	"font2":             ( 0x04, 0x5221 ),
 	"gfx_mon182":        ( 0x0B, 0x7B92 ),
@@ -808,6 +820,7 @@ _rom_locations_JYv123 = {
 	"dungeon_warpdests": ( 0x01, 0x61F0 ),
 	"dungeon_warps":     ( 0x01, 0x61D7 ),
 	"exp_formulas":      ( 0x16, 0x4E73 ),
+	"fly_warps":         ( 0x01, 0x6238 ),
 	"font":              ( 0x04, 0x4A19 ),
 	"font2":             ( 0x04, 0x5221 ),
 	"gfx_mon182":        ( 0x0B, 0x7B92 ),
@@ -876,6 +889,7 @@ _rom_locations_EY = {
 	"dungeon_warpdests": ( 0x01, 0x614C ),
 	"dungeon_warps":     ( 0x01, 0x6133 ),
 	"exp_formulas":      ( 0x16, 0x4E73 ),
+	"fly_warps":         ( 0x01, 0x6194 ),
 	"font":              ( 0x04, 0x4600 ),
 	"font2":             ( 0x04, 0x4E18 ),
 	"gbc_palettes":      ( 0x1C, 0x6AF9 ),
@@ -945,6 +959,7 @@ _rom_locations_FY = {
 	"dungeon_warpdests": ( 0x01, 0x61D5 ),
 	"dungeon_warps":     ( 0x01, 0x61BC ),
 	"exp_formulas":      ( 0x16, 0x4E73 ),
+	"fly_warps":         ( 0x01, 0x621D ),
 	"font":              ( 0x04, 0x4600 ),
 	"font2":             ( 0x04, 0x4E28 ),
 	"gbc_palettes":      ( 0x1C, 0x6ACA ),
@@ -1014,6 +1029,7 @@ _rom_locations_IY = {
 	"dungeon_warpdests": ( 0x01, 0x619B ),
 	"dungeon_warps":     ( 0x01, 0x6182 ),
 	"exp_formulas":      ( 0x16, 0x4E73 ),
+	"fly_warps":         ( 0x01, 0x61E3 ),
 	"font":              ( 0x04, 0x4600 ),
 	"font2":             ( 0x04, 0x4E28 ),
 	"gbc_palettes":      ( 0x1C, 0x6B39 ),
@@ -1083,6 +1099,7 @@ _rom_locations_GY = {
 	"dungeon_warpdests": ( 0x01, 0x6161 ),
 	"dungeon_warps":     ( 0x01, 0x6148 ),
 	"exp_formulas":      ( 0x16, 0x4E73 ),
+	"fly_warps":         ( 0x01, 0x61A9 ),
 	"font":              ( 0x04, 0x4600 ),
 	"font2":             ( 0x04, 0x4E28 ),
 	"gbc_palettes":      ( 0x1C, 0x6AD8 ),
@@ -1152,6 +1169,7 @@ _rom_locations_SY = {
 	"dungeon_warpdests": ( 0x01, 0x6193 ),
 	"dungeon_warps":     ( 0x01, 0x617A ),
 	"exp_formulas":      ( 0x16, 0x4E73 ),
+	"fly_warps":         ( 0x01, 0x61DB ),
 	"font":              ( 0x04, 0x4600 ),
 	"font2":             ( 0x04, 0x4E28 ),
 	"gbc_palettes":      ( 0x1C, 0x6AE9 ),
@@ -1,6 +1,10 @@
 # g1rom.py
 from __future__ import annotations
 
+from array    import array
+from bisect   import bisect_left, bisect_right
+from hashlib  import blake2b
+
 from .g1base import *
 from .g1text import *
 
@@ -104,12 +108,19 @@ def get_mon_base_stats(rom: Memory, n: int, moves:bool=True):
 	"""Return the base stats of mon `n`."""
 	return rom.get_dex_mon_base_stats(rom.get_mon_dex_num(n), moves)
 
+# The move IDs of the TMs/HMs set in each possible value of each byte of a mon's TM/HM flags.
+_machine_flag_moves = tuple(
+	tuple(
+		bytes(g1const.machine_move(i) for i in range(byte*8, min(byte*8 + 8, 55)) if (b >> (i & 7)) & 1)
+		for b in range(256)
+	)
+	for byte in range(7)
+)
 def expand_machine_flags(flags: bytes) -> bytearray:
 	"""Convert a mon's TM/HM flags from a bitfield to a list of move IDs."""
 	moves = bytearray()
-	for i in range(55):
-		if (flags[i >> 3] >> (i & 7)) & 1 != 0:
-			moves.append(g1const.machine_move(i))
+	for i in range(7):
+		moves.extend(_machine_flag_moves[i][flags[i]])
 	return moves
 
 def get_mon_cry(rom: Memory, n: int) -> tuple[int, int, int]:
@@ -217,50 +228,95 @@ def get_mon_evolutions(rom: Memory, n: int, info=None) -> Info:
 def get_mon_dex_entry_ptr(rom: Memory, n: int) -> ptr:
 	return rom.table_read_addr("dex_entries", (n - 1) & 0xFF, default=None)
 
-def get_mon_dex_entry(rom: Memory, n: int, info=None, **opt) -> Info:
-	"""
-	Get a mon's dex entry.
-	"""
-	opt.setdefault("vchar", "dex")
-
-	bank, addr = rom.get_mon_dex_entry_ptr(n)
-	metric     = rom.lang != 'E'
-
-	if info is None: info = Info()
-	info.dex_addr  = addr
-	info.is_metric = metric
+def _dex_entry_prev_sfx(rom: Memory, n: int, opt: dict):
+	# If the battle soundbank is used, we can safely assume the last sounds played are:
+	# ball_shake, dex_registered, ui_press, and the mon's cry (or Rhydon's cry, if the mon
+	# has a glitch dex number.)
+	if rom.is_japan or "prev_sfx" in opt or opt.get("sound_bank", 8) != 8: return None
+	dexno = rom.get_mon_dex_num(n)
+	if not(0 < n <= 190) or dexno == 0:
+		cry = rom.get_mon_cry_sound(n if (0 < dexno <= 151) else 1)
+		return (0x93, 0x98, 0x90, cry[0])
 
-	s = rom.stream(bank, addr)
+def _read_dex_entry_body(rom: Memory, bank: int, s: Memory.Stream, opt: dict) -> dict:
+	body = {}
 	try:
-		info.category = s.next_string(**opt)
-		
-		if metric:
+		if rom.lang != 'E':
 			# u8 decimeters, u16 hectograms
-			info.height, info.weight = s.next8(), s.next16()
+			body["height"], body["weight"] = s.next8(), s.next16()
 		else:
 			# u8 feet, u8 inches, u16 tenths of pounds
-			info.height, info.weight = tuple(s.next_bytes(2)), s.next16()
+			body["height"], body["weight"] = tuple(s.next_bytes(2)), s.next16()
 
 		# In Japanese versions dex descriptions are just strings, but in localized versions they're changed
 		# to be text scripts instead. This was probably just done to enable quick-and-dirty repointing of
 		# descriptions to other banks with the far command, like with most of the localized text.
-		info.desc_addr = s.addr
+		body["desc_addr"] = s.addr
 		if rom.is_japan:
-			info.description = s.next_string(**opt)
+			body["description"] = s.next_string(**opt)
 		else:
-			if opt.setdefault("sound_bank", 8) == 8:
-				# If the battle soundbank is used, we can safely assume the last sounds played are:
-				# ball_shake, dex_registered, ui_press, and the mon's cry (or Rhydon's cry, if the mon
-				# has a glitch dex number.)
-				dexno = rom.get_mon_dex_num(n)
-				if "prev_sfx" not in opt and (not(0 < n <= 190) or dexno == 0):
-					cry = rom.get_mon_cry_sound(n if (0 < dexno <= 151) else 1)
-					opt["prev_sfx"] = (0x93, 0x98, 0x90, cry[0])
-			info.description = rom.read_text_script(bank, s.addr, **opt)
+			opt.setdefault("sound_bank", 8)
+			body["description"] = rom.read_text_script(bank, s.addr, **opt)
 	
 	except AddressError: pass
+	return body
+
+def _read_dex_entry(rom: Memory, bank: int, addr: int, info: Info, opt: dict, bodies:dict=None) -> Info:
+	info.dex_addr  = addr
+	info.is_metric = rom.lang != 'E'
+
+	s = rom.stream(bank, addr)
+	try:
+		info.category = s.next_string(**opt)
+	except AddressError:
+		return info
+
+	# Categories cut short by a control character all continue from the same _printed_string_end script,
+	# so entries with different categories can still share the rest of their data.
+	key  = (bank, s.addr, opt.get("prev_sfx"))
+	body = bodies.get(key) if bodies is not None else None
+	if body is None:
+		body = _read_dex_entry_body(rom, bank, s, opt)
+		if bodies is not None: bodies[key] = body
+	info.update(**body)
 	return info
 
+def get_mon_dex_entry(rom: Memory, n: int, info=None, **opt) -> Info:
+	"""
+	Get a mon's dex entry.
+	"""
+	opt.setdefault("vchar", "dex")
+	bank, addr = rom.get_mon_dex_entry_ptr(n)
+	prev_sfx   = _dex_entry_prev_sfx(rom, n, opt)
+	if prev_sfx is not None: opt["prev_sfx"] = prev_sfx
+
+	if info is None: info = Info()
+	return _read_dex_entry(rom, bank, addr, info, opt)
+
+def get_all_dex_entries(rom: Memory, ids=range(256), **opt) -> dict[int, Info]:
+	"""
+	Get the dex entries of all mons in `ids`.
+	Mons whose entries would decode identically (same pointer, and same previous sound effects
+	for localized descriptions) share a single `Info`, whose `mons` lists every mon sharing it.
+	Entries whose categories end at the same place only have the rest of their data decoded once.
+	Mons without a dex entry pointer are left out.
+	"""
+	opt.setdefault("vchar", "dex")
+	entries, shared, bodies = {}, {}, {}
+	for n in ids:
+		ptr = rom.get_mon_dex_entry_ptr(n)
+		if ptr[1] is None: continue
+		prev_sfx = _dex_entry_prev_sfx(rom, n, opt)
+		key  = (*ptr, prev_sfx)
+		info = shared.get(key)
+		if info is None:
+			entry_opt = dict(opt)
+			if prev_sfx is not None: entry_opt["prev_sfx"] = prev_sfx
+			info = shared[key] = _read_dex_entry(rom, *ptr, Info(mons=bytearray()), entry_opt, bodies)
+		info.mons.append(n)
+		entries[n] = info
+	return entries
+
 
 #== Moves ==================================================================================================
 
@@ -281,6 +337,34 @@ def get_move_info(rom: Memory, n: int) -> Info:
 def get_move_effect_ptr(rom: Memory, n: int) -> ptr:
 	return rom.table_read_addr("move_effects", (n - 1) & 0xFF)
 
+def _read_table_columns(rom: Memory, location: str, itemsize: int, count:int=256):
+	# Read a whole table in one go, as a (count, itemsize) array. Unreadable entries are left as zeros.
+	import numpy as np
+	data  = rom.read_bytes(*rom.location_ptr(location), count*itemsize, allow_partial=True)
+	table = np.zeros(count*itemsize, np.uint8)
+	table[:len(data)] = np.frombuffer(data, np.uint8)
+	return table.reshape(count, itemsize)
+
+def _readonly_columns(**columns) -> Info:
+	for column in columns.values():
+		column.flags.writeable = False
+	return Info(**columns)
+
+def _build_move_table(rom: Memory):
+	import numpy as np
+	data = np.roll(_read_table_columns(rom, "moves", 6), 1, axis=0) # move n is entry (n - 1) & 0xFF
+	return _readonly_columns(**{
+		key: np.ascontiguousarray(data[:, i])
+		for i, key in enumerate(("animation", "effect", "power", "type", "accuracy", "pp"))
+	})
+
+def get_move_table(rom: Memory) -> Info:
+	"""
+	Return the info of all 256 move IDs as read-only `uint8` NumPy columns indexed by move ID:
+	`animation`, `effect`, `power`, `type`, `accuracy`, and `pp`.
+	"""
+	return rom.cached("move_table", _build_move_table)
+
 
 #== Types ==================================================================================================
 
@@ -289,6 +373,21 @@ def get_type_name_ptr(rom: Memory, n: int) -> ptr:
 def get_type_name(rom: Memory, n: int, **opt) -> str:
 	return rom.read_string(*rom.get_type_name_ptr(n), **opt)
 
+def _build_type_name_table(rom: Memory):
+	import numpy as np
+	bank, _ = rom.location_ptr("type_names")
+	addrs   = _read_table_columns(rom, "type_names", 2, 128).view("<u2")[:, 0]
+	table   = _readonly_columns(addr=np.tile(addrs, 2)) # type n is entry n & 0x7F
+	table.bank = bank
+	return table
+
+def get_type_name_table(rom: Memory) -> Info:
+	"""
+	Return the type name pointers of all 256 type IDs, as a read-only `uint16` NumPy column `addr`
+	indexed by type ID, along with the `bank` they're in.
+	"""
+	return rom.cached("type_name_table", _build_type_name_table)
+
 
 #== Exp groups =============================================================================================
 
@@ -337,6 +436,46 @@ def get_exp_group_formula(rom: Memory, n: int) -> str:
 	"""
 	return exp_group_formula_repr(rom.get_exp_group_coefficients(n))
 
+def _build_exp_table(rom: Memory):
+	import numpy as np
+	data = np.frombuffer(rom.read_bytes(*rom.location("exp_formulas"), 64*4), np.uint8).astype(np.int64)
+	ab, c, d, e = (data[i::4, None] for i in range(4))
+	a, b = ab >> 4, ab & 0xF
+	n    = np.arange(256, dtype=np.int64)
+
+	# The game computes each term with 24-bit results, so they all wrap around at 2^24.
+	cube = ((n**3 & 0xFFFFFF) * a // np.maximum(b, 1)) & 0xFFFFFF
+	sq   = (c & 0x7F) * n**2 & 0xFFFFFF
+	sq   = np.where(c & 0x80 != 0, -sq, sq)
+	lin  = d*n - e
+
+	table = (cube + sq + lin) & 0xFFFFFF
+	table[(b == 0)[:,0]] = -1
+	table.flags.writeable = False
+	return table
+
+def get_exp_table(rom: Memory):
+	"""
+	Return a read-only int64 NumPy array of shape `(64, 256)`, where `[n, level]` is the total
+	experience needed for `level` in experience group `n`, as computed by the game (24-bit, wrapping
+	around on overflow and underflow.)
+	Column 0 is level 0, which the game never computes. Groups that divide by zero are all `-1`.
+	"""
+	return rom.cached("exp_table", _build_exp_table)
+
+def find_exp_table_drops(rom: Memory) -> dict[int, bytearray]:
+	"""
+	Return a dict mapping each experience group whose curve isn't monotonic to the levels (2-255)
+	that need less experience than the level before them.
+	"""
+	import numpy as np
+	table = rom.get_exp_table()
+	drops = np.diff(table[:, 1:], axis=1) < 0
+	return {
+		int(n): bytearray((np.flatnonzero(drops[n]) + 2).astype(np.uint8).tobytes())
+		for n in np.flatnonzero(drops.any(axis=1))
+	}
+
 
 #== Items ==================================================================================================
 
@@ -364,6 +503,41 @@ def is_key_item(mem: Memory, n: int) -> bool:
 	else:
 		return (n < 201) # HMs are key items, TMs are not
 
+def _build_item_table(rom: Memory):
+	import numpy as np
+	n = np.arange(256)
+
+	# Prices are 3-byte BCD, except for TMs which are packed nybbles in thousands.
+	bcd    = np.roll(_read_table_columns(rom, "item_prices", 3), 1, axis=0).astype(np.int32)
+	digits = (bcd >> 4)*10 + (bcd & 0xF)
+	price  = digits[:,0]*10000 + digits[:,1]*100 + digits[:,2]
+	try:
+		tms = _read_table_columns(rom, "tm_prices", 1, 28)[:, 0]
+		price[201:] = np.stack((tms >> 4, tms & 0xF), axis=1).reshape(-1)[:55].astype(np.int32) * 1000
+	except KeyError: # TM price table hasn't been located for this version
+		price[201:] = -1
+
+	# See is_key_item. Bits from the RAM buffer are -1 if the buffer isn't in this memory image.
+	flags = np.zeros(25, np.int16)
+	flags[:15] = _read_table_columns(rom, "key_items", 1, 15)[:, 0]
+	try:
+		bank, addr = rom.location_ptr("buffer")
+		flags[15:] = np.frombuffer(rom.read_bytes(bank, addr + 15, 10), np.uint8)
+	except (KeyError, AddressError):
+		flags[15:] = -1
+	key = np.where(n < 201, 1, 0).astype(np.int8)
+	key[:196] = np.where(flags[n[:196] >> 3] < 0, -1, (flags[n[:196] >> 3] >> (n[:196] & 7)) & 1)
+
+	return _readonly_columns(price=price, is_key=key)
+
+def get_item_table(rom: Memory) -> Info:
+	"""
+	Return the info of all 256 item IDs as read-only NumPy columns indexed by item ID:
+	  - `price`:  `int32` price (-1 if unknown)
+	  - `is_key`: `int8` key item flag (-1 if it comes from RAM that isn't in this memory image)
+	"""
+	return rom.cached("item_table", _build_item_table)
+
 
 #== Trainers ===============================================================================================
 
@@ -388,19 +562,47 @@ def get_trainer_class_ai_info(rom: Memory, n: int):
 	info = rom.read_bytes(bank, addr + n*3, 3)
 	return bank, unpack16(info, 1), info[0]
 
-def get_trainer_team_ptr(rom: Memory, trainer: int, team: int):
-	bank, addr = rom.table_read_addr("trainer_teams", (trainer - 1) & 0xFF)
-	s = rom.stream(bank, addr)
-
-	# Teams are null-terminated and stored sequentially.
-	# Skip all the teams before the one we're looking for.
-	for _ in range((team - 1) & 0xFF):
-		while next(s) != 0: pass
-	return bank, s.addr
+def _find_trainer_team_addrs(rom: Memory, bank: int, addr: int):
+	# Teams are null-terminated and stored sequentially, so a single walk over the data finds the start
+	# of every team. Glitch class pointers can land anywhere, so just read up until the end of whatever
+	# chunk of memory the pointer is in and stop early if we run off the end of it.
+	end   = 0x8000 if addr < 0x8000 else 0x10000
+	data  = rom.read_bytes(bank, addr, end - addr, allow_partial=True)
+	addrs = array("H")
+	if data: addrs.append(addr)
+	i = 0
+	for _ in range(255):
+		i = data.find(0, i) + 1
+		if i == 0: break
+		addrs.append(addr + i)
+	return addrs, addr + len(data)
+
+def _build_trainer_team_index(rom: Memory):
+	bank, addr = rom.location("trainer_teams")
+	ptrs  = rom.read_bytes(bank, addr, 512)
+	index = []
+	for trainer in range(256):
+		team_addr = unpack16(ptrs, ((trainer - 1) & 0xFF) * 2)
+		index.append((bank, *_find_trainer_team_addrs(rom, bank, team_addr)))
+	return tuple(index)
+
+def get_trainer_team_index(rom: Memory) -> tuple[tuple[int, array, int]]:
+	"""
+	Return the start address of every team of every trainer class.
+	
+	Each entry is a tuple of `(bank, addrs, end_addr)`, where `addrs[(team - 1) & 0xFF]` is the address of
+	team `team`. If a class's team data runs off the end of mapped memory, `addrs` will be cut short and
+	`end_addr` will be the first unmapped address.
+	"""
+	return rom.cached("trainer_team_index", _build_trainer_team_index)
 
-def get_trainer_team(rom: Memory, trainer: int, team: int):
-	s = rom.stream(*get_trainer_team_ptr(rom, trainer, team))
+def get_trainer_team_ptr(rom: Memory, trainer: int, team: int) -> ptr:
+	bank, addrs, end = rom.get_trainer_team_index()[trainer & 0xFF]
+	i = (team - 1) & 0xFF
+	if i >= len(addrs): raise AddressError(end)
+	return bank, addrs[i]
 
+def _read_trainer_team(s: Memory.Stream) -> list[tuple[int, int]]:
 	# If the team's level is FF, each member's level is specified individually.
 	# Otherwise, every member has the team's level.
 	level, team = s.next8(), []
@@ -412,8 +614,52 @@ def get_trainer_team(rom: Memory, trainer: int, team: int):
 		for mon in s:
 			if mon == 0: break
 			team.append((mon, level))
+	return team
 
-	return tuple(team)
+def get_trainer_team(rom: Memory, trainer: int, team: int):
+	return tuple(_read_trainer_team(rom.stream(*get_trainer_team_ptr(rom, trainer, team))))
+
+# Trainer classes 1 through 47 are real; every other class ID is a glitch class (see g1const.glitch_trainer_ids.)
+_num_trainer_classes = 47
+
+def _count_own_trainer_teams(addrs, end, starts):
+	# Count the teams up until the point where the next real class's teams start.
+	i = bisect_right(starts, addrs[0])
+	if i < len(starts): return max(1, bisect_left(addrs, starts[i]))
+	# Nothing but the end of the bank bounds the last real class, so stop at the first empty team
+	# (just a level and terminator, or a lone terminator) since a real team always has a member.
+	ends = (*addrs[1:], end)
+	for count in range(len(addrs)):
+		if ends[count] - addrs[count] <= 2: return max(1, count)
+	return len(addrs)
+
+def get_all_trainer_teams(rom: Memory, trainers=range(256), teams:int=None) -> bytearray:
+	"""
+	Return every member of every team of the given trainer classes, packed into
+	4-byte `(class, team, species, level)` rows.
+	
+	If `teams` is `None`, each class's teams are read up until the point where the next real class's teams
+	start, or, past the last real class, up until the first empty team. Otherwise, teams `1` through `teams`
+	are read for every class.
+	"""
+	index = rom.get_trainer_team_index()
+	if teams is None:
+		# Glitch class pointers can land in the middle of team data, so only real classes bound each other.
+		starts = sorted({index[n][1][0] for n in range(1, _num_trainer_classes + 1) if index[n][1]})
+
+	rows = bytearray()
+	for trainer in trainers:
+		bank, addrs, end = index[trainer & 0xFF]
+		if not addrs: continue
+		count = _count_own_trainer_teams(addrs, end, starts) if teams is None else teams
+		for team in range(1, min(count, len(addrs)) + 1):
+			try:
+				members = _read_trainer_team(rom.stream(bank, addrs[team - 1]))
+			except AddressError:
+				continue
+			for mon, level in members:
+				rows.extend((trainer, team, mon, level))
+	return rows
 
 
 #== Tilesets ===============================================================================================
@@ -455,21 +701,74 @@ def get_tileset_blocks(rom: Memory, n: int, glitch:bool=False) -> Generator[byte
 	for _ in range(rom.get_tileset_num_blocks(n, glitch)):
 		yield s.next_bytes(16)
 
+def _tileset_metatiles(rom: Memory, n: int, glitch: bool):
+	# Returns each block's 2x2 metatiles in (top-left, top-right, bottom-left, bottom-right) order,
+	# with each metatile's 4 tile IDs packed into a little-endian uint32.
+	import numpy as np
+	data   = rom.get_tileset_block_data(n, glitch)
+	blocks = np.frombuffer(data, np.uint8, len(data) & ~15).reshape(-1, 2, 2, 2, 2)
+	tiles  = np.ascontiguousarray(blocks.transpose(0, 1, 3, 2, 4)).reshape(-1, 4)
+	return tiles.view("<u4").reshape(-1, 4)
+
 def get_tileset_metatiles(rom: Memory, n: int, glitch:bool=False) -> set[bytes]:
 	"""Return all unique 2x2 metatiles in the given tileset."""
-	s = rom.stream(*rom.get_tileset_block_ptr(n))
-	tiles = set()
-	for _ in range(rom.get_tileset_num_blocks(n, glitch)):
-		b = s.next_bytes(16)
-		tiles.add(bytes(b[0], b[1], b[4], b[5] ))
-		tiles.add(bytes(b[2], b[3], b[6], b[7] ))
-		tiles.add(bytes(b[8], b[9], b[12],b[13]))
-		tiles.add(bytes(b[10],b[11],b[14],b[15]))
-	return tiles
+	import numpy as np
+	return {int(m).to_bytes(4, "little") for m in np.unique(_tileset_metatiles(rom, n, glitch))}
 
-def get_tileset_tile_info(rom: Memory, n: int) -> Info:
-	bank, addr = rom.get_tileset_header_ptr(n)
-	data = rom.read_bytes(bank, addr + 5, 7)
+def _build_metatile_index(rom: Memory, glitch: bool):
+	import numpy as np
+	metatiles, tilesets, blocks = [], [], []
+	for n in range(256):
+		try:
+			m = _tileset_metatiles(rom, n, glitch)
+		except AddressError:
+			continue
+		metatiles.append(m.reshape(-1))
+		tilesets.append(np.full(m.size, n, np.uint8))
+		blocks.append(np.repeat(np.arange(len(m), dtype=np.uint8), 4))
+	metatiles = np.concatenate(metatiles)
+	tilesets  = np.concatenate(tilesets)
+	blocks    = np.concatenate(blocks)
+
+	unique, inverse, counts = np.unique(metatiles, return_inverse=True, return_counts=True)
+	order = np.argsort(inverse, kind="stable")
+	index, i = {}, 0
+	for m, count in zip(unique.tolist(), counts.tolist()):
+		users = order[i:i+count]
+		index[m.to_bytes(4, "little")] = sorted(set(zip(tilesets[users].tolist(), blocks[users].tolist())))
+		i += count
+	return index
+
+def get_metatile_index(rom: Memory, glitch:bool=False) -> dict[bytes, list[tuple[int,int]]]:
+	"""
+	Return a dict mapping every unique 2x2 metatile in every tileset ID to the sorted
+	`(tileset, block)` pairs that use it. Metatiles are 4 tile IDs in
+	(top-left, top-right, bottom-left, bottom-right) order.
+	If `glitch` is `True`, all 256 blocks of every tileset are included.
+	"""
+	return rom.cached(("metatile_index", glitch), _build_metatile_index, glitch)
+
+def _read_tile_list(rom: Memory, bank: int, addr: int) -> bytes:
+	# Tile lists are read until an FF terminator, so bound the read to the end of the ROM region.
+	end  = 0x4000 if addr < 0x4000 else (addr & 0xC000) + 0x4000
+	data = rom.read_bytes(bank, addr, end - addr, allow_partial=True)
+	i = data.find(0xFF)
+	return bytes(data if i < 0 else data[:i])
+
+def _warp_tiles_table_read_addr(rom: Memory, n: int) -> ptr:
+	try:
+		return rom.table_read_addr("warp_tiles", n)
+	except KeyError:
+		raise KeyError(f"warp_tiles: the warp tile table hasn't been located for version {rom.version}") from None
+
+def get_tileset_tile_info(rom: Memory, n: int, bank:int=None) -> Info:
+	"""
+	Return tileset `n`'s collision, warp, counter, and grass tiles.
+	`bank` is the ROM bank mapped when the collision data is read (see below.)
+	Raises `KeyError` if the warp tile table hasn't been located for the ROM's version.
+	"""
+	hbank, addr = rom.get_tileset_header_ptr(n)
+	data = rom.read_bytes(hbank, addr + 5, 7)
 	
 	walk_addr  = unpack16(data, 0)
 	counters   = data[2:5] # Counter tile IDs (list of tile IDs the player can talk to NPCs across)
@@ -484,21 +783,16 @@ def get_tileset_tile_info(rom: Memory, n: int) -> Info:
 	#   - Player movement routines are in home bank, the bank mapped is the current map's bank
 	#   - NPC and Strength boulder movement routines are in switchable banks, so the bank mapped
 	#     is the bank containing the respective routine
-	walkable = set()
-	for b in rom.stream(None, walk_addr, allow_partial=True):
-		if b == 0xFF: break
-		walkable.add(b)
+	walkable = _read_tile_list(rom, bank, walk_addr)
 	
 	# Warp tile IDs
-	warp_tiles, warp_bank, warp_addr = set(), *rom.table_read_addr("warp_tiles", n)
-	for b in rom.stream(warp_bank, warp_addr, allow_partial=True):
-		if b == 0xFF: break
-		warp_tiles.add(b)
+	warp_bank, warp_addr = _warp_tiles_table_read_addr(rom, n)
+	warp_tiles = _read_tile_list(rom, warp_bank, warp_addr)
 
 	return Info(
-		walkable_tiles      = walkable,
+		walkable_tiles      = set(walkable),
 		walkable_tiles_addr = walk_addr,
-		warp_tiles          = warp_tiles,
+		warp_tiles          = set(warp_tiles),
 		warp_tiles_addr     = warp_addr,
 		counter_tiles       = set(counters),
 		grass_tile          = grass,
@@ -510,21 +804,64 @@ TILE_WALKABLE = 1 << 1
 TILE_WARP     = 1 << 2
 TILE_COUNTER  = 1 << 3
 TILE_GRASS    = 1 << 4
-def get_tileset_tile_attributes(rom: Memory, n: int, glitch:bool=False) -> tuple:
-	ntiles = 0x60 if not glitch else 0x100
-	tiles  = bytearray(ntiles)
-	info   = rom.get_tileset_tile_info(n)	
 
+def _build_tileset_tile_attributes(rom: Memory, n: int, bank: int):
+	import numpy as np
+	info  = rom.get_tileset_tile_info(n, bank)
+	tiles = np.zeros(256, np.uint8)
 	tiles[info.grass_tile] |= TILE_GRASS
+	tiles[list(info.walkable_tiles)] |= TILE_WALKABLE
+	tiles[list(info.counter_tiles)]  |= TILE_COUNTER
+	tiles[list(info.warp_tiles)]     |= TILE_WARP
+	tiles.flags.writeable = False
+	return tiles
+
+def get_tileset_tile_attributes(rom: Memory, n: int, bank:int=None):
+	"""
+	Return a read-only `uint8` NumPy array of the `TILE_*` flags of all 256 tile IDs in tileset `n`.
+	
+	`bank` is the ROM bank mapped when the collision data is read, which only matters for glitch
+	tilesets whose collision data is in the switchable ROM bank. For the player this is the current
+	map's bank, for NPCs and Strength boulders it's the bank of their movement routine.
+	"""
+	return rom.cached(("tile_attributes", n, bank), _build_tileset_tile_attributes, n, bank)
+
+# Collision is checked against the lower-left tile of each 2x2 tile square the player can stand on.
+_block_collision_tiles = ((4, 6), (12, 14))
 
-	for tile in info.walkable_tiles:
-		tiles[tile] |= TILE_WALKABLE
+def get_tileset_block_attributes(rom: Memory, n: int, bank:int=None, glitch:bool=False):
+	"""
+	Return a `uint8` NumPy array of shape `(nblocks, 2, 2)` with the `TILE_*` flags of each
+	2x2 tile square in each of tileset `n`'s blocks.
+	Blocks whose data couldn't be read are treated as all tile 0.
+	"""
+	import numpy as np
+	nblocks = rom.get_tileset_num_blocks(n, glitch)
+	data    = rom.get_tileset_block_data(n, glitch)
+	blocks  = np.zeros(nblocks*16, np.uint8)
+	blocks[:len(data)] = np.frombuffer(data, np.uint8)
+	blocks = blocks.reshape(nblocks, 16)
+	return rom.get_tileset_tile_attributes(n, bank)[blocks[:, _block_collision_tiles]]
+
+def get_map_attributes(rom: Memory, n: int, bank:int=None):
+	"""
+	Return a `uint8` NumPy array of shape `(height*2, width*2)` with the `TILE_*` flags of each
+	square the player can stand on in map `n`, e.g. `(get_map_attributes(rom, n) & TILE_WALKABLE) != 0`.
+	`bank` defaults to the map's bank (the bank mapped during player movement.)
+	Returns `None` if the map's header couldn't be read.
+	"""
+	import numpy as np
+	graph = rom.get_map_graph()
+	if not graph.complete[n]: return None
+	width, height, tileset = graph.width[n] or 256, graph.height[n] or 256, graph.tileset[n]
+	if bank is None: bank = graph.bank[n]
 
-	for tile in info.counter_tiles:
-		tiles[tile] |= TILE_COUNTER
+	data   = rom.read_bytes(graph.bank[n], graph.block_addr[n], width*height, allow_partial=True)
+	blocks = np.zeros(width*height, np.uint8)
+	blocks[:len(data)] = np.frombuffer(data, np.uint8)
 
-	for tile in info.warp_tiles:
-		tiles[tile] |= TILE_WARP
+	attrs = rom.get_tileset_block_attributes(tileset, bank, glitch=True)[blocks.reshape(height, width)]
+	return attrs.transpose(0, 2, 1, 3).reshape(height*2, width*2)
 
 
 #== Maps ===================================================================================================
@@ -735,32 +1072,92 @@ def get_map_sprite_ids(rom: Memory, n: int, allow_partial:bool=False):
 	return sprites
 
 def get_map_warpdest(rom: Memory, map: int, warp: int) -> Warpdest:
-	bank, addr = rom.get_map_objects_ptr(map)
-	addr = get_map_objptr_warpdests_addr(rom, bank, addr)
+	ptr = rom.get_map_graph().get_warpdests_ptr(map)
+	if ptr is not None:
+		bank, addr = ptr
+	else:
+		bank, addr = rom.get_map_objects_ptr(map)
+		addr = get_map_objptr_warpdests_addr(rom, bank, addr)
 	data = rom.read_bytes(bank, addr + warp*4, 4)
 	return unpack16(data,0), data[3], data[2]
 
-def get_dungeon_warpdest(rom: Memory, map: int, warp: int) -> Warpdest:
-	bank, addr = rom.location("dungeon_warp_ids")
+# The game searches the dungeon and fly warp tables without checking for the end of the table, so looking up
+# a warp that isn't in the table just keeps searching through whatever data comes after it. Searches are
+# reproduced up until the end of the ROM bank, since anything past that would be reading from VRAM.
+_WARP_SEARCH_END = 0x8000
+
+def _decode_warpdest(data: bytes, i: int) -> Warpdest:
+	return unpack16(data, i), data[i+3]*2 + data[i+5], data[i+2]*2 + data[i+4]
+
+def _build_dungeon_warp_index(rom: Memory):
+	bank, addr = rom.location("dungeon_warps")
+	data  = rom.read_bytes(bank, addr, _WARP_SEARCH_END - addr, allow_partial=True)
+	index = {}
 	i = 0
-	m, w = rom.read_bytes(bank, addr, 2)
-	while m != map or w != warp:
+	for j in range(0, len(data) - 1, 2):
+		# only the first match is ever found
+		index.setdefault((data[j], data[j+1]), i)
 		i = (i + 6) & 0xFF
-		addr += 2
-		m, w = rom.read_bytes(bank, addr, 2)
-	bank, addr = rom.location("dungeon_warps")
-	info = rom.read_bytes(bank, addr + i, 6)
-	return unpack16(info,0), info[3]*2 + info[5], info[2]*2 + info[4]
+	return index
+
+def get_dungeon_warp_index(rom: Memory) -> dict[tuple[int,int], int]:
+	"""
+	Return a dict mapping each `(map, warp)` found by the dungeon warp search to the offset of its
+	warp destination in the dungeon warp destination table.
+	"""
+	return rom.cached("dungeon_warp_index", _build_dungeon_warp_index)
+
+def get_dungeon_warpdest(rom: Memory, map: int, warp: int) -> Warpdest:
+	i = rom.get_dungeon_warp_index().get((map, warp))
+	if i is None: raise AddressError(_WARP_SEARCH_END)
+	bank, addr = rom.location("dungeon_warpdests")
+	return _decode_warpdest(rom.read_bytes(bank, addr + i, 6), 0)
+
+def get_all_dungeon_warpdests(rom: Memory) -> dict[tuple[int,int], Warpdest]:
+	"""Return the warp destination of every `(map, warp)` the dungeon warp search can find."""
+	bank, addr = rom.location("dungeon_warpdests")
+	data = rom.read_bytes(bank, addr, 256 + 6, allow_partial=True)
+	return {
+		key: _decode_warpdest(data, i)
+		for key, i in rom.get_dungeon_warp_index().items() if i + 6 <= len(data)
+	}
+
+def _fly_warps_ptr(rom: Memory) -> ptr:
+	try:
+		return rom.location("fly_warps")
+	except KeyError:
+		raise KeyError(f"fly_warps: the fly warp table hasn't been located for version {rom.version}") from None
+
+def _build_fly_warp_index(rom: Memory):
+	bank, addr = _fly_warps_ptr(rom)
+	data  = rom.read_bytes(bank, addr, _WARP_SEARCH_END - addr, allow_partial=True)
+	index = {}
+	for i in range(0, len(data) - 3, 4):
+		index.setdefault(data[i], unpack16(data, i + 2))
+	return index
+
+def get_fly_warp_index(rom: Memory) -> dict[int, int]:
+	"""
+	Return a dict mapping each map ID found by the fly warp search to the address of its warp destination.
+	"""
+	return rom.cached("fly_warp_index", _build_fly_warp_index)
 
 def get_fly_warpdest(rom: Memory, n: int) -> Warpdest:
-	bank, addr = rom.location("fly_warps")
-	b = rom.read8(bank, addr)
-	while b != n:
-		addr += 4
-		b = rom.read8(bank, addr)
-	addr = rom.read16(bank, addr + 2)
-	info = rom.read_bytes(bank, addr, 6)
-	return unpack16(info,0), info[3]*2 + info[5], info[2]*2 + info[4]
+	addr = rom.get_fly_warp_index().get(n)
+	if addr is None: raise AddressError(_WARP_SEARCH_END)
+	bank, _ = _fly_warps_ptr(rom)
+	return _decode_warpdest(rom.read_bytes(bank, addr, 6), 0)
+
+def get_all_fly_warpdests(rom: Memory) -> dict[int, Warpdest]:
+	"""Return the warp destination of every map ID the fly warp search can find."""
+	bank, _ = _fly_warps_ptr(rom)
+	warpdests = {}
+	for n, addr in rom.get_fly_warp_index().items():
+		try:
+			warpdests[n] = _decode_warpdest(rom.read_bytes(bank, addr, 6), 0)
+		except AddressError:
+			pass
+	return warpdests
 
 def undisplace_map_addr(addr: int, step: int, x: int, y: int) -> int:
 	"""
@@ -817,27 +1214,163 @@ def get_displaced_map_info(rom: Memory, info, blockaddr: int, x: int, y: int, un
 		player_y   = y,
 	)
 
-def get_glitch_city_info(rom: Memory, map: int, warp: int) -> Info:
+def get_glitch_city_info(rom: Memory, map: int, warp: int, unbound:bool=False) -> Info:
 	info = rom.get_map_drawable_info(map)
-	return rom.get_displaced_map_info(info, *rom.get_map_warpdest(map, warp))
+	return rom.get_displaced_map_info(info, *rom.get_map_warpdest(map, warp), unbound)
+
+def _glitch_city_key(rom: Memory, map: int, info: Info) -> tuple:
+	# Identify a displaced map by everything that affects how it's drawn: its tileset, size, the palette and
+	# spriteset of the map it was entered from (glitch tiles are drawn from whatever sprites are in VRAM),
+	# and the contents of every block row in it.
+	width, height, step = info.width, info.height, info.block_step
+	palette   = g1const.map_palette_id(map, rom.is_yellow)
+	spriteset = rom.get_map_spriteset_at(map, info.player_x, info.player_y, allow_partial=True)
+	span = rom.read_bytes(info.bank, info.block_addr & 0xFFFF, (height - 1)*step + width, allow_partial=True)
+	h = blake2b(digest_size=16)
+	h.update(len(span).to_bytes(4, "little")) # unreadable blocks differ from any readable ones
+	view = memoryview(span)
+	for i in range(0, height*step, step):
+		h.update(view[i:i+width])
+	return info.tileset, width, height, palette, spriteset, h.digest()
+
+def _find_map_glitch_cities(rom: Memory, map: int, warps) -> list[tuple[tuple, int, int]]:
+	results = []
+	try:
+		info = rom.get_map_drawable_info(map)
+	except AddressError:
+		return results
+	for warp in warps:
+		try:
+			city = rom.get_displaced_map_info(info, *rom.get_map_warpdest(map, warp))
+			results.append((_glitch_city_key(rom, map, city), map, warp))
+		except AddressError:
+			pass
+	return results
 
-def get_town_map_landmark_data(rom: Memory, n: int):
-	if n < 0x24:
-		bank, addr = rom.location("outdoor_map_names")
-		addr += n*3
+_worker_rom = None
+
+def _init_glitch_city_worker(cls, images: dict, version: str):
+	global _worker_rom
+	_worker_rom = cls(**images, version=version)
+
+def _find_map_glitch_cities_worker(map: int, warps) -> list[tuple[tuple, int, int]]:
+	return _find_map_glitch_cities(_worker_rom, map, warps)
+
+def find_all_glitch_cities(rom: Memory, maps=range(256), warps=range(256), processes:int=None) -> list[Info]:
+	"""
+	Find every distinct displaced map obtained by entering any of `maps` from any of `warps`.
+
+	Entry pairs that produce the same blocks with the same tileset, size, palette and spriteset are collapsed
+	into one city.
+	Returns a list of cities in order of their first entry pair, where the index in the list is the city's ID.
+	Each city is an `Info` with `entries` (the `(map, warp)` pairs), `tileset`, `width`, `height`, `palette_id`
+	and `spriteset`.
+	Nothing is rendered; pass any entry pair to `get_glitch_city_bitmap` to draw a city.
+
+	The sweep is split by map across a pool of `processes` worker processes (default: one per CPU).
+	If `processes` is 1, it runs in the calling process instead. Workers get a copy of every memory area
+	of `rom` (including any RAM), but not custom location tables.
+	"""
+	maps, warps = list(maps), list(warps)
+	if processes == 1:
+		results = [_find_map_glitch_cities(rom, map, warps) for map in maps]
 	else:
-		bank, addr = rom.location("indoor_map_names")
-		while rom.read8(bank, addr) <= n: addr += 4
-		addr += 1
-	xy, addr = rom.read8(bank, addr), rom.read16(bank, addr + 1)
-	return xy >> 4, xy & 0xF, bank, addr
+		from concurrent.futures import ProcessPoolExecutor
+		with ProcessPoolExecutor(processes, initializer=_init_glitch_city_worker,
+				initargs=(type(rom), rom.images(), rom.version)) as pool:
+			results = list(pool.map(_find_map_glitch_cities_worker, maps, [warps]*len(maps)))
+
+	cities = {}
+	for result in results:
+		for key, map, warp in result:
+			city = cities.get(key)
+			if city is None:
+				tileset, width, height, palette_id, spriteset, _ = key
+				city = cities[key] = Info(entries=[], tileset=tileset, width=width, height=height,
+				                          palette_id=palette_id, spriteset=spriteset)
+			city.entries.append((map, warp))
+	return list(cities.values())
+
+_FIRST_INDOOR_MAP = 0x25 # Red's house 1F
+
+def _build_town_map_landmark_table(rom: Memory):
+	table = [None] * 256
+	indoor_bank, indoor_addr = rom.location("indoor_map_names")
+
+	# Outdoor maps (up to Route 25) index a table of 3-byte entries directly preceding the indoor table.
+	try:
+		bank, addr = rom.location("outdoor_map_names")
+	except KeyError:
+		bank, addr = indoor_bank, indoor_addr - _FIRST_INDOOR_MAP*3
+	data = rom.read_bytes(bank, addr, _FIRST_INDOOR_MAP*3, allow_partial=True)
+	for n in range(min(_FIRST_INDOOR_MAP, len(data) // 3)):
+		i = n*3
+		table[n] = data[i] >> 4, data[i] & 0xF, bank, unpack16(data, i + 1)
+
+	# The indoor table is searched for the first entry whose max map ID is greater than the map ID,
+	# without checking for the end of the table, so glitch IDs keep searching through whatever comes
+	# after it. Like the warp searches, this is reproduced up until the end of the ROM bank.
+	bank, addr = indoor_bank, indoor_addr
+	data = rom.read_bytes(bank, addr, _WARP_SEARCH_END - addr, allow_partial=True)
+	n = _FIRST_INDOOR_MAP
+	for i in range(0, len(data) - 3, 4):
+		end = data[i]
+		if end <= n: continue
+		entry = data[i+1] >> 4, data[i+1] & 0xF, bank, unpack16(data, i + 2)
+		for m in range(n, end): table[m] = entry
+		n = end
+		if n == 0x100: break
+	return table
+
+def get_town_map_landmark_table(rom: Memory) -> list[tuple[int,int,int,int]]:
+	"""
+	Return the `(x, y, bank, name_addr)` town map landmark data of all 256 map IDs.
+	Map IDs whose landmark search runs off the end of the ROM bank are `None`.
+	"""
+	return rom.cached("town_map_landmark_table", _build_town_map_landmark_table)
+
+def get_town_map_landmark_data(rom: Memory, n: int):
+	data = rom.get_town_map_landmark_table()[n]
+	if data is None: raise AddressError(_WARP_SEARCH_END)
+	return data
 def get_town_map_landmark(rom: Memory, n: int, **opt):
 	x, y, bank, addr = rom.get_town_map_landmark_data(n)
 	return x, y, rom.read_string(bank, addr, **opt)
 
+def get_all_town_map_landmarks(rom: Memory, **opt) -> list[tuple[int,int,str]]:
+	"""
+	Return the `(x, y, name)` town map landmark of all 256 map IDs (`None` if it couldn't be found.)
+	Each landmark name is only decoded once, no matter how many maps share it.
+	"""
+	names, landmarks = {}, []
+	for data in rom.get_town_map_landmark_table():
+		if data is None:
+			landmarks.append(None)
+			continue
+		x, y, bank, addr = data
+		if (bank, addr) not in names:
+			# name pointers of glitch landmarks can point anywhere, including outside the memory image
+			try: names[bank, addr] = rom.read_string(bank, addr, **opt)
+			except AddressError: names[bank, addr] = None
+		name = names[bank, addr]
+		landmarks.append(None if name is None else (x, y, name))
+	return landmarks
+
+def _build_map_music_table(rom: Memory):
+	bank, addr = rom.location("map_music")
+	data = rom.read_bytes(bank, addr, 256*2, allow_partial=True)
+	return [(data[i+1], data[i]) if i + 1 < len(data) else None for i in range(0, 512, 2)]
+
+def get_map_music_table(rom: Memory) -> list[tuple[int,int]]:
+	"""
+	Return the `(sound_bank, music)` of all 256 map IDs (`None` if it couldn't be read.)
+	"""
+	return rom.cached("map_music_table", _build_map_music_table)
+
 def get_map_soundbank_and_music(rom: Memory, n: int) -> tuple[int,int]:
-	music, bank = rom.table_read_bytes("map_music", 2, n)
-	return bank, music
+	music = rom.get_map_music_table()[n]
+	if music is None: raise AddressError(rom.location("map_music")[1] + n*2)
+	return music
 
 def get_map_wild_encounter_ptr(rom: Memory, n: int) -> ptr:
 	return rom.table_read_addr("wild_encounters", n)
@@ -864,6 +1397,36 @@ def get_map_wild_encounters(rom: Memory, n: int, info=None) -> Info:
 	return info
 
 
+def _build_wild_encounter_index(rom: Memory):
+	index = {}
+	bank, addr = rom.location("wild_encounters")
+	ptrs = rom.read_bytes(bank, addr, 512)
+	for map in range(256):
+		try:
+			s = rom.stream(bank, unpack16(ptrs, map*2))
+			for water in (False, True):
+				if s.next8() == 0: continue # encounter rate
+				data = s.next_bytes(20)
+				for slot in range(10):
+					level, mon = data[slot*2], data[slot*2 + 1]
+					chance = g1const.wild_encounter_slot_chances[slot] / 256
+					index.setdefault(mon, []).append((map, water, slot, level, chance))
+		except AddressError: pass
+	return index
+
+def get_wild_encounter_index(rom: Memory) -> dict[int, list[tuple[int,bool,int,int,float]]]:
+	"""
+	Return a dict mapping each mon ID to every wild encounter slot of every map ID that it appears in.
+	Each slot is a tuple of `(map, water, slot, level, chance)`, where `chance` is the probability that
+	the slot is picked whenever a wild encounter happens on that map.
+	"""
+	return rom.cached("wild_encounter_index", _build_wild_encounter_index)
+
+def find_wild_encounters(rom: Memory, n: int) -> list[tuple[int,bool,int,int,float]]:
+	"""Return every wild encounter slot that mon `n` appears in (see `get_wild_encounter_index`.)"""
+	return list(rom.get_wild_encounter_index().get(n, ()))
+
+
 #== Glitch IDs =============================================================================================
 
 def find_all_glitchmon_dex_nums(rom: Memory, hybrids=False) -> bytearray:
@@ -897,8 +1460,8 @@ def find_all_learnable_glitch_moves(rom: Memory, dex_nums=None) -> bytearray:
 		for n in start_moves:
 			if n == 0 or n > 165: ids.add(n)
 
-	for mon in g1const.glitchmon_species_ids:
-		for n in rom.get_mon_learnset(mon):
+	for mon in g1const.glitchmon_ids:
+		for n in rom.get_mon_learnset(mon).values():
 			if n == 0 or n > 165: ids.add(n)
 
 	return bytearray(sorted(ids))
@@ -913,6 +1476,7 @@ def find_all_used_glitch_types(rom: Memory, dex_nums=None, moves=g1const.glitch_
 		if type1 > 26: ids.add(type1)
 		if type2 > 26: ids.add(type2)
 
+	bank, addr = rom.location("moves")
 	for move in moves:
 		type = rom.read8(bank, addr + (((move - 1) & 0xFF) * 6) + 3)
 		if type > 26: ids.add(type)
@@ -939,53 +1503,152 @@ def find_all_used_glitchmon_palette_ids(rom: Memory, dex_nums=None) -> bytearray
 		if n >= glitch: ids.add(n)
 	return bytearray(sorted(ids))
 
+def _glitch_and_dummy_maps(rom):
+	maps = []
+	maps.extend(g1const.dummy_map_ids)
+	maps.extend(g1const.glitch_map_ids(rom.is_yellow))
+	return maps
+
 def find_all_used_glitch_tilesets(rom: Memory, maps=None) -> bytearray:
 	"""Return a list of all glitch tileset IDs used by glitch maps."""
 	ids    = set()
 	glitch = 0x19 if rom.is_yellow else 0x18 # first glitch ID
-	if maps is None:
-		maps = []
-		maps.extend(g1const.dummy_map_ids)
-		maps.extend(g1const.glitch_map_ids(rom.is_yellow))
+	if maps is None: maps = _glitch_and_dummy_maps(rom)
 	for map in maps:
 		n = rom.read8(*rom.get_map_header_ptr(map), default=None)
 		if n and n >= glitch: ids.add(n)
 	return bytearray(sorted(ids))
+
+class GlitchSurvey(Info):
+	"""
+	Every glitch ID used by glitchmons, glitch moves, and glitch maps, found by reading each data source
+	only once. This finds the same IDs as calling each of the `find_all_*` functions:
+	  - `dex_nums`:        `find_all_glitchmon_dex_nums`
+	  - `unused_dex_nums`: `find_all_unused_glitch_dex_nums`
+	  - `moves`:           `find_all_learnable_glitch_moves`
+	  - `types`:           `find_all_used_glitch_types`
+	  - `exp_groups`:      `find_all_used_glitch_exp_groups`
+	  - `palette_ids`:     `find_all_used_glitchmon_palette_ids`
+	  - `tilesets`:        `find_all_used_glitch_tilesets`
+	"""
+	def __init__(self, rom: Memory, hybrids:bool=False, moves=g1const.glitch_move_ids, maps=None):
+		super().__init__()
+
+		bank, addr = rom.location("dex_nums")
+		dex_nums = {0} # Missingno. is always #000
+		for n in rom.read_bytes(bank, addr + 190, 66):
+			if n > 151 or hybrids: dex_nums.add(n)
+		self.dex_nums        = bytearray(sorted(dex_nums))
+		self.unused_dex_nums = bytearray(n for n in range(152, 256) if n not in dex_nums)
+
+		learnable, types, exp_groups = set(), set(), set()
+		for mon in self.dex_nums:
+			bank, addr = rom.get_dex_mon_base_stats_ptr(mon)
+			data = rom.read_bytes(bank, addr, 20)
+			for n in data[6:8]:
+				if n > 26: types.add(n)
+			for n in data[15:19]:
+				if n == 0 or n > 165: learnable.add(n)
+			n = data[19] & 0x3F
+			if n > 5: exp_groups.add(n)
+
+		for mon in g1const.glitchmon_ids:
+			for n in rom.get_mon_learnset(mon).values():
+				if n == 0 or n > 165: learnable.add(n)
+
+		bank, addr = rom.location("moves")
+		data = rom.read_bytes(bank, addr, 256*6)
+		for move in moves:
+			n = data[((move - 1) & 0xFF) * 6 + 3]
+			if n > 26: types.add(n)
+
+		self.moves      = bytearray(sorted(learnable))
+		self.types      = bytearray(sorted(types))
+		self.exp_groups = bytearray(sorted(exp_groups))
+
+		glitch   = 0x28 if rom.is_yellow else 0x24 # first glitch ID
+		palettes = rom.read_bytes(*rom.location("mon_palettes"), 256)
+		self.palette_ids = bytearray(sorted({palettes[n] for n in self.dex_nums if palettes[n] >= glitch}))
+
+		glitch  = 0x19 if rom.is_yellow else 0x18 # first glitch ID
+		tilesets = set()
+		if maps is None: maps = _glitch_and_dummy_maps(rom)
+		for map in maps:
+			n = rom.read8(*rom.get_map_header_ptr(map), default=None)
+			if n and n >= glitch: tilesets.add(n)
+		self.tilesets = bytearray(sorted(tilesets))
+
+def get_glitch_survey(rom: Memory) -> GlitchSurvey:
+	"""Return a `GlitchSurvey` of this memory image."""
+	return rom.cached("glitch_survey", GlitchSurvey)
 	
 
 #== Searches ===============================================================================================
 
-def can_dex_mon_learn_move(rom: Memory, mon: int, move: int) -> bool:
-	bank, addr = rom.get_dex_mon_base_stats_ptr(mon)
+def _read_all_dex_mon_base_stats(rom: Memory):
+	import numpy as np
+	bank, addr = rom.location("base_stats")
+	data  = rom.read_bytes(bank, addr, 256*28, allow_partial=True)
+	stats = np.zeros((256, 28), np.uint8)
+	stats.reshape(-1)[:len(data)] = np.frombuffer(data, np.uint8)
+	stats = np.roll(stats, 1, axis=0) # dex number n is entry (n - 1) & 0xFF
+	if not rom.is_yellow:
+		stats[151] = np.frombuffer(rom.read_bytes(*rom.location("base_stats_mew"), 28), np.uint8)
+	return stats
+
+def _build_dex_learnability_matrix(rom: Memory):
+	import numpy as np
+	stats  = _read_all_dex_mon_base_stats(rom)
+	matrix = np.zeros((256, 256), bool)
+
+	matrix[np.arange(256)[:,None], stats[:,15:19]] = True # start moves
+
+	flags    = np.unpackbits(stats[:,20:27], axis=1, bitorder="little")[:,:55]
+	machines = np.frombuffer(bytes(g1const.machine_move(i) for i in range(55)), np.uint8)
+	matrix[:, machines] |= flags.astype(bool)
+	matrix.flags.writeable = False
+	return matrix
+
+def get_dex_learnability_matrix(rom: Memory):
+	"""
+	Return a 256x256 boolean NumPy array, where `[n, move]` is `True` if a mon with dex number `n`
+	can learn `move` as a start move or from a TM/HM.
+	"""
+	return rom.cached("dex_learnability_matrix", _build_dex_learnability_matrix)
 
-	for n in rom.read_bytes(bank, addr + 15, 4):
-		if n == move: return True
+def _build_learnability_matrix(rom: Memory):
+	import numpy as np
+	# The dex number table is indexed by (n - 1) & 0xFF, so rolling it by one puts mon n's dex number at
+	# index n (and mon 0's at index 0, wrapping around from entry 255.) Indexing the dex matrix with it gives
+	# every mon its dex number's row, as a new array the learnsets can then be added to.
+	dex_nums = np.frombuffer(rom.read_bytes(*rom.location("dex_nums"), 256), np.uint8)
+	matrix   = rom.get_dex_learnability_matrix()[np.roll(dex_nums, 1)]
 
-	if move < 165:
-		m = g1const.move_machine(move)
-		if m is not None:
-			if (rom.read8(bank, addr + 20 + (m >> 3)) >> (m & 7)) & 1 != 0:
-				return True
+	for mon in range(256):
+		try:
+			s = rom.stream(*rom.get_mon_learnset_ptr(mon))
+			for level in s:
+				if level == 0: break
+				matrix[mon, next(s)] = True
+		except AddressError:
+			pass
+	matrix.flags.writeable = False
+	return matrix
+
+def get_learnability_matrix(rom: Memory):
+	"""
+	Return a 256x256 boolean NumPy array, where `[n, move]` is `True` if mon `n` can learn `move`
+	as a start move, from a TM/HM, or by leveling up.
+	"""
+	return rom.cached("learnability_matrix", _build_learnability_matrix)
 
-	return False
+def can_dex_mon_learn_move(rom: Memory, mon: int, move: int) -> bool:
+	return bool(rom.get_dex_learnability_matrix()[mon, move])
 
 def can_mon_learn_move(rom: Memory, mon: int, move: int) -> bool:
-	dex = rom.get_mon_dex_num(mon)
-	if rom.can_dex_mon_learn_move(dex, move): return True
-
-	try:
-		s = rom.stream(*rom.get_mon_learnset_ptr(mon))
-		for level in s:
-			if level == 0: break
-			if next(s) == move: return True
-	except AddressError:
-		pass
-
-	return False
+	return bool(rom.get_learnability_matrix()[mon, move])
 
 def find_all_move_learners(rom: Memory, n: int, mons=range(256)) -> bytearray:
 	"""Return a list of the IDs of all mons that learn move `n`."""
-	ids = set()
-	for mon in mons:
-		if can_mon_learn_move(rom, mon, n): ids.add(mon)
-	return bytearray(sorted(ids))
\ No newline at end of file
+	learners = rom.get_learnability_matrix()[:, n]
+	return bytearray(sorted({mon for mon in mons if learners[mon]}))
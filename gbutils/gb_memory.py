@@ -82,6 +82,7 @@ class Memory(object):
 		title: str   = None,
 		gbc:   bool  = False
 	):
+		code = None
 		for arg in args:
 			if not isinstance(arg, Memory):
 				raise TypeError(f"args must be Memory, not {type(arg).__name__}")
@@ -90,15 +91,14 @@ class Memory(object):
 			if sram  is None: sram  = arg._sram
 			if wram  is None: wram  = arg._wram
 			if high  is None: high  = arg._high
-			if title is None: title = arg._title
+			if title is None: title, code = arg._title, arg._code
 	
 		if rom is not None:
 			if title is None:
 				title = rom[0x134:0x144]
 			self._mbc_mask = _mbc_masks[rom[0x148]]
 
-		code = None
-		if title is not None:
+		if isinstance(title, (bytes, bytearray)):
 			title, code = _decode_title(title)
 
 		self._rom   = rom
@@ -243,6 +243,19 @@ class Memory(object):
 	@property
 	def has_hram(self) -> bool:
 		return self._high is not None
+
+	def rom_image(self) -> bytes:
+		"""Return a copy of this memory image's ROM data (e.g. for rebuilding it in another process.)"""
+		if self._rom is None: raise ValueError("memory image has no ROM")
+		return bytes(self._rom)
+
+	def images(self) -> dict[str, bytes]:
+		"""
+		Return a copy of each memory area this image contains, keyed by its constructor argument
+		(`rom`, `vram`, `sram`, `wram`, `high`), so `type(mem)(**mem.images())` rebuilds it.
+		"""
+		areas = (("rom", self._rom), ("vram", self._vram), ("sram", self._sram), ("wram", self._wram), ("high", self._high))
+		return {name: bytes(data) for name, data in areas if data is not None}
 	
 	
 	def next_valid_addr(self, addr: int) -> int:
@@ -297,6 +310,9 @@ class Memory(object):
 		"""
 		try:
 			return self._read8_switch[addr >> 12](self, addr, rom_bank, sram_bank)
+		except AddressError:
+			if default is not DEFAULT: return default
+			raise
 		except TypeError:
 			if default is not DEFAULT: return default
 		raise AddressError(addr)
@@ -363,6 +379,9 @@ class Memory(object):
 				addr = (addr+1) & 0xFFFF
 				h = read8_switch[addr >> 12](self, addr, rom_bank, sram_bank)
 				return l | (h<<8)
+		except AddressError:
+			if default is not DEFAULT: return default
+			raise
 		except TypeError:
 			if default is not DEFAULT: return default
 		raise AddressError(addr)
@@ -392,8 +411,8 @@ class Memory(object):
 			else:
 				buf = array[offset:offset+chunklen]
 				if not isinstance(buf, bytearray): buf = bytearray(buf)
-				self.copy_bytes(rom_bank, addr, buf, chunklen, length - chunklen, sram_bank, allow_partial)
-			assert len(buf) == length
+				self.copy_bytes(rom_bank, endaddr & 0xFFFF, buf, chunklen, length - chunklen, sram_bank, allow_partial)
+			assert allow_partial or len(buf) == length
 			return buf
 		elif allow_partial:
 			return bytearray()
@@ -528,7 +547,7 @@ class Memory(object):
 				data = self.mem.read_bytes(rom_bank, addr, length,
 										   sram_bank     = sram_bank,
 										   allow_partial = self.allow_partial)
-				self._next_chunk((addr + length) & 0xFFFF, rom_bank, sram_bank)
+				self._i = self._next_chunk((addr + length) & 0xFFFF, rom_bank, sram_bank, False)
 				return data
 
 	def _next_chunk_rom0(self, addr, rom_bank, sram_bank):
@@ -0,0 +1,91 @@
+# pngfmt.py
+from __future__ import annotations
+
+import struct, zlib
+
+_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Max size of an IDAT chunk. Compressed data is written out whenever this much has built up.
+IDAT_SIZE = 1 << 16
+
+# zlib compression levels
+DEFAULT_LEVEL = 9
+PREVIEW_LEVEL = 1 # for fast previews; much faster but larger
+
+# PNG row filter types
+FILTER_NONE = 0
+FILTER_SUB  = 1
+FILTER_UP   = 2
+
+
+def _chunk(file, type: bytes, data: bytes):
+	file.write(struct.pack(">I", len(data)))
+	file.write(type)
+	file.write(data)
+	file.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(type))))
+
+def _filtered_rows(rows, filter, bpp):
+	# Yields each row with its filter type byte. `bpp` is the number of bytes per complete pixel (at least 1.)
+	if filter == FILTER_NONE:
+		for row in rows:
+			yield b"\0"
+			yield row
+		return
+
+	import numpy as np
+	prev = None
+	for row in rows:
+		row = np.frombuffer(row, np.uint8)
+		out = row.copy()
+		if filter == FILTER_SUB:
+			out[bpp:] -= row[:-bpp]
+		elif prev is not None: # FILTER_UP; the row above the first is all zeros
+			out -= prev
+		prev = row.copy() # rows may be views of a buffer the caller reuses
+		yield bytes((filter,))
+		yield out.tobytes()
+
+def write_png(file, width: int, height: int, rows, bitdepth:int=8, greyscale:bool=False, palette=None,
+              level:int=DEFAULT_LEVEL, strategy:int=zlib.Z_DEFAULT_STRATEGY, filter:int=FILTER_NONE):
+	"""
+	Write a PNG image to `file` (a path or a binary file), streaming each row into the compressor
+	as it's produced so the whole image is never held in memory.
+
+	#### Arguments:
+	- rows:
+		An iterable of packed rows (bytes-like), each `ceil(width * channels * bitdepth / 8)` bytes.
+	- bitdepth:
+		Bits per channel: 1, 2, 4 or 8 for greyscale and palette images, 8 for RGB images.
+	- greyscale, palette:
+		The image is greyscale if `greyscale` is true, indexed if `palette` (a sequence of RGB triples)
+		is given, or 8-bit RGB otherwise.
+	- level, strategy:
+		The zlib compression level and strategy (e.g. `zlib.Z_RLE`.) Use `PREVIEW_LEVEL` for speed.
+	- filter:
+		The row filter used for every row (`FILTER_NONE`, `FILTER_SUB` or `FILTER_UP`.)
+	"""
+	if isinstance(file, str):
+		with open(file, "wb") as f:
+			return write_png(f, width, height, rows, bitdepth, greyscale, palette, level, strategy, filter)
+
+	if palette is not None: color_type, channels = 3, 1
+	elif greyscale:         color_type, channels = 0, 1
+	else:                   color_type, channels = 2, 3
+	if color_type == 2 and bitdepth != 8:
+		raise ValueError("RGB images must have a bit depth of 8")
+
+	file.write(_SIGNATURE)
+	_chunk(file, b"IHDR", struct.pack(">IIBBBBB", width, height, bitdepth, color_type, 0, 0, 0))
+	if palette is not None:
+		_chunk(file, b"PLTE", b"".join(bytes(color) for color in palette))
+
+	compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS, 9, strategy)
+	buf = bytearray()
+	for data in _filtered_rows(rows, filter, max(1, channels * bitdepth // 8)):
+		buf += compressor.compress(data)
+		if len(buf) >= IDAT_SIZE:
+			_chunk(file, b"IDAT", bytes(buf))
+			buf.clear()
+	buf += compressor.flush()
+	_chunk(file, b"IDAT", bytes(buf))
+	_chunk(file, b"IEND", b"")
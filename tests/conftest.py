@@ -0,0 +1,94 @@
+# conftest.py
+import os, struct, sys, zlib
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from g1utils import Memory, g1locations
+import pngfmt
+
+
+def read_png(data: bytes):
+	"""Minimal decoder for the images `pngfmt.write_png` produces: returns the IHDR fields, palette and unfiltered rows."""
+	assert data[:8] == b"\x89PNG\r\n\x1a\n"
+	i, chunks = 8, []
+	while i < len(data):
+		length, = struct.unpack(">I", data[i:i+4])
+		type, body = data[i+4:i+8], data[i+8:i+8+length]
+		assert struct.unpack(">I", data[i+8+length:i+12+length])[0] == zlib.crc32(type + body)
+		chunks.append((type, body))
+		i += 12 + length
+	assert chunks[0][0] == b"IHDR" and chunks[-1] == (b"IEND", b"")
+
+	width, height, bitdepth, color_type = struct.unpack(">IIBB", chunks[0][1][:10])
+	palette = b"".join(body for type, body in chunks if type == b"PLTE") or None
+	raw     = zlib.decompress(b"".join(body for type, body in chunks if type == b"IDAT"))
+
+	channels = 3 if color_type == 2 else 1
+	stride   = (width * channels * bitdepth + 7) // 8
+	bpp      = max(1, channels * bitdepth // 8)
+	rows, prev = [], bytes(stride)
+	for y in range(height):
+		filter, row = raw[y*(stride+1)], bytearray(raw[y*(stride+1)+1:(y+1)*(stride+1)])
+		for x in range(stride):
+			if   filter == pngfmt.FILTER_SUB and x >= bpp: row[x] = (row[x] + row[x - bpp]) & 0xFF
+			elif filter == pngfmt.FILTER_UP:               row[x] = (row[x] + prev[x]) & 0xFF
+		rows.append(bytes(row))
+		prev = row
+	return (width, height, bitdepth, color_type), palette, rows
+
+
+class SyntheticROM:
+	"""A blank 1 MiB Red/Blue ROM image that tests poke data into before wrapping it in a `Memory`."""
+	def __init__(self, version: str = "ER"):
+		self.version = version
+		self.data    = bytearray(0x100000)
+		self.data[0x148] = 5 # 1 MiB
+		self.data[0x14A] = version[0] != "J" # destination code
+		self.wram    = bytearray(0x2000)
+		self.high    = bytearray(0x200)
+
+	def put(self, bank: int, addr: int, data: bytes):
+		off = addr if addr < 0x4000 else bank*0x4000 + addr - 0x4000
+		self.data[off:off + len(data)] = data
+
+	def put_tileset(self, n: int, blocks: bytes, gfx: bytes, bank: int = 0x20, addr: int = 0x4000):
+		"""Point tileset `n`'s header at `blocks` and `gfx`, stored back to back at `bank:addr`."""
+		header = self.memory().location("tilesets")
+		self.put(header[0], header[1] + n*12, bytes((bank, addr & 0xFF, addr >> 8, (addr + len(blocks)) & 0xFF,
+		                                             (addr + len(blocks)) >> 8)))
+		self.put(bank, addr, blocks)
+		self.put(bank, addr + len(blocks), gfx)
+
+	def put_map(self, n: int, tileset: int, width: int, height: int, block_addr: int, warpdests=(),
+	            bank: int = 0x21, addr: int = 0x5000):
+		"""
+		Store a header for map `n` at `bank:addr` with no connections, warps, signs or actors, followed by
+		its objects and its `(block_addr, x, y)` warp destinations.
+		"""
+		mem = self.memory()
+		table_bank, table = mem.location("map_banks")
+		self.put(table_bank, table + n, bytes((bank,)))
+		table_bank, table = mem.location("map_headers")
+		self.put(table_bank, table + n*2, struct.pack("<H", addr))
+
+		header  = bytes((tileset, height, width)) + struct.pack("<H", block_addr) + bytes(5) + struct.pack("<H", addr + 12)
+		objects = bytes((0, len(warpdests))) + bytes(4*len(warpdests)) + bytes(2)
+		objects += b"".join(struct.pack("<HBB", dest, y, x) for dest, x, y in warpdests)
+		self.put(bank, addr, header + objects)
+
+	def memory(self, ram: bool = False, locations: dict = None) -> Memory:
+		"""
+		Wrap the image in a `Memory`, with WRAM and HRAM/IO (`self.wram`, `self.high`) mapped if `ram` is true.
+		`locations` adds ROM locations to (or overrides them in) the version's own.
+		"""
+		if locations is not None:
+			locations = ({**g1locations.rom_locations[self.version], **locations}, g1locations.ram_locations[self.version])
+		if not ram: return Memory(rom=bytes(self.data), version=self.version, locations=locations)
+		return Memory(rom=bytes(self.data), wram=bytes(self.wram), high=bytes(self.high), version=self.version,
+		              locations=locations)
+
+@pytest.fixture
+def synthetic_rom():
+	return SyntheticROM()
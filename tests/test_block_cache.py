@@ -0,0 +1,57 @@
+# test_block_cache.py
+import random
+import struct
+
+from g1utils import g1gfx
+
+def _put_tileset_and_sprites(rom):
+	rng = random.Random(15)
+	rom.put_tileset(0x30, rng.randbytes(0x1000), rng.randbytes(0x600))
+	bank, addr = rom.memory().location("sprite_gfx")
+	# Sprites 1-3C each get their own walking frames in bank 0x22.
+	rom.put(0x22, 0x4000, rng.randbytes(0x4000))
+	for n in range(1, 0x3D):
+		rom.put(bank, addr + (n - 1)*4, struct.pack("<HBB", 0x4000 + n*0x100, 0xC0, 0x22))
+
+def _ref_block(gfx, blocktiles, block):
+	pixels = [[0]*32 for _ in range(32)]
+	for i, tile in enumerate(blocktiles[block*16:(block + 1)*16]):
+		for y in range(8):
+			lo, hi = gfx[tile*16 + y*2], gfx[tile*16 + y*2 + 1]
+			for x in range(8):
+				pixels[i // 4 * 8 + y][i % 4 * 8 + x] = (lo >> (7 - x) & 1) | (hi >> (7 - x) & 1) << 1
+	return pixels
+
+def test_block_pixels_match_scalar(synthetic_rom):
+	_put_tileset_and_sprites(synthetic_rom)
+	mem = synthetic_rom.memory()
+	for glitch, spriteset in ((False, None), (True, b"\x01\x02\x03")):
+		gfx    = mem.get_tileset_gfx(0x30, glitch, spriteset)
+		blocks = mem.get_tileset_block_data(0x30, glitch)
+		pixels = mem.get_tileset_block_pixels(0x30, glitch, spriteset)
+		assert not pixels.flags.writeable
+		for block in (0, 1, 37, 255):
+			assert pixels[block].tolist() == _ref_block(gfx, blocks, block), (glitch, block)
+
+def test_block_pixels_shared_by_vram(synthetic_rom):
+	_put_tileset_and_sprites(synthetic_rom)
+	mem    = synthetic_rom.memory()
+	pixels = mem.get_tileset_block_pixels(0x30, True, b"\x01\x02")
+	assert mem.get_tileset_block_pixels(0x30, True, b"\x01\x02") is pixels
+	# Sprite 40 has no walking frames, so it leaves VRAM (and the render) unchanged.
+	assert mem.get_tileset_block_pixels(0x30, True, b"\x01\x02\x40") is pixels
+	assert mem.get_tileset_block_pixels(0x30, True, b"\x01\x03") is not pixels
+
+def test_block_pixels_lru(synthetic_rom):
+	_put_tileset_and_sprites(synthetic_rom)
+	mem = synthetic_rom.memory()
+	render = lambda spriteset: mem.get_tileset_block_pixels(0x30, True, spriteset)
+	a, b = render(b"\x01\x02"), render(b"\x01\x03")
+	assert render(b"\x01\x02") is a # now the most recently used
+	# Spritesets with different walking frames, and so different VRAM
+	others = [bytes((1, s)) for s in range(4, 0x3D)] + [bytes((1, 4, s)) for s in range(5, 0x3D)]
+	for spriteset in others[:g1gfx.BLOCK_CACHE_SIZE - 1]:
+		render(spriteset)
+	assert render(b"\x01\x02") is a
+	b2 = render(b"\x01\x03") # least recently used, so it was dropped
+	assert b2 is not b and (b2 == b).all()
@@ -0,0 +1,171 @@
+# test_decompress.py
+import random
+
+import pytest
+
+from g1utils import g1gfx
+
+
+#== Reference decompressor =================================================================================
+
+# The original generator-based decompressor and scalar bitplane interleave, which share no code
+# with the decompress_gfx they're checked against.
+
+def _ref_bitstream(data):
+	for b in data:
+		for shift in range(7, -1, -1):
+			yield (b >> shift) & 1
+
+def _ref_decompress_gfx(data, twidth, theight, bitflip, truesize=False):
+	data = iter(data)
+	dims = next(data)
+	width, height = (dims >> 4) or 256, (dims & 0xF) or 256
+
+	bits = _ref_bitstream(data)
+
+	bufsize = max(width*height, twidth*theight) * 8
+	if truesize:
+		buf1, buf2 = bytearray(bufsize), bytearray(bufsize)
+		off1, off2 = 0, 0
+	else:
+		buf = buf1 = buf2 = bytearray(392*2 + max(392, bufsize))
+		off1, off2        = 392, 392*2
+
+	if next(bits) == 1:
+		sbuf1, soff1 = buf2, off2
+		sbuf2, soff2 = buf1, off1
+	else:
+		sbuf1, soff1 = buf1, off1
+		sbuf2, soff2 = buf2, off2
+
+	_ref_decompress_bitplane(bits, sbuf1, soff1, width, height)
+
+	mode = next(bits)
+	if mode == 1: mode += next(bits)
+
+	_ref_decompress_bitplane(bits, sbuf2, soff2, width, height)
+
+	if mode != 1:
+		_ref_delta_decode_bitplane(sbuf2, soff2, width, height)
+	_ref_delta_decode_bitplane(sbuf1, soff1, width, height)
+
+	if mode != 0: # xor buffer 2 with buffer 1
+		for i in range(bufsize):
+			sbuf2[soff2+i] ^= sbuf1[soff1+i]
+
+	if not truesize:
+		# buffer A hasn't been used yet so we don't need to clear it
+		_ref_center_bitplane(buf, 392,   0,   twidth, theight)
+		buf[392:392*2] = bytes(392) # clear buffer B
+		_ref_center_bitplane(buf, 392*2, 392, twidth, theight)
+		return 56, 56, _ref_sprite_bitmap(buf, buf, 392, 7, 7, bitflip)
+	else:
+		return width*8, height*8, _ref_sprite_bitmap(buf1, buf2, 0, width, height, bitflip)
+
+def _ref_parse_rle_packet(bits):
+	n = 1
+	while next(bits) != 0:
+		n += 1
+	l = 1 << n; v = 0
+	while n > 0:
+		n -= 1; v = (v << 1) | next(bits)
+	return l + v - 1
+
+def _ref_decompress_bitplane(bits, buf, off, width, height):
+	width *= 4; height *= 8
+	px, by = 0, 0
+	tx, sx = off, 6
+
+	if next(bits) == 0:
+		by += _ref_parse_rle_packet(bits)
+
+	while True:
+		# data packet
+		while True:
+			if by >= height:
+				px, by = px + (by // height), by % height
+				if px >= width: return
+				tx = (px >> 2)*height + off
+				sx = (~px & 3) * 2
+			p = (next(bits) << 1) | next(bits)
+			if p == 0: break
+			buf[tx + by] |= p << sx
+			by += 1
+
+		by += _ref_parse_rle_packet(bits)
+
+def _ref_delta_decode_bitplane(buf, off, width, height):
+	height *= 8
+	y, xend = 0, off + width*height
+	while y < height:
+		x, c = off + y, 0
+		while x < xend:
+			b = buf[x]
+			b = b^(b>>1)^(b>>2)^(b>>3)^(b>>4)^(b>>5)^(b>>6)^(b>>7) ^ c
+			c = ((~(b & 1) + 1) & 0xFF)
+			buf[x] = b
+			x += height
+		y += 1
+
+def _ref_center_bitplane(buf, srcoff, dstoff, width, height):
+	dstoff += ((7*((8 - width) >> 1) + (7 - height)) * 8) & 0xFF
+	height *= 8
+	for x in range(width):
+		for y in range(height):
+			buf[dstoff + x*56 + y] = buf[srcoff + x*height + y]
+
+def _ref_sprite_bitmap(buf1, buf2, off2, twidth, theight, bitflip):
+	bwidth, bheight = twidth*2, theight*8
+	for y in range(bheight):
+		row, bx = bytearray(bwidth), y
+		for px in range(0, bwidth, 2):
+			b1, b2 = buf1[bx] ^ bitflip, buf2[off2+bx] ^ bitflip
+			# interleave the bitplanes (aaaaaaaa bbbbbbbb -> abababab abababab)
+			b1=(b1|b1<<4) & 0x0F0F; b1=(b1|b1<<2) & 0x3333; b1=(b1|b1<<1) & 0x5555
+			b2=(b2|b2<<4) & 0x0F0F; b2=(b2|b2<<2) & 0x3333; b2=(b2|b2<<1) & 0x5555
+			bits = b1 | (b2 << 1)
+			row[px], row[px+1] = bits >> 8, bits & 0xFF
+			bx += bheight
+		yield bytes(row)
+
+
+#== Tests ==================================================================================================
+
+def _random_sprite_data(rng, width, height):
+	# Any bit sequence is a valid compressed sprite, so random bytes make good fuzz data
+	# as long as there's enough of it for the decompressor to finish.
+	return bytes(((width << 4) | height,)) + rng.randbytes(4096)
+
+@pytest.mark.parametrize("truesize", (False, True))
+def test_decompress_gfx_matches_reference(truesize):
+	rng = random.Random(1)
+	for _ in range(64):
+		twidth, theight = rng.randint(1, 7), rng.randint(1, 7)
+		width,  height  = rng.randint(1, 7), rng.randint(1, 7)
+		data = _random_sprite_data(rng, width, height)
+
+		w, h, rows       = _ref_decompress_gfx(data, twidth, theight, 0xFF, truesize)
+		expected         = (w, h, [bytes(row) for row in rows])
+		w, h, rows, size = g1gfx.decompress_gfx(data, twidth, theight, 0xFF, truesize)
+		assert (w, h, [bytes(row) for row in rows]) == expected
+		assert 0 < size <= len(data)
+
+		# The compressed data ends where decompress_gfx said it does.
+		w, h, rows, _ = g1gfx.decompress_gfx(data[:size], twidth, theight, 0xFF, truesize)
+		assert (w, h, [bytes(row) for row in rows]) == expected
+
+def test_decompress_gfx_truncated():
+	data = _random_sprite_data(random.Random(2), 5, 5)
+	size = g1gfx.decompress_gfx(data, 5, 5, 0xFF)[3]
+	with pytest.raises(IndexError):
+		g1gfx.decompress_gfx(data[:size - 1], 5, 5, 0xFF)
+
+def test_compressed_bitmap_matches_reference(synthetic_rom):
+	rng  = random.Random(3)
+	data = _random_sprite_data(rng, 7, 7)
+	synthetic_rom.put(0x12, 0x4000, data[:0x4000])
+	mem = synthetic_rom.memory()
+
+	w, h, rows    = _ref_decompress_gfx(data, 7, 7, 0xFF)
+	w2, h2, rows2 = mem.get_compressed_bitmap(0x12, 0x4000, 7, 7, None)[:3]
+	assert (w2, h2, list(map(bytes, rows2))) == (w, h, list(map(bytes, rows)))
@@ -0,0 +1,41 @@
+# test_dex.py
+import struct
+
+def _put_dex_entries(rom, mem, entries):
+	bank, table = mem.location("dex_entries")
+	addr = 0x7000
+	for n, data in entries.items():
+		rom.put(bank, table + (n - 1)*2, struct.pack("<H", addr))
+		rom.put(bank, addr, data)
+		addr += len(data)
+
+def test_all_dex_entries_share_printed_string_ends(synthetic_rom):
+	mem = synthetic_rom.memory()
+	# Both categories end in a control character, so both entries continue from char57_script.
+	_put_dex_entries(synthetic_rom, mem, {
+		1: b"\x80\x81\x57",
+		2: b"\x82\x57",
+		3: b"\x83\x84\x50" + bytes((5, 3)) + struct.pack("<H", 1234) + b"\x00\x85\x5F\x50",
+	})
+	# Mon 4 points to mon 1's entry.
+	bank, table = mem.location("dex_entries")
+	synthetic_rom.put(bank, table + 3*2, struct.pack("<H", 0x7000))
+	script = mem.location("char57_script")
+	synthetic_rom.put(0, script, bytes((2, 7)) + struct.pack("<H", 405) + b"\x00\x86\x5F\x50")
+	mem = synthetic_rom.memory()
+
+	entries = mem.get_all_dex_entries(range(1, 5), prev_sfx=())
+	assert entries[4] is entries[1]
+	assert list(entries[1].mons) == [1, 4]
+	assert entries[1] is not entries[2]
+	assert (entries[1].category, entries[2].category) == ("AB", "C")
+	for n in (1, 2):
+		assert (entries[n].height, entries[n].weight, entries[n].desc_addr) == ((2, 7), 405, script + 4)
+	# The shared rest of the entry is only decoded once.
+	assert entries[2].description is entries[1].description
+	assert (entries[3].category, entries[3].height, entries[3].weight) == ("DE", (5, 3), 1234)
+
+	for n in range(1, 5):
+		single = mem.get_mon_dex_entry(n, prev_sfx=())
+		for key in ("category", "height", "weight", "desc_addr", "description", "dex_addr"):
+			assert getattr(single, key) == getattr(entries[n], key), (n, key)
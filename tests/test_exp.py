@@ -0,0 +1,54 @@
+# test_exp.py
+import random
+
+# The six real growth rates as the game stores them: a/b in one byte, c as sign and magnitude, d, e.
+_GROWTH_RATES = bytes((
+	0x11, 0x00, 0x00, 0x00, # medium fast:   x^3
+	0x34, 0x0A, 0x00, 0x1E, # slightly fast: (3/4)x^3 + 10x^2 - 30
+	0x34, 0x14, 0x00, 0x46, # slightly slow: (3/4)x^3 + 20x^2 - 70
+	0x65, 0x8F, 0x64, 0x8C, # medium slow:   (6/5)x^3 - 15x^2 + 100x - 140
+	0x45, 0x00, 0x00, 0x00, # fast:          (4/5)x^3
+	0x54, 0x00, 0x00, 0x00, # slow:          (5/4)x^3
+))
+
+def _scalar_exp(formula, level):
+	# One level at a time, like the game: each term is a 24-bit result.
+	ab, c, d, e = formula
+	a, b = ab >> 4, ab & 0xF
+	if b == 0: return -1
+	cube = level**3 * a // b & 0xFFFFFF
+	sq   = (c & 0x7F) * level**2 & 0xFFFFFF
+	if c & 0x80: cube -= sq
+	else:        cube += sq
+	return (cube + d*level - e) & 0xFFFFFF
+
+def _put_formulas(rom):
+	data = _GROWTH_RATES + random.Random(8).randbytes(58*4)
+	rom.put(*rom.memory().location("exp_formulas"), data)
+	return data
+
+def test_exp_table_matches_scalar(synthetic_rom):
+	data  = _put_formulas(synthetic_rom)
+	table = synthetic_rom.memory().get_exp_table()
+	assert table.shape == (64, 256)
+	assert not table.flags.writeable
+	for n in range(64):
+		formula = data[n*4:n*4 + 4]
+		assert list(table[n]) == [_scalar_exp(formula, level) for level in range(256)], n
+
+def test_exp_table_real_groups(synthetic_rom):
+	_put_formulas(synthetic_rom)
+	table = synthetic_rom.memory().get_exp_table()
+	assert [int(table[n, 100]) for n in range(6)] == [1000000, 849970, 949930, 1059860, 800000, 1250000]
+	assert table[3, 1] == 0x1000000 - 54 # medium slow underflows at level 1
+
+def test_exp_table_drops(synthetic_rom):
+	data  = _put_formulas(synthetic_rom)
+	drops = synthetic_rom.memory().find_exp_table_drops()
+	expected = {}
+	for n in range(64):
+		exp    = [_scalar_exp(data[n*4:n*4 + 4], level) for level in range(256)]
+		levels = bytearray(level for level in range(2, 256) if exp[level] < exp[level - 1])
+		if levels: expected[n] = levels
+	assert 3 in expected # medium slow drops from level 1 to 2
+	assert drops == expected
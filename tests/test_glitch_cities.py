@@ -0,0 +1,48 @@
+# test_glitch_cities.py
+import random
+
+import g1const
+
+def _entries(cities):
+	return [(city.entries, city.palette_id, city.spriteset) for city in cities]
+
+def test_glitch_cities_split_by_palette(synthetic_rom):
+	# Every map on a blank ROM displaces to the same blocks, but maps 0 and 1 have different palettes.
+	mem    = synthetic_rom.memory()
+	cities = mem.find_all_glitch_cities(maps=(0, 1, 12, 13), warps=(0,), processes=1)
+	assert [city.entries for city in cities] == [[(0, 0)], [(1, 0)], [(12, 0), (13, 0)]]
+	assert [city.palette_id for city in cities] == [g1const.map_palette_id(n) for n in (0, 1, 12)]
+
+def test_glitch_cities_split_by_spriteset(synthetic_rom):
+	# Maps 0x25 and 0x26 share a palette, but a different set of sprites is loaded in each.
+	synthetic_rom.put_map(0x25, 0, 4, 4, 0x4000, [(0x4000, 2, 2)], addr=0x5000)
+	synthetic_rom.put_map(0x26, 0, 4, 4, 0x4000, [(0x4000, 2, 2)], addr=0x5100)
+	mem = synthetic_rom.memory()
+	assert g1const.map_palette_id(0x25) == g1const.map_palette_id(0x26)
+
+	cities = mem.find_all_glitch_cities(maps=(0x25, 0x26), warps=(0,), processes=1)
+	assert len(cities) == 1 # no actors in either map, so the same sprites are loaded
+
+	# Give map 0x26 an actor, so it loads that actor's sprite as well.
+	objects = bytes((0, 1, 0, 0, 0, 0, 0, 1, 0x05, 4, 4, 0xFF, 0, 0)) + bytes((0x00, 0x40, 2, 2)) # warpdest $4000
+	synthetic_rom.put(0x21, 0x5100 + 12, objects)
+	cities = synthetic_rom.memory().find_all_glitch_cities(maps=(0x25, 0x26), warps=(0,), processes=1)
+	assert [city.entries for city in cities] == [[(0x25, 0)], [(0x26, 0)]]
+	assert cities[0].spriteset != cities[1].spriteset
+
+def test_glitch_city_workers_get_ram(synthetic_rom):
+	# Maps 12-15 share a palette and spriteset, and their warp destinations point to different parts of WRAM,
+	# so they're only told apart by the RAM contents.
+	maps = range(12, 16)
+	for i, n in enumerate(maps):
+		synthetic_rom.put_map(n, 0, 4, 4, 0x4000, [(0xC100 + 0x200*i, 2, 2)], addr=0x5000 + 0x40*i)
+	synthetic_rom.wram[:] = random.Random(10).randbytes(0x2000)
+	mem = synthetic_rom.memory(ram=True)
+
+	serial   = mem.find_all_glitch_cities(maps=maps, warps=(0,), processes=1)
+	parallel = mem.find_all_glitch_cities(maps=maps, warps=(0,), processes=2)
+	assert len(serial) == 4
+	assert _entries(parallel) == _entries(serial)
+
+	without_ram = synthetic_rom.memory().find_all_glitch_cities(maps=maps, warps=(0,), processes=1)
+	assert [city.entries for city in without_ram] == [[(n, 0) for n in maps]]
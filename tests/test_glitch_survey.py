@@ -0,0 +1,31 @@
+# test_glitch_survey.py
+import random
+
+import g1utils
+
+def _check_survey(mem):
+	dex_nums = mem.find_all_glitchmon_dex_nums()
+	expected = {
+		"dex_nums":        dex_nums,
+		"unused_dex_nums": mem.find_all_unused_glitch_dex_nums(dex_nums),
+		"moves":           mem.find_all_learnable_glitch_moves(dex_nums),
+		"types":           mem.find_all_used_glitch_types(dex_nums),
+		"exp_groups":      mem.find_all_used_glitch_exp_groups(dex_nums),
+		"palette_ids":     mem.find_all_used_glitchmon_palette_ids(dex_nums),
+		"tilesets":        mem.find_all_used_glitch_tilesets()
+	}
+	survey = g1utils.GlitchSurvey(type(mem)(mem, version=mem.version))
+	for key, ids in expected.items():
+		assert getattr(survey, key) == ids, key
+
+def test_glitch_survey_random_tables(synthetic_rom):
+	# Fill the tables glitch IDs are looked up in with noise so every kind of glitch ID turns up.
+	mem = synthetic_rom.memory()
+	rng = random.Random(6)
+	for name, size in (("dex_nums", 256), ("base_stats", 256*28), ("learnsets_evos", 512 + 0x800)):
+		bank, addr = mem.location(name)
+		synthetic_rom.put(bank, addr, rng.randbytes(min(size, 0x8000 - addr)))
+	mem = synthetic_rom.memory()
+	survey = g1utils.GlitchSurvey(mem)
+	assert survey.dex_nums and survey.types
+	_check_survey(mem)
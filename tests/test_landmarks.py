@@ -0,0 +1,18 @@
+# test_landmarks.py
+import struct
+
+def test_all_town_map_landmarks(synthetic_rom):
+	mem  = synthetic_rom.memory()
+	bank, indoor = mem.location("indoor_map_names")
+	outdoor = indoor - 0x25*3
+	# Map 0's name is in ROM, map 1's points into WRAM (outside a ROM-only image), and map 2 shares map 0's.
+	synthetic_rom.put(bank, outdoor, b"\x12" + struct.pack("<H", 0x7F00) + b"\x34" + struct.pack("<H", 0xD9BB)
+	                                  + b"\x56" + struct.pack("<H", 0x7F00))
+	synthetic_rom.put(bank, 0x7F00, b"\x8F\x80\x8B\x8B\x84\x93\x50") # PALLET
+	landmarks = synthetic_rom.memory().get_all_town_map_landmarks()
+
+	assert len(landmarks) == 256
+	assert landmarks[0] == (1, 2, "PALLET")
+	assert landmarks[1] is None
+	assert landmarks[2] == (5, 6, "PALLET")
+	assert landmarks[3] == (0, 0, synthetic_rom.memory().get_town_map_landmark(3)[2])
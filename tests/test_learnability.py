@@ -0,0 +1,39 @@
+# test_learnability.py
+import struct
+
+import pytest
+
+BULBASAUR = 0x99
+
+def _put_learnability_data(rom, mem):
+	# Bulbasaur (dex #1) starts with Tackle and Growl, can learn Toxic (TM06), and learns Leech Seed at 7.
+	bank, addr = mem.location("dex_nums")
+	rom.put(bank, addr + BULBASAUR - 1, bytes((1,)))
+	rom.put(bank, addr + 255, bytes((1,))) # mon 0 is entry 255
+
+	bank, addr = mem.location("base_stats")
+	rom.put(bank, addr + 15, bytes((33, 45, 0, 0)))
+	rom.put(bank, addr + 20, bytes((1 << 5,)))
+
+	bank, addr = mem.location("learnsets_evos")
+	rom.put(bank, addr + (BULBASAUR - 1)*2, struct.pack("<H", addr + 512))
+	rom.put(bank, addr + 512, bytes((0, 7, 73, 0)))
+
+def test_learnability_matrices(synthetic_rom):
+	_put_learnability_data(synthetic_rom, synthetic_rom.memory())
+	mem = synthetic_rom.memory()
+
+	dex_matrix = mem.get_dex_learnability_matrix()
+	assert dex_matrix[1, [33, 45, 92]].all()
+	assert not dex_matrix[1, [5, 22, 73]].any()
+
+	matrix = mem.get_learnability_matrix()
+	assert matrix[BULBASAUR, [33, 45, 92, 73]].all()
+	assert not matrix[BULBASAUR, [5, 22]].any()
+	assert (matrix[0] == dex_matrix[1]).all()
+	assert mem.can_mon_learn_move(BULBASAUR, 73) and not mem.can_dex_mon_learn_move(1, 73)
+	assert list(mem.find_all_move_learners(73)) == [BULBASAUR]
+
+	for m in (dex_matrix, matrix):
+		with pytest.raises(ValueError):
+			m[0, 0] = True
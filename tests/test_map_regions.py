@@ -0,0 +1,68 @@
+# test_map_regions.py
+import random
+
+import numpy as np
+import pytest
+
+from g1utils import Info, AddressError, g1gfx
+
+def _put_random_tileset(rom, rng):
+	rom.put_tileset(0, bytes(rng.randrange(0x60) for _ in range(128*16)), rng.randbytes(0x600))
+
+def _expected_region(mem, info, x, y, width, height, scale=1):
+	# Looks up every pixel's block one byte at a time, wrapping block addresses to 16 bits like the game does.
+	blocks = g1gfx._map_block_pixels(mem, 0, info, True)
+	out = np.zeros((-(-height // scale), -(-width // scale)), np.uint8)
+	for i, py in enumerate(range(y, y + height, scale)):
+		for j, px in enumerate(range(x, x + width, scale)):
+			if not (0 <= py < info.height*32 and 0 <= px < info.width*32): continue
+			addr = (info.block_addr + py//32 * info.block_step + px//32) & 0xFFFF
+			try: block = mem.read8(info.bank, addr)
+			except AddressError: continue
+			out[i, j] = blocks[block, py % 32, px % 32]
+	return out
+
+def _rom_map(rom, rng):
+	_put_random_tileset(rom, rng)
+	rom.put(0x21, 0x6000, bytes(rng.randrange(128) for _ in range(20*18)))
+	return Info(bank=0x21, tileset=0, width=20, height=18, block_addr=0x6000, block_step=20)
+
+def _unbound_city(rom, rng):
+	# An unbound glitch city whose block rows run from WRAM through HRAM and wrap around to $0000.
+	_put_random_tileset(rom, rng)
+	rom.wram[:] = rng.randbytes(0x2000)
+	rom.high[:] = rng.randbytes(0x200)
+	return Info(bank=0x21, tileset=0, width=132, height=132, block_addr=0xE033, block_step=181)
+
+@pytest.mark.parametrize("x, y, width, height, scale", (
+	(0, 0, 640, 576, 1), (37, 5, 100, 61, 1), (-40, 500, 200, 200, 1), (3, 1, 640, 576, 3)))
+def test_region_matches_map(synthetic_rom, x, y, width, height, scale):
+	info = _rom_map(synthetic_rom, random.Random(7))
+	mem  = synthetic_rom.memory()
+	region = mem.get_map_region_pixels(0, info, x, y, width, height, scale)
+	assert (region == _expected_region(mem, info, x, y, width, height, scale)).all()
+	if (x, y, scale) == (0, 0, 1):
+		assert (region == g1gfx._map_pixels(mem, 0, info, True)).all()
+
+def test_region_wraps_block_addresses(synthetic_rom):
+	info = _unbound_city(synthetic_rom, random.Random(8))
+	mem  = synthetic_rom.memory(ram=True)
+	# Block row 125 starts at $E033 + 125*181 = $13998, which wraps around to $3998.
+	region = mem.get_map_region_pixels(0, info, 0, 4000, 64, 64)
+	assert (region == _expected_region(mem, info, 0, 4000, 64, 64)).all()
+	assert region.any()
+
+def test_map_tiles_of_unbound_city(synthetic_rom):
+	info = _unbound_city(synthetic_rom, random.Random(9))
+	mem  = synthetic_rom.memory(ram=True)
+	max_zoom = g1gfx.get_map_max_zoom(info)
+	assert max_zoom == 5 # 132 blocks = 4224 pixels fit in 256 << 5
+
+	zoom0 = list(mem.get_map_tiles(0, info, zooms=[0]))
+	assert [(zoom, tx, ty) for zoom, tx, ty, _ in zoom0] == [(0, 0, 0)]
+	assert (zoom0[0][3] == _expected_region(mem, info, 0, 0, 8192, 8192, 32)).all()
+
+	# The bottom-right full-size tile covers rows that wrap around past $FFFF.
+	tiles = {(tx, ty): pixels for _, tx, ty, pixels in mem.get_map_tiles(0, info, zooms=[max_zoom])}
+	assert len(tiles) == 17*17
+	assert (tiles[16, 16] == _expected_region(mem, info, 4096, 4096, 256, 256)).all()
@@ -0,0 +1,70 @@
+# test_map_render.py
+import random
+import struct
+
+import numpy as np
+import pytest
+
+from g1utils import AddressError, g1gfx
+
+def _ref_map_pixels(mem, n, glitch):
+	# Look up every pixel through its block, tile and bitplane bytes one at a time.
+	info = mem.get_map_drawable_info(n)
+	spriteset = mem.get_map_spriteset_at(n, 0, 0, allow_partial=True) if glitch else None
+	gfx   = mem.get_tileset_gfx(info.tileset, glitch, spriteset)
+	tiles = mem.get_tileset_block_data(info.tileset, glitch)
+	tiles += bytes(0x1000 - len(tiles))
+	rows  = [mem.read_bytes(info.bank, (info.block_addr + y*info.block_step) & 0xFFFF, info.width)
+	         for y in range(info.height)]
+	pixels = []
+	for py in range(info.height*32):
+		row = []
+		for px in range(info.width*32):
+			block = rows[py // 32][px // 32]
+			tile  = tiles[block*16 + (py % 32 // 8)*4 + px % 32 // 8]
+			off   = tile*16 + (py % 8)*2
+			lo, hi = (gfx[off], gfx[off + 1]) if off + 1 < len(gfx) else (0, 0)
+			bit   = 7 - px % 8
+			row.append((lo >> bit & 1) | (hi >> bit & 1) << 1)
+		pixels.append(row)
+	return np.array(pixels, np.uint8)
+
+def _ref_pack(row):
+	# Packed 2bpp with the colors flipped for a grayscale PNG, 4 pixels per byte.
+	return bytes((3^a) << 6 | (3^b) << 4 | (3^c) << 2 | (3^d) for a, b, c, d in zip(*[iter(row)]*4))
+
+def _put_maps(rom):
+	rng = random.Random(14)
+	mem = rom.memory()
+	hbank, haddr = mem.location("tilesets")
+	for i, n in enumerate((0, 1, 0x30)):
+		blocks = 0x4000 + i*0x1000
+		rom.put(hbank, haddr + n*12, bytes((0x20,)) + struct.pack("<HH", blocks, 0x7A00))
+		rom.put(0x20, blocks, bytes(rng.randint(0, 0x5F) for _ in range(0x1000)))
+	rom.put(0x20, 0x7A00, rng.randbytes(0x600))
+	rom.put(0x21, 0x6000, bytes(rng.choice((0, 1, 2, 3, 4, 5, 6, 7, rng.randint(0, 255))) for _ in range(0x2000)))
+	for n in range(24):
+		rom.put_map(n + 0x30, rng.choice((0, 1, 0x30)), rng.randint(1, 3), rng.randint(1, 3),
+		            rng.choice((rng.randint(0x6000, 0x7FF0), 0x7FFC)), addr=0x4000 + n*0x20)
+
+def test_map_render_matches_scalar(synthetic_rom):
+	_put_maps(synthetic_rom)
+	mem   = synthetic_rom.memory()
+	modes = mem.get_map_render_modes()
+	drawn = set()
+	for n in range(0x30, 0x48):
+		glitch = modes[n] == g1gfx.MAP_RENDER_GLITCH
+		try:
+			expected = _ref_map_pixels(mem, n, glitch)
+		except AddressError:
+			with pytest.raises(AddressError):
+				mem.get_map_pixels(n)
+			with pytest.raises(AddressError):
+				list(mem.get_map_bitmap(n)[2])
+			continue
+		drawn.add(glitch)
+		assert (mem.get_map_pixels(n) == expected).all(), n
+		w, h, rows, palette = mem.get_map_bitmap(n)
+		assert (w, h, palette) == (expected.shape[1], expected.shape[0], None)
+		assert list(rows) == [_ref_pack(row) for row in expected.tolist()], n
+	assert drawn == {False, True}
@@ -0,0 +1,52 @@
+# test_maps.py
+import pytest
+
+from g1utils import g1rom
+
+# The real warp tile table hasn't been located, so tests store their own in bank 3.
+_WARP_TILES = {"warp_tiles": ( 0x03, 0x7800 )}
+
+def _put_warp_tiles(rom, lists: dict, addr: int = 0x7800):
+	"""Store a warp tile pointer table at `03:addr` whose entries point at `lists[n]` or an empty list."""
+	data = bytearray()
+	ptrs = bytearray()
+	base = addr + 0x200
+	for n in range(0x100):
+		ptrs += (base + len(data)).to_bytes(2, "little")
+		data += bytes(lists.get(n, ())) + b"\xFF"
+	rom.put(0x03, addr, ptrs)
+	rom.put(0x03, base, data)
+
+def test_map_attributes_zero_size(synthetic_rom):
+	# A blank ROM's map headers all have a width and height of 0, which the game treats as 256.
+	_put_warp_tiles(synthetic_rom, {})
+	attrs = synthetic_rom.memory(locations=_WARP_TILES).get_map_attributes(0)
+	assert attrs.shape == (512, 512)
+
+def test_tile_info_needs_warp_tiles(synthetic_rom):
+	with pytest.raises(KeyError, match="warp tile table"):
+		synthetic_rom.memory().get_tileset_tile_info(0)
+
+def test_tile_attributes(synthetic_rom):
+	_put_warp_tiles(synthetic_rom, {0: (0x1B, 0x58)})
+	mem = synthetic_rom.memory(locations=_WARP_TILES)
+	hbank, haddr = mem.get_tileset_header_ptr(0)
+	# Walkable tiles at $3F00, counter tiles $18/$19/$1E, grass tile $52
+	synthetic_rom.put(hbank, haddr + 5, b"\x00\x3F\x18\x19\x1E\x52\x00")
+	synthetic_rom.put(None, 0x3F00, b"\x00\x10\x1B\xFF")
+	mem = synthetic_rom.memory(locations=_WARP_TILES)
+
+	info = mem.get_tileset_tile_info(0)
+	assert info.warp_tiles == {0x1B, 0x58}
+	assert info.walkable_tiles == {0x00, 0x10, 0x1B}
+
+	tiles = mem.get_tileset_tile_attributes(0)
+	for tile in range(256):
+		expected = (
+			(g1rom.TILE_WALKABLE if tile in info.walkable_tiles else 0) |
+			(g1rom.TILE_WARP     if tile in info.warp_tiles     else 0) |
+			(g1rom.TILE_COUNTER  if tile in info.counter_tiles  else 0) |
+			(g1rom.TILE_GRASS    if tile == info.grass_tile     else 0)
+		)
+		assert tiles[tile] == expected, hex(tile)
+	assert not tiles.flags.writeable
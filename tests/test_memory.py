@@ -0,0 +1,69 @@
+# test_memory.py
+import pytest
+
+import gbutils
+from g1utils import Memory
+
+def test_rom_image(synthetic_rom):
+	synthetic_rom.put(0x0E, 0x4000, b"\x12\x34")
+	mem   = synthetic_rom.memory()
+	image = mem.rom_image()
+	assert image == bytes(synthetic_rom.data)
+	assert Memory(rom=image, version=mem.version).read16(0x0E, 0x4000) == 0x3412
+
+def test_rom_image_without_rom():
+	with pytest.raises(ValueError):
+		gbutils.Memory(wram=bytes(0x2000)).rom_image()
+
+def test_images_rebuild_memory(synthetic_rom):
+	synthetic_rom.wram[0x100] = 0x42
+	mem    = synthetic_rom.memory(ram=True)
+	images = mem.images()
+	assert set(images) == {"rom", "wram", "high"}
+	copy = Memory(**images, version=mem.version)
+	assert copy.read8(None, 0xC100) == 0x42
+	assert copy.read_bytes(0x0E, 0x4000, 16) == mem.read_bytes(0x0E, 0x4000, 16)
+
+def test_read_bytes_partial_stops_at_unmapped(synthetic_rom):
+	# The read runs off the end of switchable ROM into VRAM, which isn't mapped.
+	synthetic_rom.put(0x0E, 0x7FF0, bytes(range(1, 17)))
+	mem = synthetic_rom.memory()
+	assert mem.read_bytes(0x0E, 0x7FF0, 0x20, allow_partial=True) == bytes(range(1, 17))
+	with pytest.raises(gbutils.AddressError):
+		mem.read_bytes(0x0E, 0x7FF0, 0x20)
+
+def test_read_default_without_bank(synthetic_rom):
+	mem = synthetic_rom.memory()
+	assert mem.read8(None, 0x4000, default=None) is None
+	assert mem.read16(None, 0x7FFF, default=None) is None
+	assert mem.read16(0x0E, 0x7FFF, default=None) is None # high byte is in unmapped VRAM
+	with pytest.raises(gbutils.AddressError):
+		mem.read8(None, 0x4000)
+	with pytest.raises(gbutils.AddressError):
+		mem.read16(None, 0x4000)
+
+def test_copy_keeps_title(synthetic_rom):
+	synthetic_rom.put(None, 0x134, b"POKEMON RED")
+	mem  = gbutils.Memory(rom=bytes(synthetic_rom.data))
+	copy = gbutils.Memory(mem)
+	assert (copy.title, copy.code) == (mem.title, mem.code)
+	assert copy.title == "POKEMON RED"
+
+def test_stream_next_bytes_across_chunks(synthetic_rom):
+	synthetic_rom.put(0x0E, 0x7FFC, b"\x01\x02\x03\x04")
+	vram = bytes(range(0x10, 0x20)) + bytes(0x1FF0)
+	mem  = gbutils.Memory(rom=bytes(synthetic_rom.data), vram=vram)
+	s = mem.stream(0x0E, 0x7FFC)
+	assert s.next_bytes(6) == b"\x01\x02\x03\x04\x10\x11"
+	assert s.addr == 0x8002
+	assert s.next8() == 0x12
+	assert s.next_bytes(2) == b"\x13\x14"
+
+def test_read_bytes_across_chunks(synthetic_rom):
+	synthetic_rom.put(0x0E, 0x7FFE, b"\x01\x02")
+	vram = b"\x10\x11" + bytes(0x1FFE)
+	mem  = gbutils.Memory(rom=bytes(synthetic_rom.data), vram=vram)
+	assert mem.read_bytes(0x0E, 0x7FFE, 4) == b"\x01\x02\x10\x11"
+	# From the end of WRAM into echo RAM, which mirrors $C000
+	mem = gbutils.Memory(rom=bytes(synthetic_rom.data), wram=b"\x21" + bytes(0x1FFE) + b"\x20")
+	assert mem.read_bytes(None, 0xDFFF, 2) == b"\x20\x21"
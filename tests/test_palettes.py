@@ -0,0 +1,18 @@
+# test_palettes.py
+import struct
+
+import g1const
+
+def test_map_palette_uses_map_palette_id(synthetic_rom):
+	# Give every SGB palette a distinct color 1 so the palette ID can be read back from the colors.
+	mem = synthetic_rom.memory()
+	bank, addr = mem.location("sgb_palettes")
+	for n in range(256):
+		synthetic_rom.put(bank, addr + n*8 + 2, struct.pack("<H", n & 31))
+	mem = synthetic_rom.memory()
+
+	for map in (0, 1, 0x25):
+		pal_id = g1const.map_palette_id(map)
+		palette = mem.get_map_palette("sgb", map)
+		assert palette == mem.get_palette("sgb", pal_id)
+		assert palette[1][0] >> 3 == pal_id & 31
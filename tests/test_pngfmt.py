@@ -0,0 +1,65 @@
+# test_pngfmt.py
+import io, random
+
+import pytest
+
+import pngfmt
+from conftest import read_png
+
+def test_up_filter_with_reused_row_buffer():
+	# Rows that are all views of one buffer the producer overwrites must still be filtered correctly.
+	expected = [bytes((y * 3 + x) & 0xFF for x in range(6)) for y in range(4)]
+	def rows():
+		buf = bytearray(6)
+		for row in expected:
+			buf[:] = row
+			yield memoryview(buf)
+
+	out = io.BytesIO()
+	pngfmt.write_png(out, 6, 4, rows(), greyscale=True, filter=pngfmt.FILTER_UP)
+	assert read_png(out.getvalue())[2] == expected
+
+_FILTERS = (pngfmt.FILTER_NONE, pngfmt.FILTER_SUB, pngfmt.FILTER_UP)
+_FORMATS = ( # bitdepth, greyscale, palette
+	(1, True,  None),
+	(2, True,  None),
+	(4, True,  None),
+	(8, True,  None),
+	(2, False, ((0, 0, 0), (85, 85, 85), (170, 170, 170), (255, 255, 255))),
+	(8, False, tuple((i, 255 - i, i // 2) for i in range(256))),
+	(8, False, None), # RGB
+)
+
+@pytest.mark.parametrize("filter", _FILTERS)
+@pytest.mark.parametrize("bitdepth, greyscale, palette", _FORMATS)
+def test_write_png_round_trip(filter, bitdepth, greyscale, palette):
+	width, height = 13, 7
+	channels = 3 if not greyscale and palette is None else 1
+	stride   = (width * channels * bitdepth + 7) // 8
+	rng      = random.Random(bitdepth * 10 + filter)
+	rows     = [rng.randbytes(stride) for _ in range(height)]
+
+	out = io.BytesIO()
+	pngfmt.write_png(out, width, height, iter(rows), bitdepth, greyscale, palette, filter=filter)
+	header, plte, decoded = read_png(out.getvalue())
+
+	color_type = 3 if palette is not None else 0 if greyscale else 2
+	assert header == (width, height, bitdepth, color_type)
+	assert plte == (b"".join(bytes(color) for color in palette) if palette is not None else None)
+	assert decoded == rows
+
+def test_write_png_splits_idat_chunks(tmp_path):
+	# Incompressible data bigger than IDAT_SIZE is written across several IDAT chunks.
+	width, height = 256, pngfmt.IDAT_SIZE // 256 * 2
+	rng  = random.Random(5)
+	rows = [rng.randbytes(width) for _ in range(height)]
+	path = str(tmp_path / "big.png")
+	pngfmt.write_png(path, width, height, rows, greyscale=True, level=pngfmt.PREVIEW_LEVEL)
+
+	with open(path, "rb") as f: data = f.read()
+	assert data.count(b"IDAT") > 1
+	assert read_png(data)[2] == rows
+
+def test_write_png_rejects_low_bitdepth_rgb():
+	with pytest.raises(ValueError):
+		pngfmt.write_png(io.BytesIO(), 1, 1, [b"\0"], bitdepth=4)
@@ -0,0 +1,56 @@
+# test_render_modes.py
+import random
+import struct
+
+from g1utils import AddressError, g1gfx
+
+def _ref_is_glitch(mem, n):
+	# Walk the map block by block, the way the renderer used to find out it needed glitch mode.
+	info    = mem.get_map_drawable_info(n)
+	bank, addr = mem.get_tileset_block_ptr(info.tileset)
+	blocks  = mem.read_bytes(bank, addr, mem.get_tileset_num_blocks(info.tileset)*16, allow_partial=True)
+	gfxlen  = len(mem.get_tileset_gfx(info.tileset))
+	for y in range(info.height):
+		try:
+			row = mem.read_bytes(info.bank, (info.block_addr + y*info.block_step) & 0xFFFF, info.width)
+		except AddressError:
+			break
+		for block in row:
+			if (block + 1)*16 > len(blocks): return True
+			if any((tile + 1)*16 > gfxlen for tile in blocks[block*16:(block + 1)*16]): return True
+	return False
+
+def _put_maps(rom):
+	rng = random.Random(13)
+	mem = rom.memory()
+	hbank, haddr = mem.location("tilesets")
+	# Tilesets 0-5 and 0x30, with graphics ending 8-96 tiles before the end of the bank.
+	for i, n in enumerate((0, 1, 2, 3, 4, 5, 0x30)):
+		blocks = 0x4000 + i*0x1000
+		gfx    = 0x8000 - rng.choice((8, 32, 96, 96))*16
+		rom.put(hbank, haddr + n*12, bytes((0x20,)) + struct.pack("<HH", blocks, gfx))
+		rom.put(0x20, blocks, bytes(rng.choice((rng.randint(0, 7), rng.randint(0, 255))) for _ in range(0x1000)))
+	# Block data: mostly low block IDs, which every tileset has.
+	rom.put(0x21, 0x6000, bytes(rng.choice((0, 1, 2, 3, 4, 5, 6, 7, 8, rng.randint(0, 255))) for _ in range(0x2000)))
+	for n in range(0xF0):
+		tileset = rng.choice((0, 1, 2, 3, 4, 5, 0x30))
+		width, height = rng.randint(1, 4), rng.randint(1, 4)
+		block_addr = rng.choice((rng.randint(0x6000, 0x7FF8), 0x7FFA, 0x8000))
+		rom.put_map(n, tileset, width, height, block_addr, addr=0x4000 + n*0x20)
+	# Maps F0-FF have headers in unmapped VRAM.
+	bank, table = mem.location("map_headers")
+	for n in range(0xF0, 0x100):
+		rom.put(bank, table + n*2, struct.pack("<H", 0x8000))
+
+def test_render_modes_match_block_walk(synthetic_rom):
+	_put_maps(synthetic_rom)
+	mem   = synthetic_rom.memory()
+	modes = mem.get_map_render_modes()
+	for n in range(256):
+		if n >= 0xF0:
+			assert modes[n] == g1gfx.MAP_RENDER_UNREADABLE, n
+			continue
+		glitch = _ref_is_glitch(mem, n)
+		assert g1gfx.is_glitch_map_data(mem, mem.get_map_drawable_info(n)) == glitch, n
+		assert modes[n] == (g1gfx.MAP_RENDER_GLITCH if glitch else g1gfx.MAP_RENDER_NORMAL), n
+	assert modes.count(g1gfx.MAP_RENDER_NORMAL) > 20 and modes.count(g1gfx.MAP_RENDER_GLITCH) > 20
@@ -0,0 +1,51 @@
+# test_sprite_atlas.py
+import json
+import random
+import struct
+
+from conftest import read_png
+from g1utils import g1gfx
+import g1dump
+
+def _put_trainer_sprites(rom, count):
+	# Random bytes are always valid compressed sprite data (see test_decompress.)
+	rng = random.Random(16)
+	mem = rom.memory()
+	bank = mem.location("trainer_gfx_bank")
+	table_bank, table = mem.location("trainer_gfx_pay")
+	sprites = {}
+	for n in range(1, count + 1):
+		addr = 0x4000 + n*0x200
+		data = bytes((rng.randint(1, 7) << 4 | rng.randint(1, 7),)) + rng.randbytes(0x1FF)
+		rom.put(table_bank, table + (n - 1)*5, struct.pack("<H", addr))
+		rom.put(bank, addr, data)
+		sprites[n] = data
+	# One more trainer whose sprite is in unmapped VRAM
+	rom.put(table_bank, table + count*5, struct.pack("<H", 0x8000))
+	return sprites
+
+def test_sprite_atlas_matches_sprites(synthetic_rom, tmp_path):
+	sprites = _put_trainer_sprites(synthetic_rom, 19)
+	mem = synthetic_rom.memory()
+	g1dump.export_sprite_atlas(mem, str(tmp_path / "atlas"), kinds="trainer", ids="1-20", columns=4, rows=2)
+
+	index = json.loads((tmp_path / "atlas.json").read_text())
+	assert index["sheets"] == ["atlas_0.png", "atlas_1.png", "atlas_2.png"]
+	assert [s["id"] for s in index["sprites"]] == list(range(1, 20)) # trainer 20 can't be read
+	sheets = [read_png((tmp_path / name).read_bytes()) for name in index["sheets"]]
+	assert [header for header, _, _ in sheets] == [(224, 112, 2, 3), (224, 112, 2, 3), (224, 56, 2, 3)]
+
+	palette = [f"#{r:02X}{g:02X}{b:02X}" for r, g, b in mem.get_palette("sgb", 0x10)]
+	for entry in index["sprites"]:
+		n    = entry["id"]
+		data = sprites[n]
+		width, height, rows, size = g1gfx.decompress_gfx(data, 7, 7, 0)
+		assert (entry["width"], entry["height"]) == (width, height) == (56, 56)
+		assert (entry["bank"], entry["addr"], entry["end"]) == (0x13, 0x4000 + n*0x200, 0x4000 + n*0x200 + size)
+		assert entry["paletteId"] == 0x10
+		assert entry["palettes"]["sgb"] == palette
+		i = n - 1
+		assert (entry["sheet"], entry["x"], entry["y"]) == (i // 8, i % 4 * 56, i % 8 // 4 * 56)
+		sheet = sheets[entry["sheet"]][2]
+		cell  = [row[entry["x"] // 4:entry["x"] // 4 + 14] for row in sheet[entry["y"]:entry["y"] + 56]]
+		assert cell == [bytes(row) for row in rows], n
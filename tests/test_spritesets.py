@@ -0,0 +1,97 @@
+# test_spritesets.py
+import random
+import struct
+
+import pytest
+
+from g1utils import AddressError
+
+#== Scalar reference =======================================================================================
+
+# The per-call lookups the spriteset tables replaced.
+
+def _ref_split_side(mem, n, x, y):
+	if n != 0xF8:
+		t, div, s1, s2 = mem.table_read_bytes("split_spritesets", 4, (n - 0xF1) & 0xFF)
+		return s1 if (x if t == 1 else y) < div else s2
+	elif x < 43:  return 0x01
+	elif x >= 62: return 0x0A
+	else:         return 0x0A if y < (13 if x < 55 else 8) else 0x01
+
+def _ref_spriteset(mem, n, x, y):
+	sprites = bytearray((1,))
+	if n < 0x25:
+		n = mem.table_read8("map_spritesets", n)
+		if n > 0xF0: n = _ref_split_side(mem, n, x, y)
+		sprites += mem.table_read_bytes("spritesets", 11, (n - 1) & 0xFF)
+	else:
+		sprites += mem.get_map_sprite_ids(n)
+	return bytes(sprites)
+
+def _ref_spriteset_vram(mem, spriteset):
+	vram = bytearray(0x1000)
+	for i, b in enumerate(mem.read_bytes(*mem.location("font"), 0x400)):
+		vram[0x800 + i*2] = vram[0x801 + i*2] = b
+	vram[0x600:0x800] = mem.read_bytes(*mem.location("font2"), 0x200)
+	vramoff = 0x800
+	for n in spriteset:
+		if n >= 0x3D: continue
+		bank, addr, length = mem.get_sprite_info(n)
+		data = mem.read_bytes(bank, addr + 0xC0, length, allow_partial=True)
+		vram[vramoff:vramoff + len(data)] = data
+		vramoff += 0xC0
+	return bytes(vram[0x600:0x1000])
+
+
+#== Tests ==================================================================================================
+
+def _put_spriteset_tables(rom):
+	rng = random.Random(12)
+	mem = rom.memory()
+	bank, addr = mem.location("map_spritesets")
+	rom.put(bank, addr, rng.randbytes(0x8000 - addr)) # every spriteset table through the end of the bank
+	rom.put(bank, addr, bytes(rng.choice((rng.randint(1, 0xF0), rng.randint(0xF1, 0xFF), 0xF8)) for _ in range(0x25)))
+	bank, addr = mem.location("split_spritesets")
+	rom.put(bank, addr, b"".join(bytes((rng.randint(1, 2), rng.randint(0, 255), rng.randint(1, 20), rng.randint(1, 20)))
+	                              for _ in range(15)))
+	# An indoor map with actors of each size, one sprite repeated.
+	rom.put_map(0x30, 0, 1, 1, 0x4000)
+	actors = bytes((
+		4, 1, 1, 0, 0, 0x01,       # text
+		5, 1, 1, 0, 0, 0x81, 9,    # item
+		4, 2, 2, 0, 0, 0x41, 1, 2, # trainer
+		9, 3, 3, 0, 0, 0x02,       # text
+	))
+	rom.put(0x21, 0x5000 + 12, bytes((0, 0, 0, 4)) + actors)
+
+def test_spriteset_at_matches_scalar(synthetic_rom):
+	_put_spriteset_tables(synthetic_rom)
+	mem    = synthetic_rom.memory()
+	coords = [(x, y) for x in (0, 7, 42, 43, 54, 55, 61, 62, 255) for y in (0, 7, 8, 12, 13, 100, 255)]
+	checked = 0
+	for n in range(256):
+		for x, y in (coords if n < 0x25 else coords[:1]):
+			try:
+				expected = _ref_spriteset(mem, n, x, y)
+			except AddressError:
+				with pytest.raises(AddressError):
+					mem.get_map_spriteset_at(n, x, y)
+				continue
+			assert mem.get_map_spriteset_at(n, x, y) == expected, (n, x, y)
+			checked += 1
+	assert checked > 0x25*len(coords) // 2
+	assert mem.get_map_spriteset_at(0x30, 0, 0) == b"\x01\x04\x05\x09"
+
+def test_split_spriteset_grid_matches_scalar(synthetic_rom):
+	_put_spriteset_tables(synthetic_rom)
+	mem = synthetic_rom.memory()
+	for n in (0xF1, 0xF8, 0xFF):
+		grid = mem.get_split_spriteset_grid(n)
+		assert all(grid[y*256 + x] == _ref_split_side(mem, n, x, y) for y in range(0, 256, 3) for x in range(256)), n
+
+def test_spriteset_vram_matches_scalar(synthetic_rom):
+	_put_spriteset_tables(synthetic_rom)
+	mem = synthetic_rom.memory()
+	for spriteset in (b"\x01", b"\x01\x02\x03\x3D\x04", bytes(range(1, 12))):
+		assert mem.get_spriteset_vram(spriteset) == _ref_spriteset_vram(mem, spriteset)
+		assert mem.get_spriteset_vram(bytearray(spriteset)) is mem.get_spriteset_vram(spriteset)
@@ -0,0 +1,57 @@
+# test_tables.py
+import random
+
+import pytest
+
+from g1utils import AddressError, is_key_item
+
+# Neither table has been located yet, so tests store their own.
+_LOCATIONS = {"tm_prices": ( 0x01, 0x7F00 ), "buffer": 0xCF00}
+
+def _fill(rom, mem, location, size, rng):
+	bank, addr = mem.location_ptr(location)
+	rom.put(bank, addr, rng.randbytes(size))
+
+def _bcd(rng):
+	return bytes(rng.randint(0, 9) << 4 | rng.randint(0, 9) for _ in range(3))
+
+def test_move_table_matches_move_info(synthetic_rom):
+	_fill(synthetic_rom, synthetic_rom.memory(), "moves", 256*6, random.Random(9))
+	mem   = synthetic_rom.memory()
+	moves = mem.get_move_table()
+	for n in range(256):
+		info = mem.get_move_info(n)
+		for key in ("animation", "effect", "power", "type", "accuracy", "pp"):
+			assert getattr(moves, key)[n] == getattr(info, key), (n, key)
+			assert not getattr(moves, key).flags.writeable
+
+def test_type_name_table_matches_pointers(synthetic_rom):
+	_fill(synthetic_rom, synthetic_rom.memory(), "type_names", 128*2, random.Random(10))
+	mem   = synthetic_rom.memory()
+	table = mem.get_type_name_table()
+	for n in range(256):
+		assert (table.bank, table.addr[n]) == mem.get_type_name_ptr(n), n
+
+@pytest.mark.parametrize("located", (False, True))
+def test_item_table_matches_items(synthetic_rom, located):
+	rng = random.Random(11)
+	mem = synthetic_rom.memory()
+	bank, addr = mem.location("item_prices")
+	synthetic_rom.put(bank, addr, b"".join(_bcd(rng) for _ in range(256)))
+	_fill(synthetic_rom, mem, "key_items", 15, rng)
+	synthetic_rom.put(*_LOCATIONS["tm_prices"], bytes(rng.randint(0, 9) << 4 | rng.randint(0, 9) for _ in range(28)))
+	synthetic_rom.wram[0xF00:0xF20] = rng.randbytes(0x20)
+	mem   = synthetic_rom.memory(ram=located, locations=_LOCATIONS if located else None)
+	items = mem.get_item_table()
+
+	for n in range(256):
+		if n < 201 or located:
+			assert items.price[n] == mem.get_item_price(n), n
+		else:
+			assert items.price[n] == -1
+		try:
+			key = int(is_key_item(mem, n))
+		except (KeyError, AddressError): # the RAM buffer isn't available
+			key = -1
+		assert items.is_key[n] == key, n
+	assert (items.is_key == -1).any() != located
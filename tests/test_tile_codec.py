@@ -0,0 +1,53 @@
+# test_tile_codec.py
+import random
+
+import numpy as np
+import pytest
+
+from g1utils import g1gfx
+
+def _scalar_gfx_bitmap(gfx, width):
+	# The per-byte bit interleave the renderers used before the NumPy tile codec.
+	goff, glen   = 0, len(gfx)
+	pwidth, plen = width * 2, width * 16
+	buf = bytearray(plen)
+	while goff < glen:
+		px, poff = 0, 0
+		while px < pwidth:
+			while poff < plen:
+				b1, b2 = gfx[goff] ^ 0xFF, gfx[goff + 1] ^ 0xFF
+				b1=(b1|b1<<4) & 0x0F0F; b1=(b1|b1<<2) & 0x3333; b1=(b1|b1<<1) & 0x5555
+				b2=(b2|b2<<4) & 0x0F0F; b2=(b2|b2<<2) & 0x3333; b2=(b2|b2<<1) & 0x5555
+				bits = b1 | (b2 << 1)
+				buf[poff], buf[poff+1] = bits >> 8, bits & 0xFF
+				goff += 2
+				poff += pwidth
+			px  += 2
+			poff = px
+
+		y = 0
+		while y < plen:
+			yield bytes(buf[y:y+pwidth])
+			y += pwidth
+
+@pytest.mark.parametrize("ntiles, width", ((1, 1), (16, 4), (23, 16), (96, 16)))
+def test_gfx_bitmap_matches_scalar(ntiles, width):
+	gfx = random.Random(ntiles).randbytes(ntiles * 16)
+	# The scalar version only handles whole rows of tiles; the last row is padded with blank tiles.
+	padded = gfx + bytes(-ntiles % width * 16)
+	assert list(g1gfx._gfx_bitmap(gfx, width)) == list(_scalar_gfx_bitmap(padded, width))
+
+def test_2bpp_codec_round_trip():
+	rng    = np.random.default_rng(4)
+	pixels = rng.integers(0, 4, (24, 32), np.uint8)
+	for flip in (0, 3):
+		packed = g1gfx.encode_2bpp_rows(pixels, flip)
+		assert packed.shape == (24, 8)
+		unpacked = np.unpackbits(packed, axis=1).reshape(24, 32, 2)
+		assert ((unpacked[..., 0] << 1 | unpacked[..., 1]) ^ flip == pixels).all()
+
+	# Tile data is low bitplane then high bitplane for each row of each tile.
+	tiles = g1gfx.decode_2bpp_tiles(bytes((0b10000001, 0b11000000)) + bytes(14))
+	assert tiles.shape == (1, 8, 8)
+	assert list(tiles[0, 0]) == [3, 2, 0, 0, 0, 0, 0, 1]
+	assert not tiles[0, 1:].any()
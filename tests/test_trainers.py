@@ -0,0 +1,32 @@
+# test_trainers.py
+import struct
+
+def _put_trainer_teams(rom, mem, teams):
+	# Lay out each class's teams back to back after the pointer table, in class order.
+	bank, table = mem.location("trainer_teams")
+	addr = table + 512
+	for trainer, class_teams in enumerate(teams, 1):
+		rom.put(bank, table + (trainer - 1)*2, struct.pack("<H", addr))
+		data = b"".join(bytes((level, *mons, 0)) for level, mons in class_teams)
+		rom.put(bank, addr, data)
+		addr += len(data)
+	return addr
+
+def _teams_by_class(rows):
+	counts = {}
+	for i in range(0, len(rows), 4):
+		counts.setdefault(rows[i], set()).add(rows[i + 1])
+	return {trainer: len(teams) for trainer, teams in counts.items()}
+
+def test_all_trainer_teams_counts(synthetic_rom):
+	teams = [[(5, (1,))]] * 47
+	teams[0]  = [(11, (0x99, 0x99)), (14, (0x99,))] # class 1 has two teams
+	teams[46] = [(60, (1, 2)), (62, (3,)), (65, (4, 5, 6))] # last class, bounded only by the bank
+	_put_trainer_teams(synthetic_rom, synthetic_rom.memory(), teams)
+	rows = synthetic_rom.memory().get_all_trainer_teams(range(1, 48))
+
+	counts = _teams_by_class(rows)
+	assert counts[1] == 2
+	assert all(counts[n] == 1 for n in range(2, 47))
+	assert counts[47] == 3 # the zero padding up to the end of the bank isn't counted
+	assert bytes(rows[:12]) == bytes((1, 1, 0x99, 11, 1, 1, 0x99, 11, 1, 2, 0x99, 14))
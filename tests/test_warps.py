@@ -0,0 +1,47 @@
+# test_warps.py
+import struct
+
+import pytest
+
+from g1utils import AddressError, Memory
+
+def _warpdest(block_addr, x, y):
+	# Block address, then the y and x block coordinates, then the y and x halves of a block.
+	return struct.pack("<H", block_addr) + bytes((y // 2, x // 2, y & 1, x & 1))
+
+def _put_fly_warps(rom, mem):
+	# Two maps in the pointer table, each pointing to a warp destination right after it.
+	bank, addr = mem.location("fly_warps")
+	dests = addr + 8
+	rom.put(bank, addr, bytes((0x00, 0)) + struct.pack("<H", dests) + bytes((0x06, 0)) + struct.pack("<H", dests + 6))
+	rom.put(bank, dests, _warpdest(0xC6E8, 5, 6) + _warpdest(0xC7A1, 41, 10))
+	return dests
+
+def test_fly_warpdests(synthetic_rom):
+	dests = _put_fly_warps(synthetic_rom, synthetic_rom.memory())
+	mem   = synthetic_rom.memory()
+
+	assert mem.get_fly_warpdest(0x00) == (0xC6E8, 5, 6)
+	assert mem.get_fly_warpdest(0x06) == (0xC7A1, 41, 10)
+	assert mem.get_fly_warp_index()[0x06] == dests + 6
+
+	warpdests = mem.get_all_fly_warpdests()
+	assert warpdests[0x00] == mem.get_fly_warpdest(0x00)
+	assert warpdests[0x06] == mem.get_fly_warpdest(0x06)
+	for n, warpdest in warpdests.items():
+		assert mem.get_fly_warpdest(n) == warpdest
+
+def test_fly_warpdest_search_runs_past_the_table(synthetic_rom):
+	# Maps that aren't in the table are matched against whatever data follows it, like in the game.
+	_put_fly_warps(synthetic_rom, synthetic_rom.memory())
+	mem   = synthetic_rom.memory()
+	# The first warp destination (E8 C6 03 02 ...) is read as the entry for map $E8, pointing to $0203.
+	assert mem.get_fly_warp_index()[0xE8] == 0x0203
+	with pytest.raises(AddressError):
+		mem.get_fly_warpdest(0xFE) # never found before the end of the bank
+
+def test_fly_warps_location_missing(synthetic_rom):
+	data = synthetic_rom.memory()
+	mem  = Memory(rom=bytes(synthetic_rom.data), version=data.version, locations=({}, {}))
+	with pytest.raises(KeyError, match="fly warp table"):
+		mem.get_fly_warpdest(0)
@@ -0,0 +1,44 @@
+# test_wild_encounters.py
+import random
+import struct
+
+import g1const
+
+def _put_encounter_tables(rom, rng):
+	mem = rom.memory()
+	bank, table = mem.location("wild_encounters")
+	addr, tables = 0x6000, []
+	for _ in range(12):
+		data = bytearray()
+		for _ in range(2):
+			rate = rng.choice((0, 0, rng.randint(1, 255)))
+			data.append(rate)
+			if rate: data += rng.randbytes(20)
+		tables.append(addr)
+		rom.put(bank, addr, data)
+		addr += len(data)
+	tables.append(0x8000) # unmapped VRAM
+	for map in range(256):
+		rom.put(bank, table + map*2, struct.pack("<H", rng.choice(tables)))
+
+def _scalar_index(mem):
+	index = {}
+	for map in range(256):
+		info = mem.get_map_wild_encounters(map)
+		for water, encounters in ((False, info.land_encounters), (True, info.water_encounters)):
+			for slot, (mon, level) in enumerate(encounters or ()):
+				chance = g1const.wild_encounter_slot_chances[slot] / 256
+				index.setdefault(mon, []).append((map, water, slot, level, chance))
+	return index
+
+def test_wild_encounter_index_matches_maps(synthetic_rom):
+	_put_encounter_tables(synthetic_rom, random.Random(7))
+	mem      = synthetic_rom.memory()
+	expected = _scalar_index(mem)
+	assert expected
+	assert mem.get_wild_encounter_index() == expected
+	for mon in range(256):
+		assert mem.find_wild_encounters(mon) == expected.get(mon, [])
+
+def test_slot_chances_add_up():
+	assert sum(g1const.wild_encounter_slot_chances) == 256